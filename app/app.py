@@ -1,40 +1,37 @@
 import sys
-import mediapipe as mp
 import os
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QHBoxLayout, QVBoxLayout, QDialog, QLabel, 
-    QPushButton, QTextEdit, QCheckBox, QStackedWidget, QSpacerItem, QSizePolicy
+    QPushButton, QCheckBox, QStackedWidget, QSpacerItem, QSizePolicy, QListView, QComboBox,
+    QPlainTextEdit, QSystemTrayIcon, QMenu, QAction
 )
-from PyQt5.QtGui import QPixmap, QIcon, QFont
-from PyQt5.QtCore import Qt
-from features import Features, PostureDetector
-from datetime import datetime
-from matplotlib.figure import Figure
-from matplotlib.image import imread
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtCore import qInstallMessageHandler, QtMsgType
-import numpy as np
+from PyQt5.QtGui import QIcon, QFont
+from PyQt5.QtCore import Qt, pyqtSignal, QEvent
+from features import Features, PostureDetector, labels, warm_up_in_background
+from PyQt5.QtCore import qInstallMessageHandler
 import time
-import matplotlib.pyplot as plt
-import matplotlib.animation as animation
-from scipy.ndimage import gaussian_filter
-import threading
-import requests
 import data_collection # Import data_collection.py
+import fusion
+from log_model import LogListModel, LogFilterProxyModel, LOG_SOURCES, LOG_LEVELS
+from asset_cache import assets, guide_path, GUIDE_SIZE
 import csv
 import sqlite3
 import posture_database
 from posture_database import export_to_csv
-from posture_database import log_event_to_csv
-import traceback
+from event_bus import bus
+from notification_policy import NotificationPolicy
+from metrics import metrics
+from preview_widget import CameraPreview
+from sampling_profiler import profiler, install_signal_handler
 from features import get_latest_vision_posture
 from data_collection import get_latest_pressure_posture
-from plyer import notification
 from PyQt5.QtCore import QTimer
-import ctypes
 
-myappid = u"PostSync" 
-ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
+if sys.platform == "win32":
+    # Group the taskbar icon under PostSync instead of python.exe
+    import ctypes
+    myappid = u"PostSync"
+    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
 
 def print_current_postures():
     print("Vision Posture:", get_latest_vision_posture())
@@ -42,27 +39,34 @@ def print_current_postures():
     print("Final Posture:", print_final_posture())
 
 def get_final_posture_classification(vision_posture, pressure_posture):
-    vision_posture = get_latest_vision_posture()
-    pressure_posture = get_latest_pressure_posture()
-    if vision_posture == "No Pose Detected" or pressure_posture == "No User Detected":
-        return "No Person Detected"
-    elif vision_posture == "Upright" and pressure_posture == "Correct Posture":
-        return "Correct Posture"
-    else:
-        return "Incorrect Posture"
+    return fusion.fuse_labels(vision_posture, pressure_posture)
 
 def print_final_posture():
-    vision = get_latest_vision_posture()
-    pressure = get_latest_pressure_posture()
-    final_posture = get_final_posture_classification(vision, pressure)
-
-    return final_posture
+    """Return the fused posture maintained by the fusion engine."""
+    return fusion.engine.state
 
 NODEMCU_IP = "http://192.168.43.57"  # Ensure this matches your NodeMCU IP
 ENDPOINT = "/get_data"
 
 icon_path = os.path.abspath("postsync_logo.ico")
 
+# `--pose-worker` (or POSTSYNC_POSE_WORKER=1) runs capture and pose inference in a worker process
+USE_POSE_WORKER = "--pose-worker" in sys.argv or os.environ.get("POSTSYNC_POSE_WORKER") == "1"
+
+# Images decoded and pre-scaled by the asset cache while the welcome screen is shown
+for asset_path, asset_size in [
+    ("./assets/PostSync Logo_scaled.png", None),
+    ("./assets/workstation_setup.png", (600, 350)),
+    ("./assets/workstation_setup.png", (480, 270)),
+    ("./assets/guidelines.png", (400, 300)),
+    ("./assets/toggleOn.png", None),
+    ("./assets/toggleOff.png", None),
+    ("./assets/info.png", None),
+    ("./assets/Save.png", None),
+]:
+    assets.register(asset_path, asset_size)
+for guide_posture in list(labels.values()) + ["No Pose Detected"]:
+    assets.register(guide_path(guide_posture), GUIDE_SIZE)
 
 
 class UIHelper:
@@ -94,13 +98,17 @@ class UIHelper:
     @staticmethod
     def update_toggle_icon(toggle, state):
         toggle.setIcon(
-            QIcon("./assets/toggleOn.png" if state else "./assets/toggleOff.png"))
+            assets.icon("./assets/toggleOn.png" if state else "./assets/toggleOff.png"))
         
 class WelcomeScreen(QWidget):
     def __init__(self, stacked_widget):
         super().__init__()
         self.stacked_widget = stacked_widget
         self.init_ui()
+        # Once the window is up, decode the remaining images and load MediaPipe and the SVM
+        # in the background so neither delays the first paint nor the Start button
+        QTimer.singleShot(0, assets.preload_in_background)
+        QTimer.singleShot(0, warm_up_in_background)
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -113,9 +121,10 @@ class WelcomeScreen(QWidget):
         welcome_label = UIHelper.create_label("Welcome to ", 48)
         
         logo_label = QLabel()
-        logo_pixmap = QPixmap("./assets/PostSync Logo_scaled.png")
+        logo_pixmap = assets.pixmap("./assets/PostSync Logo_scaled.png")
         # logo_pixmap = logo_pixmap.scaledToHeight(48, Qt.SmoothTransformation)  # Match text height
-        logo_label.setPixmap(logo_pixmap)
+        if logo_pixmap is not None:
+            logo_label.setPixmap(logo_pixmap)
         logo_label.setAlignment(Qt.AlignCenter)
 
         title_layout.addWidget(welcome_label)
@@ -126,9 +135,9 @@ class WelcomeScreen(QWidget):
                                             12), alignment=Qt.AlignCenter)
 
         infographic = QLabel()
-        pixmap = QPixmap("./assets/workstation_setup.png")
-        pixmap = pixmap.scaled(600, 350, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        infographic.setPixmap(pixmap)
+        pixmap = assets.pixmap("./assets/workstation_setup.png", (600, 350))
+        if pixmap is not None:
+            infographic.setPixmap(pixmap)
         infographic.setAlignment(Qt.AlignCenter)
         
         # Apply rounded corners using stylesheet
@@ -151,32 +160,45 @@ class WelcomeScreen(QWidget):
         self.stacked_widget.setCurrentIndex(1)
         
 class HomePage(QWidget):
+    fused_posture_changed = pyqtSignal(object)  # Carries a fusion.FusionEvent
+    pressure_posture_changed = pyqtSignal(str)
+
     def __init__(self, stacked_widget, logs_page):
         super().__init__()
         self.stacked_widget = stacked_widget
         self.logs_page = logs_page   # Reference Logs page 
         self.last_notification = None
 
+        # Not started with the pose worker: its process owns the camera, and self.detector's
+        # results feed the same slots
         self.vision_detector = PostureDetector()
         self.vision_detector.posture_updated.connect(self.update_posture_status)
+        self.vision_detector.preview_enabled = False  # Only self.detector feeds the camera preview
         
         self.features = Features()
-        self.detector = PostureDetector()  # Initialize PostureDetector
+        self.detector = PostureDetector(use_worker_process=USE_POSE_WORKER)  # Initialize PostureDetector
         self.detector.posture_updated.connect(self.update_posture_status)
         self.detector.notification_alert.connect(self.trigger_notification)
         self.vision_posture = "Unknown"  # Store the last detected vision posture
         self.pressure_posture = "Unknown"  # Store the last detected pressure posture
-        self.last_notification_time = 0
 
-        self.last_detected_posture = None
-        self.posture_start_time = time.time()
-        self.last_notification = None
+        # Hold times and cooldowns for good/bad/no-user notifications
+        self.notification_policy = NotificationPolicy()
         self.notifications_enabled = True  # Default: notifications on
         self.info_popup = None  # ✅ Initialize popup reference here
+        self.render_active = True  # False while this page is not on screen
+        self.latest_vision_posture = None  # Shown when the page becomes visible again
 
         self.init_ui()
         self.setup_posture_guides()
 
+        # Fusion events arrive on the detector/sensor threads; the signal queues them onto the UI thread
+        self.fused_posture_changed.connect(self.on_fused_posture_changed)
+        fusion.engine.subscribe(self.fused_posture_changed.emit)
+        # Pressure samples arrive on the polling thread, likewise
+        self.pressure_posture_changed.connect(self.update_pressure_posture)
+        data_collection.set_ui_callback(self.pressure_posture_changed.emit)
+
     def init_ui(self):
         main_layout = QHBoxLayout()
         main_layout.setSpacing(45)
@@ -188,27 +210,16 @@ class HomePage(QWidget):
 
     def setup_posture_guides(self):
         """Initialize the guideline image placeholder instead of the heatmap."""
-        self.ax = self.pressure_canvas.figure.add_subplot(111)
-        self.ax.axis('off')  # Turn off axis for image display
-        self.guideline_image = None
         self.current_displayed_posture = None  # Track current displayed posture to avoid reloads
-        self.pressure_canvas.figure.tight_layout()
-        plt.close('all')
         
     def display_guideline_image(self, posture):
         """Display a guideline image corresponding to the detected posture."""
         if posture != self.current_displayed_posture:
-            self.ax.clear()
-            self.ax.axis('off')
-
-            image_path = f"assets/{posture.replace(' ', '-').lower()}-guide.png"
-            if os.path.exists(image_path):
-                image = plt.imread(image_path)
-                self.ax.imshow(image)
+            pixmap = assets.pixmap(guide_path(posture), GUIDE_SIZE)
+            if pixmap is not None:
+                self.guideline_label.setPixmap(pixmap)
             else:
-                self.ax.text(0.5, 0.5, "Guide Not Found", fontsize=12, ha='center', va='center')
-
-            self.pressure_canvas.draw()
+                self.guideline_label.setText("Guide Not Found")
             self.current_displayed_posture = posture
             
     def update_posture_display(self, posture):
@@ -222,8 +233,8 @@ class HomePage(QWidget):
 
         # Logo
         logo_label = QLabel()
-        logo_pixmap = QPixmap("assets/PostSync Logo_scaled.png")
-        if not logo_pixmap.isNull():
+        logo_pixmap = assets.pixmap("./assets/PostSync Logo_scaled.png")
+        if logo_pixmap is not None:
             logo_label.setPixmap(logo_pixmap)
         else:
             print("Failed to load logo image.")
@@ -237,11 +248,12 @@ class HomePage(QWidget):
 
         # Placeholder for displaying the heatmap of pressure data from the sensors
         self.pressure_layout = QVBoxLayout()
-        self.pressure_canvas = FigureCanvas(Figure(figsize=(3, 3)))  # Matplotlib Figure
-        self.pressure_canvas.setFixedSize(225, 225)  # Set fixed pixel size (width x height)
-        self.pressure_layout.addWidget(self.pressure_canvas)
+        self.guideline_label = QLabel()  # Shows pre-scaled guideline pixmaps
+        self.guideline_label.setFixedSize(*GUIDE_SIZE)  # Set fixed pixel size (width x height)
+        self.guideline_label.setAlignment(Qt.AlignCenter)
+        self.guideline_label.setStyleSheet("color: #F1F1F1;")
+        self.pressure_layout.addWidget(self.guideline_label)
         left_layout.addLayout(self.pressure_layout)
-        plt.close('all')
 
 
         # Current Posture
@@ -263,7 +275,7 @@ class HomePage(QWidget):
         
         # --- Info Button ---
         self.info_button = QPushButton(" Click here to see proper workstation setup")
-        self.info_button.setIcon(QIcon("./assets/info.png"))
+        self.info_button.setIcon(assets.icon("./assets/info.png"))
         # self.info_button.setFixedSize(None, 16)
         self.info_button.setStyleSheet("border: 2px; color: #B3B3B3")
         self.info_button.setCursor(Qt.PointingHandCursor)
@@ -274,11 +286,10 @@ class HomePage(QWidget):
 
         # Create QLabel to display the guidelines image
         self.guidelines_image = QLabel()
-        guidlines_pixmap = QPixmap("./assets/guidelines.png")
-
-        # Optional: scale the image to fit the QLabel size
-        guidlines_pixmap = guidlines_pixmap.scaled(400, 300, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        self.guidelines_image.setPixmap(guidlines_pixmap)
+        # Pre-scaled to fit the QLabel size
+        guidlines_pixmap = assets.pixmap("./assets/guidelines.png", (400, 300))
+        if guidlines_pixmap is not None:
+            self.guidelines_image.setPixmap(guidlines_pixmap)
         self.guidelines_image.setFixedSize(420, 300)
         self.guidelines_image.setAlignment(Qt.AlignCenter)
 
@@ -290,7 +301,15 @@ class HomePage(QWidget):
             padding: 4px;
         """)
 
-        right_layout.addWidget(self.guidelines_image)
+        # Live camera preview in place of the guidelines while detection runs
+        self.camera_preview = CameraPreview(self.detector.frame_slot)
+        self.camera_preview.setFixedSize(420, 300)
+
+        self.right_view = QStackedWidget()
+        self.right_view.setFixedSize(420, 300)
+        self.right_view.addWidget(self.guidelines_image)
+        self.right_view.addWidget(self.camera_preview)
+        right_layout.addWidget(self.right_view)
 
         bottom_layout = self.create_bottom_controls()
         right_layout.addLayout(bottom_layout)
@@ -307,9 +326,9 @@ class HomePage(QWidget):
             layout = QVBoxLayout()
                         
             infographic = QLabel()
-            pixmap = QPixmap("./assets/workstation_setup.png")
-            pixmap = pixmap.scaled(480, 270, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            infographic.setPixmap(pixmap)
+            pixmap = assets.pixmap("./assets/workstation_setup.png", (480, 270))
+            if pixmap is not None:
+                infographic.setPixmap(pixmap)
             infographic.setAlignment(Qt.AlignCenter)
             
             # Apply rounded corners using stylesheet
@@ -384,77 +403,29 @@ class HomePage(QWidget):
         """Switch to the logs page when the Show Logs button is clicked."""
         self.stacked_widget.setCurrentWidget(self.stacked_widget.widget(2)) 
 
-    def trigger_notification(self, message):
-        """Send notification if message changed or enough time passed."""
-        if not hasattr(self, "_last_notification"):
-            self._last_notification = {"message": None, "time": 0}
-
-        now = time.time()
-        cooldown = 10  # seconds
-
-        if (
-            message != self._last_notification["message"]
-            or now - self._last_notification["time"] > cooldown
-        ):
-            print(f"Notification sent: {message}")
-            try:
-                notification.notify(
-                    title="Posture Alert",
-                    message=message,
-                    timeout=5
-                )
-                self._last_notification["message"] = message
-                self._last_notification["time"] = now
-            except Exception as e:
-                print(f"Notification error: {e}")
+    def trigger_notification(self, message, category="posture"):
+        """Hand the notification to the event bus worker (dedupes repeats within 10 s)."""
+        bus.notify(message, category=category)
 
     def check_final_posture_and_notify(self):
         if not self.notifications_enabled:
             return
 
-        finalNotif = print_final_posture()
-        current_time = time.time()
-
-        good_posture = "Correct Posture"
-        bad_postures = ["Incorrect Posture"]
-        no_user = "No Person Detected"
-
-        # If posture changed, reset timer
-        if finalNotif != self.last_detected_posture:
-            self.last_detected_posture = finalNotif
-            self.posture_start_time = current_time
-
-        # Calculate how long posture has been held
-        posture_duration = current_time - self.posture_start_time
-        time_since_last_notif = current_time - self.last_notification_time
-
-        if finalNotif == good_posture and posture_duration >= 5 and (self.last_notification != "good" or time_since_last_notif >= 30):
-            print("Good posture notification triggered!")
-            log_event_to_csv("Good Posture! Keep It Up.")
-            self.trigger_notification("Good Posture! Keep It Up.")
-            self.last_notification = "good"
-            self.last_notification_time = current_time
-
-        elif finalNotif in bad_postures and posture_duration >= 1 and time_since_last_notif >= 30:
-            print("Bad posture notification triggered!")
-            log_event_to_csv("Bad Posture! Fix your sitting position.")
-            self.trigger_notification("Bad Posture! Fix your sitting position.")
-            self.last_notification = "bad"
-            self.last_notification_time = current_time
-
-        elif finalNotif == no_user and posture_duration >= 1 and self.last_notification != "no user":
-            print("No person detected notification triggered!")
-            log_event_to_csv("No Person Detected on Chair.")
-            self.trigger_notification("No Person Detected on Chair.")
-            self.last_notification = "no user"
-            self.last_notification_time = current_time
+        decision = self.notification_policy.check(print_final_posture())
+        if decision is None:
+            return
+
+        category, message = decision
+        print(f"{category.capitalize()} notification triggered!")
+        bus.log_event(message)
+        self.trigger_notification(message, category=category)
 
     def toggle_notifications(self, state):
         """Enable or disable pop-up notifications based on user toggle."""
         self.notifications_enabled = state == Qt.Checked  # True if checked
         status = "enabled" if self.notifications_enabled else "disabled"
         print(f"Notifications {status}")
-        self.logs_page.append_log(f"[SETTINGS]: Notifications {status}")
+        self.logs_page.append_log(f"Notifications {status}", source="Settings")
 
     def toggle_haptic_feedback(self, state):
         from data_collection import set_haptic_enabled
@@ -463,7 +434,7 @@ class HomePage(QWidget):
 
         status = "enabled" if enabled else "disabled"
         print(f"Haptic feedback {status}")
-        self.logs_page.append_log(f"[SETTINGS]: Haptic feedback {status}")
+        self.logs_page.append_log(f"Haptic feedback {status}", source="Settings")
 
     def handler(mode, context, message):
         if "QPainter::begin" in message:
@@ -477,10 +448,9 @@ class HomePage(QWidget):
         layout.addWidget(UIHelper.create_label(label_text, 12, (120, 24)))
         toggle = QCheckBox()
         toggle.setChecked(True)  #Set the default state to ON (checked)
-        toggle.setIcon(QIcon("./assets/toggleOn.png"))  #Set the ON icon initially
-        pixmap = QPixmap("./assets/toggleOn.png")  #Use ON icon to match the checked state
-        if not pixmap.isNull():
-            toggle.setIcon(QIcon(pixmap))
+        pixmap = assets.pixmap("./assets/toggleOn.png")  #Use ON icon to match the checked state
+        if pixmap is not None:
+            toggle.setIcon(assets.icon("./assets/toggleOn.png"))  #Set the ON icon initially
             size = pixmap.size()
             toggle.setIconSize(size)
 
@@ -493,23 +463,48 @@ class HomePage(QWidget):
         layout.addWidget(toggle)
         return layout, toggle
     
+    def on_fused_posture_changed(self, event):
+        """Show the new fused posture and log how stale its inputs were."""
+        self.posture_status.setText(event.state)
+        self.logs_page.append_log(
+            f"Final posture: {event.state} (staleness {event.staleness:.2f}s)", source="Fusion")
+        self.check_final_posture_and_notify()
+
+    def update_pressure_posture(self, posture):
+        """Remember the latest pressure posture (queued from the sensor polling thread)."""
+        self.pressure_posture = posture
+        # Pressure keeps polling while vision is gated on an empty seat, so it also ticks the hold times
+        self.check_final_posture_and_notify()
+
     def update_posture_status(self, posture):
         """Update the UI with the detected posture and log it with a timestamp."""
-        self.posture_status.setText(print_final_posture())
-        self.display_guideline_image(posture)
+        self.latest_vision_posture = posture
+        if self.render_active:
+            self.display_guideline_image(posture)
 
-        # Get current date and time
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            
-        # Append log message with timestamp
-        self.logs_page.append_log(f"[{current_time}] Detected posture: {posture}")
+        # Append log message (timestamped by the log model)
+        self.logs_page.append_log(f"Detected posture: {posture}", source="Vision")
 
         self.check_final_posture_and_notify()
 
+    def set_render_active(self, active):
+        """Skip guideline and heatmap drawing while hidden; repaint from the latest state when shown."""
+        if active == self.render_active:
+            return
+        self.render_active = active
+        data_collection.set_heatmap_visible(active)
+        if active:
+            if self.latest_vision_posture is not None:
+                self.display_guideline_image(self.latest_vision_posture)
+            self.posture_status.setText(fusion.engine.state)
+
+    def set_preview_enabled(self, enabled):
+        """Start or stop feeding the camera preview; detection keeps running either way."""
+        self.detector.preview_enabled = enabled
+
     def log_posture(self, source, posture):
         """Append original posture readings to the logs."""
-        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.logs_page.append_log(f"[{current_time}] {source} detected: {posture}")  # Keep detailed log
+        self.logs_page.append_log(f"{source} detected: {posture}", source=source)  # Keep detailed log
 
     def toggle_start_button(self):
         is_start = self.start_button.text() == "Start"
@@ -524,8 +519,10 @@ class HomePage(QWidget):
 
         if self.start_button.text() == "Stop":
             self.detector.start_detection()
-            self.vision_detector.start_detection()
+            if not USE_POSE_WORKER:
+                self.vision_detector.start_detection()
             data_collection.start_recording()
+            self.right_view.setCurrentWidget(self.camera_preview)
             
 
             # if self.heatmap is None:
@@ -541,6 +538,7 @@ class HomePage(QWidget):
             self.detector.stop_detection()
             self.vision_detector.stop_detection()
             data_collection.stop_recording()
+            self.right_view.setCurrentWidget(self.guidelines_image)
             if hasattr(self, 'timer'):
                 self.timer.stop()  # Stop the timer when stopping
 
@@ -573,22 +571,40 @@ class LogsPage(QWidget):
         
         top_layout.addWidget(UIHelper.create_label("Logs", 14, (40, 20)))
         top_layout.addStretch(1)  # Push everything else to the right
+
+        # Filters by source and level
+        self.source_filter = QComboBox()
+        self.source_filter.addItems(["All"] + LOG_SOURCES)
+        self.level_filter = QComboBox()
+        self.level_filter.addItems(["All"] + LOG_LEVELS)
+        for combo in (self.source_filter, self.level_filter):
+            combo.setStyleSheet("background-color: white; color: black; padding: 2px; border-radius: 4px")
+            top_layout.addWidget(combo)
         
         # Create a save button
         self.save_button = UIHelper.create_button("save")
-        self.save_button.setIcon(QIcon("./assets/Save.png"))
+        self.save_button.setIcon(assets.icon("./assets/Save.png"))
         self.save_button.clicked.connect(export_to_csv)
         top_layout.addWidget(self.save_button)
         
         main_layout.addLayout(top_layout)
         
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setStyleSheet(
+        # Bounded model, batched inserts; older entries are paged in from the session log file
+        self.log_model = LogListModel(parent=self)
+        self.log_filter = LogFilterProxyModel(self)
+        self.log_filter.setSourceModel(self.log_model)
+        self.source_filter.currentTextChanged.connect(self.log_filter.set_source_filter)
+        self.level_filter.currentTextChanged.connect(self.log_filter.set_level_filter)
+
+        self.log_view = QListView()
+        self.log_view.setModel(self.log_filter)
+        self.log_view.setUniformItemSizes(True)  # Lets the view skip per-row layout
+        self.log_view.setStyleSheet(
             "border-radius: 8px; background: #F1F1F1;padding: 5px")
-        self.log_text.setFixedSize(710, 360)
+        self.log_view.setFixedSize(710, 340)
+        self.log_model.rowsInserted.connect(self.scroll_to_latest)
         
-        main_layout.addWidget(self.log_text)  # Left align button
+        main_layout.addWidget(self.log_view)  # Left align button
         
         # ✅ Back Button (Lower Left)
         self.back_button = UIHelper.create_button("back")
@@ -599,18 +615,113 @@ class LogsPage(QWidget):
         bottom_layout.addWidget(self.back_button)  # Left align button
         bottom_layout.addStretch(1)  # Push everything else to the right
 
+        # Paging through older entries stored on disk
+        self.older_button = UIHelper.create_button("older", width=80, callback=self.show_older_logs)
+        self.live_button = UIHelper.create_button("live", width=80, callback=self.show_live_logs)
+        bottom_layout.addWidget(self.older_button)
+        bottom_layout.addWidget(self.live_button)
+
+        # Per-stage latency histograms
+        self.diagnostics_button = UIHelper.create_button("diagnostics", width=110,
+                                                         callback=self.go_to_diagnostics)
+        bottom_layout.addWidget(self.diagnostics_button)
+
         # ✅ Add widgets to the main layout
         main_layout.addLayout(bottom_layout)  # Back button at the bottom left
 
         self.setLayout(main_layout)
     
-    def append_log(self, message):
-        self.log_text.append(message)
+    def append_log(self, message, source="General", level="INFO"):
+        self.log_model.append(message, source, level)
+
+    def set_render_active(self, active):
+        """Rows are only collected while hidden and inserted in one batch when shown."""
+        self.log_model.set_view_active(active)
+        if active:
+            self.scroll_to_latest()
+
+    def scroll_to_latest(self):
+        if self.log_model.history_page is None:
+            self.log_view.scrollToBottom()
+
+    def show_older_logs(self):
+        if self.log_model.show_older():
+            self.log_view.scrollToTop()
+
+    def show_live_logs(self):
+        self.log_model.show_live()
+        self.log_view.scrollToBottom()
 
     def go_back(self):
         """Go back to the main detection page."""
         self.parent().setCurrentIndex(1)  # Adjust based on your stacked widget index
 
+    def go_to_diagnostics(self):
+        self.parent().setCurrentIndex(3)
+
+
+class DiagnosticsPage(QWidget):
+    """Shows the per-stage latency histograms; only refreshes while visible."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(1000)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.init_ui()
+
+    def init_ui(self):
+        main_layout = QVBoxLayout(self)
+
+        top_layout = QHBoxLayout()
+        top_layout.addWidget(UIHelper.create_label("Diagnostics (ms)", 14, (200, 20)))
+        top_layout.addStretch(1)
+        self.dump_button = UIHelper.create_button("dump", width=80, callback=self.dump_metrics)
+        top_layout.addWidget(self.dump_button)
+        self.profile_button = UIHelper.create_button("profile", width=80, callback=self.toggle_profiler)
+        top_layout.addWidget(self.profile_button)
+        main_layout.addLayout(top_layout)
+
+        self.metrics_view = QPlainTextEdit()
+        self.metrics_view.setReadOnly(True)
+        self.metrics_view.setFont(QFont("Courier New", 9))
+        self.metrics_view.setStyleSheet(
+            "border-radius: 8px; background: #F1F1F1; color: black; padding: 5px")
+        self.metrics_view.setFixedSize(710, 340)
+        main_layout.addWidget(self.metrics_view)
+
+        bottom_layout = QHBoxLayout()
+        self.back_button = UIHelper.create_button("back", callback=self.go_back)
+        bottom_layout.addWidget(self.back_button)
+        bottom_layout.addStretch(1)
+        main_layout.addLayout(bottom_layout)
+
+    def refresh(self):
+        self.metrics_view.setPlainText(metrics.render_table())
+        self.profile_button.setText("stop" if profiler.is_running else "profile")
+        if profiler.last_output and not profiler.is_running:
+            self.metrics_view.appendPlainText(f"\nLast profile: {profiler.last_output[1]}")
+
+    def toggle_profiler(self):
+        """Start a bounded sampling capture of all threads, or end the running one early."""
+        profiler.toggle()
+        self.profile_button.setText("stop" if profiler.is_running else "profile")
+
+    def dump_metrics(self):
+        path = metrics.dump()
+        self.metrics_view.appendPlainText(f"\nSaved to {path}")
+
+    def set_render_active(self, active):
+        if active:
+            self.refresh()
+            self.refresh_timer.start()
+        else:
+            self.refresh_timer.stop()
+
+    def go_back(self):
+        """Return to the logs page."""
+        self.parent().setCurrentIndex(2)
+
 
         
 class PostSyncApp(QMainWindow):
@@ -627,24 +738,123 @@ class PostSyncApp(QMainWindow):
         self.welcome_screen = WelcomeScreen(self.stacked_widget)
         self.logs_page = LogsPage(self.stacked_widget)
         self.home_page = HomePage(self.stacked_widget, self.logs_page)
+        self.diagnostics_page = DiagnosticsPage(self.stacked_widget)
 
         self.stacked_widget.addWidget(self.welcome_screen) # WelcomeScreen (index 0)
         self.stacked_widget.addWidget(self.home_page)  # HomePage (index 1)
         self.stacked_widget.addWidget(self.logs_page)  # LogsPage (index 2) 
+        self.stacked_widget.addWidget(self.diagnostics_page)  # DiagnosticsPage (index 3)
         
         self.setCentralWidget(self.stacked_widget)
-    
+
+        # Pages only draw while they are the current page of a visible, non-minimized window
+        self.stacked_widget.currentChanged.connect(self.update_render_state)
+        self.tray = None
+        self.setup_tray()
+
+    def update_render_state(self, *_):
+        window_visible = self.isVisible() and not self.isMinimized()
+        current = self.stacked_widget.currentWidget()
+        for page in (self.home_page, self.logs_page, self.diagnostics_page):
+            page.set_render_active(window_visible and current is page)
+        self.home_page.set_preview_enabled(window_visible)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_render_state()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_render_state()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_render_state()
+
+    def setup_tray(self):
+        """Tray icon for running in the background with only notifications."""
+        if not QSystemTrayIcon.isSystemTrayAvailable():
+            return
+        self.tray = QSystemTrayIcon(QIcon('./assets/logo.png'), self)
+        menu = QMenu(self)
+        open_action = QAction("Open PostSync", self)
+        open_action.triggered.connect(self.show_from_tray)
+        hide_action = QAction("Hide to tray", self)
+        hide_action.triggered.connect(self.hide_to_tray)
+        detection_action = QAction("Start/Stop detection", self)
+        detection_action.triggered.connect(self.home_page.handle_start)
+        quit_action = QAction("Quit", self)
+        quit_action.triggered.connect(self.quit_from_tray)
+        for action in (open_action, hide_action, detection_action, quit_action):
+            menu.addAction(action)
+        self.tray.setContextMenu(menu)
+        self.tray.activated.connect(self.on_tray_activated)
+        self.tray.show()
+
+    def on_tray_activated(self, reason):
+        if reason == QSystemTrayIcon.Trigger:
+            self.hide_to_tray() if self.isVisible() else self.show_from_tray()
+
+    def hide_to_tray(self):
+        """Hide the window; detection, logging and notifications continue."""
+        if self.tray is None:
+            self.showMinimized()
+            return
+        if self.stacked_widget.currentWidget() is self.welcome_screen:
+            self.stacked_widget.setCurrentIndex(1)
+        self.hide()
+        self.update_render_state()  # No hideEvent if the window was never shown
+
+    def quit_from_tray(self):
+        self.close()  # Runs closeEvent even when the window is hidden
+        QApplication.instance().quit()
+
+    def show_from_tray(self):
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
     def closeEvent(self, event):
         """Export posture data to CSV when the application is closed."""
         print("Exporting posture data to CSV before closing the application...")  # Debugging
         print_current_postures()
         print_final_posture()
+        self.logs_page.log_model.close()
+        bus.stop()  # Flush buffered events
+        metrics.dump()  # Keep this session's latency histograms
+        if self.tray is not None:
+            self.tray.hide()
         #posture_database.export_to_csv()  # Export posture logs to CSV
         #print("CSV export complete.")  # Debugging confirmation
         event.accept()  # Ensures the application closes properly
 
+def report_startup_and_quit(app):
+    """Used by benchmarks/startup.py: print time-to-first-window and exit."""
+    elapsed = time.time() - float(os.environ["POSTSYNC_LAUNCH_TIME"])
+    print(f"STARTUP_FIRST_WINDOW {elapsed:.3f}", flush=True)
+    app.quit()
+
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    if "POSTSYNC_METRICS_PORT" in os.environ:
+        metrics.serve(int(os.environ["POSTSYNC_METRICS_PORT"]))
+
+    # `kill -USR1 <pid>` toggles a profiling capture; the timer lets Python run
+    # the signal handler while Qt's event loop is blocked in C++
+    if install_signal_handler(profiler):
+        signal_timer = QTimer()
+        signal_timer.timeout.connect(lambda: None)
+        signal_timer.start(500)
+    if "--profile" in sys.argv:
+        index = sys.argv.index("--profile")
+        seconds = sys.argv[index + 1] if index + 1 < len(sys.argv) else ""
+        profiler.start(float(seconds) if seconds.replace(".", "", 1).isdigit() else None)
     window = PostSyncApp()
-    window.show()
+    if "--tray" in sys.argv:
+        window.hide_to_tray()  # Background session: tray icon and notifications only
+    else:
+        window.show()
+    if "POSTSYNC_LAUNCH_TIME" in os.environ:
+        QTimer.singleShot(0, lambda: report_startup_and_quit(app))
     sys.exit(app.exec_())
\ No newline at end of file
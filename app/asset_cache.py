@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap, QIcon
+
+cache_folder = "data/cache/assets"
+GUIDE_SIZE = (225, 225)
+
+
+def guide_path(posture):
+    """Path of the guideline image for a posture label."""
+    return f"assets/{posture.replace(' ', '-').lower()}-guide.png"
+
+
+class AssetCache:
+    """Decodes and pre-scales UI images once and hands out ready-made pixmaps.
+
+    Images are decoded and scaled as QImage (safe off the UI thread) and
+    written to an on-disk cache of scaled variants, so later launches skip the
+    smooth rescale. QPixmaps are created on first use on the UI thread.
+    """
+
+    def __init__(self, cache_dir=cache_folder):
+        self.cache_dir = cache_dir
+        self.variants = []  # (path, size) pairs to preload
+        self.images = {}
+        self.pixmaps = {}
+        self.icons = {}
+        self.lock = threading.Lock()
+        self.preload_thread = None
+
+    def register(self, path, size=None):
+        """Add an image (optionally scaled to fit `size`) to the preload list."""
+        key = (os.path.normpath(path), size)
+        if key not in self.variants:
+            self.variants.append(key)
+
+    def _cache_file(self, path, size):
+        # The full-path hash keeps same-named images from different folders apart
+        stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "_")
+        digest = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()[:10]
+        return os.path.join(self.cache_dir, f"{stem}_{digest}_{size[0]}x{size[1]}.png")
+
+    def _load(self, path, size):
+        """Decode (and scale) one variant, using the disk cache when it is fresh."""
+        if not os.path.exists(path):
+            return None
+        if size is None:
+            image = QImage(path)
+            return None if image.isNull() else image
+
+        cache_file = self._cache_file(path, size)
+        if (os.path.exists(cache_file)
+                and os.path.getmtime(cache_file) >= os.path.getmtime(path)):
+            image = QImage(cache_file)
+            if not image.isNull():
+                return image
+
+        image = QImage(path)
+        if image.isNull():
+            return None
+        image = image.scaled(size[0], size[1], Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            image.save(cache_file)
+        except OSError as e:
+            print(f"Warning: Could not write asset cache {cache_file}: {e}")
+        return image
+
+    def image(self, path, size=None):
+        """Return the decoded QImage for a variant, loading it now if needed."""
+        path = os.path.normpath(path)
+        key = (path, size)
+        with self.lock:
+            if key in self.images:
+                return self.images[key]
+        image = self._load(path, size)
+        with self.lock:
+            self.images[key] = image
+        return image
+
+    def pixmap(self, path, size=None):
+        """Return a QPixmap for a variant (UI thread only), or None if it is missing."""
+        key = (os.path.normpath(path), size)
+        if key not in self.pixmaps:
+            image = self.image(path, size)
+            self.pixmaps[key] = QPixmap.fromImage(image) if image is not None else None
+        return self.pixmaps[key]
+
+    def icon(self, path):
+        """Return a cached QIcon for an unscaled asset."""
+        if path not in self.icons:
+            pixmap = self.pixmap(path)
+            self.icons[path] = QIcon(pixmap) if pixmap is not None else QIcon()
+        return self.icons[path]
+
+    def preload(self):
+        """Decode every registered variant."""
+        for path, size in list(self.variants):
+            self.image(path, size)
+
+    def preload_in_background(self):
+        """Start preloading on a daemon thread (e.g. while the welcome screen shows)."""
+        if self.preload_thread is None:
+            self.preload_thread = threading.Thread(target=self.preload, daemon=True)
+            self.preload_thread.start()
+
+
+# Shared cache used by every page
+assets = AssetCache()
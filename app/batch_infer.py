@@ -0,0 +1,231 @@
+"""Score recorded sessions offline with the live posture classifier.
+
+Videos are decoded in frame-range segments and image folders in batches
+across worker processes (each with its own MediaPipe graph). The keypoints of
+every segment are classified in one vectorized call, and a per-frame CSV is
+streamed out in input order:
+
+    python batch_infer.py session.mp4 screenshots -o scores.csv [--workers 8] [--stride 1]
+
+Columns: source, frame, time, label, filtered, recorded, then one probability
+per posture class. `filtered` is the label after the live app's temporal
+filter; `recorded` is the frame's known posture (screenshots folder or a
+`<video>.labels.csv`), if any.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import pose_pipeline
+from frame_source import DEFAULT_REPLAY_FPS, ImageDirectorySource, load_label_file
+from pose_pipeline import classify_batch, feature_names, labels
+from posture_filter import TemporalPostureFilter
+
+DEFAULT_SEGMENT_FRAMES = 300  # Video frames per worker task
+IMAGE_BATCH = 32  # Images per worker task
+
+# Worker process state (see _init_worker)
+_model_complexity = 1
+_image_pose = None
+
+
+def _init_worker(model_complexity):
+    global _model_complexity
+    _model_complexity = model_complexity
+
+
+def _create_pose(static):
+    import mediapipe as mp
+    return mp.solutions.pose.Pose(static_image_mode=static, model_complexity=_model_complexity,
+                                  min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
+def _keypoints(pose, image):
+    """39 keypoint features of a BGR image, or NaNs when no pose is detected."""
+    import cv2
+    results = pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.pose_landmarks:
+        return np.full(len(feature_names), np.nan)
+    return pose_pipeline.extract_keypoints(results.pose_landmarks.landmark)
+
+
+def _score_images(paths):
+    """Worker task: keypoint matrix for a batch of still images (one static graph per worker)."""
+    global _image_pose
+    import cv2
+    if _image_pose is None:
+        _image_pose = _create_pose(static=True)
+    rows = np.full((len(paths), len(feature_names)), np.nan)
+    for i, path in enumerate(paths):
+        image = cv2.imread(path)
+        if image is not None:
+            rows[i] = _keypoints(_image_pose, image)
+    return rows
+
+
+def _score_video(path, start, stop, stride, mirror):
+    """Worker task: keypoint matrix for frames start, start + stride, ... before stop.
+
+    Every segment gets a fresh tracking graph, so MediaPipe can track between
+    consecutive frames without carrying state across segments.
+    """
+    import cv2
+    pose = _create_pose(static=False)
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    rows = []
+    try:
+        for position in range(start, stop):
+            if (position - start) % stride:
+                if not cap.grab():  # Skip without decoding
+                    break
+                continue
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if mirror:
+                frame = cv2.flip(frame, 1)  # Match the live camera path
+            rows.append(_keypoints(pose, frame))
+    finally:
+        cap.release()
+        pose.close()
+    return np.array(rows).reshape(len(rows), len(feature_names))
+
+
+def plan_images(root, stride):
+    """Worker tasks for an image folder: [(meta, function, args)]."""
+    source = ImageDirectorySource(root)
+    paths = source.paths[::stride]
+    tasks = []
+    for start in range(0, len(paths), IMAGE_BATCH):
+        batch = paths[start:start + IMAGE_BATCH]
+        meta = {"source": root, "frames": [(start + i) * stride for i in range(len(batch))],
+                "fps": DEFAULT_REPLAY_FPS, "recorded": [source.label_for(path) for path in batch]}
+        tasks.append((meta, _score_images, (batch,)))
+    return tasks
+
+
+def plan_video(path, stride, segment_frames, mirror, labels_path=None):
+    """Worker tasks for a video file, one per segment of `segment_frames` frames."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video file: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or DEFAULT_REPLAY_FPS
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    if labels_path is None and os.path.exists(path + ".labels.csv"):
+        labels_path = path + ".labels.csv"
+    recorded = load_label_file(labels_path) if labels_path else {}
+
+    if frame_count <= 0:
+        frame_count = sys.maxsize  # Unknown length: one segment read to the end
+        segment_frames = frame_count
+    segment_frames = max(stride, segment_frames // stride * stride)  # Keep the stride grid across segments
+    tasks = []
+    for start in range(0, frame_count, segment_frames):
+        stop = min(start + segment_frames, frame_count)
+        meta = {"source": path, "start": start, "stride": stride, "fps": fps, "recorded": recorded}
+        tasks.append((meta, _score_video, (path, start, stop, stride, mirror)))
+    return tasks
+
+
+def task_rows(meta, keypoints):
+    """(frame, time, recorded label) for each keypoint row of a finished task."""
+    if "frames" in meta:
+        frames = meta["frames"]
+        recorded = meta["recorded"]
+    else:
+        frames = [meta["start"] + i * meta["stride"] for i in range(len(keypoints))]
+        recorded = [meta["recorded"].get(frame) for frame in frames]
+    return [(frame, frame / meta["fps"], label) for frame, label in zip(frames, recorded)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("inputs", nargs="+", help="video files and/or image folders")
+    parser.add_argument("-o", "--output", default="-", help="CSV path (default: stdout)")
+    parser.add_argument("--labels", help="frame,label CSV for a single video input")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="pose extraction processes")
+    parser.add_argument("--stride", type=int, default=1, help="score every Nth frame")
+    parser.add_argument("--segment", type=int, default=DEFAULT_SEGMENT_FRAMES, help="video frames per task")
+    parser.add_argument("--complexity", type=int, default=1, choices=(0, 1, 2),
+                        help="MediaPipe model complexity")
+    parser.add_argument("--no-mirror", action="store_true",
+                        help="videos are already mirrored like the saved screenshots")
+    args = parser.parse_args()
+
+    tasks = []
+    for spec in args.inputs:
+        if os.path.isdir(spec):
+            tasks += plan_images(spec, args.stride)
+        else:
+            tasks += plan_video(spec, args.stride, args.segment, mirror=not args.no_mirror,
+                                labels_path=args.labels if len(args.inputs) == 1 else None)
+
+    pose_pipeline.load_classifier()
+    class_names = [labels.get(cls, "Unknown Posture") for cls in pose_pipeline.model.classes_]
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    writer = csv.writer(output)
+    writer.writerow(["source", "frame", "time", "label", "filtered", "recorded"] +
+                    [f"p_{name.replace(' ', '_')}" for name in class_names])
+
+    filters = {}
+    frames = scored = labelled = matches = 0
+    video_seconds = {}
+    start = time.perf_counter()
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker,
+                                 initargs=(args.complexity,)) as pool:
+            futures = [(meta, pool.submit(function, *task_args)) for meta, function, task_args in tasks]
+            # Results are consumed in submission order so the table streams out in frame order
+            for meta, future in futures:
+                keypoints = future.result()
+                rows = task_rows(meta, keypoints)
+                detected = ~np.isnan(keypoints).any(axis=1)
+                preds = ["No Pose Detected"] * len(rows)
+                probs = np.full((len(rows), len(class_names)), np.nan)
+                if detected.any():
+                    batch_preds, batch_probs = classify_batch(keypoints[detected])
+                    probs[detected] = batch_probs
+                    for i, pred in zip(np.flatnonzero(detected), batch_preds):
+                        preds[i] = pred
+
+                posture_filter = filters.setdefault(
+                    meta["source"], TemporalPostureFilter(window_seconds=0.3, hysteresis=0.1))
+                for (frame, timestamp, recorded), pred, row_probs, found in zip(rows, preds, probs, detected):
+                    probabilities = dict(zip(class_names, row_probs.tolist())) if found else None
+                    filtered = posture_filter.update(pred, probabilities, timestamp)
+                    writer.writerow([meta["source"], frame, f"{timestamp:.3f}", pred, filtered, recorded or ""] +
+                                    ["" if not found else f"{p:.4f}" for p in row_probs])
+                    if recorded:
+                        labelled += 1
+                        matches += pred == recorded
+                    if "start" in meta:
+                        video_seconds[meta["source"]] = timestamp
+                frames += len(rows)
+                scored += int(detected.sum())
+                output.flush()
+                elapsed = time.perf_counter() - start
+                print(f"\r{frames} frames, {frames / elapsed if elapsed else 0:.1f} fps", end="",
+                      file=sys.stderr, flush=True)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n{frames} frames ({scored} with a pose) in {elapsed:.1f} s, "
+          f"{frames / elapsed if elapsed else 0:.1f} fps", file=sys.stderr)
+    if video_seconds and elapsed:
+        print(f"Video scored at {sum(video_seconds.values()) / elapsed:.1f}x real time", file=sys.stderr)
+    if labelled:
+        print(f"Agreement with recorded labels: {matches / labelled:.1%} of {labelled} frames", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import threading
+import time
+import cv2
+
+DEFAULT_IDLE_TIMEOUT = 30.0  # Seconds without a snapshot before the device is released
+DEFAULT_WARMUP_FRAMES = 5  # Frames discarded after opening while auto-exposure settles
+
+
+class CameraSession:
+    """Keeps a camera open and continuously refreshes its latest frame.
+
+    A grabber thread reads frames as fast as the device delivers them, so
+    snapshot() returns immediately with the newest frame instead of paying for
+    a device open. The device is released after `idle_timeout` seconds without
+    a snapshot and reopened transparently on the next one.
+    """
+
+    def __init__(self, index=0, idle_timeout=DEFAULT_IDLE_TIMEOUT,
+                 warmup_frames=DEFAULT_WARMUP_FRAMES, width=None, height=None):
+        self.index = index
+        self.idle_timeout = idle_timeout
+        self.warmup_frames = warmup_frames
+        self.width = width
+        self.height = height
+
+        self.cap = None
+        self.thread = None
+        self.is_running = False
+        self.frame = None
+        self.frame_id = 0
+        self.frame_time = None
+        self.last_access = time.monotonic()
+        self.open_count = 0
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+
+    def open(self):
+        """Open the device and start the grabber thread (no-op if already open)."""
+        with self._lock:
+            return self._open_locked()
+
+    def _open_locked(self):
+        if self.is_running:
+            return True
+        # A grabber that was just stopped may still hold the device; it releases it under the lock
+        deadline = time.monotonic() + 1.0
+        while self.cap is not None and time.monotonic() < deadline:
+            self._new_frame.wait(deadline - time.monotonic())
+        cap = cv2.VideoCapture(self.index)
+        if not cap.isOpened():
+            cap.release()
+            return False
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
+        if self.width and self.height:
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        for _ in range(self.warmup_frames):
+            cap.read()  # Let auto-exposure settle before frames are served
+        self.cap = cap
+        self.frame = None
+        self.is_running = True
+        self.open_count += 1
+        self.last_access = time.monotonic()
+        self.thread = threading.Thread(target=self._grab_loop, args=(cap,), daemon=True)
+        self.thread.start()
+        return True
+
+    def close(self):
+        """Stop the grabber thread and release the device."""
+        with self._lock:
+            self.is_running = False
+            thread = self.thread
+            self.thread = None
+            self._new_frame.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1)
+
+    def _grab_loop(self, cap):
+        while True:
+            with self._lock:
+                # The idle check and the release happen under the same lock as snapshot()'s
+                # access, so a snapshot can never get a device that is about to be released
+                if self.cap is cap and self.is_running and time.monotonic() - self.last_access > self.idle_timeout:
+                    self.is_running = False
+                    self.thread = None
+                if self.cap is not cap or not self.is_running:
+                    cap.release()
+                    if self.cap is cap:
+                        self.cap = None
+                    self._new_frame.notify_all()
+                    return
+            ret, frame = cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            with self._lock:
+                if self.cap is not cap:
+                    continue  # Superseded by a newer session; released at the top of the loop
+                self.frame = frame
+                self.frame_id += 1
+                self.frame_time = time.monotonic()
+                self._new_frame.notify_all()
+
+    def snapshot(self, timeout=2.0):
+        """Return a copy of the latest frame, opening the camera if needed.
+
+        Returns None if the camera cannot be opened or no frame arrives within
+        `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            # Touch the session before checking it, so the grabber cannot idle it out in between
+            self.last_access = time.monotonic()
+            if not self._open_locked():
+                return None
+            while self.frame is None and self.is_running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._new_frame.wait(remaining)
+            return None if self.frame is None else self.frame.copy()
+
+    def wait_for_frame(self, after_id, timeout=1.0):
+        """Block until a frame newer than `after_id` arrives; returns (frame_id, frame)."""
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self.last_access = time.monotonic()
+            while self.frame_id <= after_id and self.is_running:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._new_frame.wait(remaining)
+            if self.frame is None:
+                return self.frame_id, None
+            return self.frame_id, self.frame.copy()
@@ -0,0 +1,95 @@
+import heapq
+import itertools
+import threading
+import time as _time
+
+
+class SystemClock:
+    """The real clock; call_later() runs callbacks on threading.Timer threads."""
+
+    def time(self):
+        return _time.time()
+
+    def monotonic(self):
+        return _time.monotonic()
+
+    def sleep(self, seconds):
+        _time.sleep(seconds)
+
+    def call_later(self, delay, callback):
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+        return timer
+
+
+class VirtualClock:
+    """A clock that only moves when advance() or sleep() is called.
+
+    Meant for a single driver (e.g. the soak harness) stepping simulated time:
+    sleep() returns immediately after advancing, and call_later() callbacks
+    run on the driving thread once simulated time reaches them.
+    """
+
+    def __init__(self, start=None):
+        self.now = _time.time() if start is None else start
+        self.origin = self.now
+        self.pending = []  # heap of (due, sequence, callback)
+        self.sequence = itertools.count()
+        self._lock = threading.Lock()
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now - self.origin
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def call_later(self, delay, callback):
+        with self._lock:
+            heapq.heappush(self.pending, (self.now + delay, next(self.sequence), callback))
+
+    def advance(self, seconds):
+        """Move time forward, running scheduled callbacks at their due times."""
+        target = self.now + max(0.0, seconds)
+        while True:
+            with self._lock:
+                if not self.pending or self.pending[0][0] > target:
+                    break
+                due, _, callback = heapq.heappop(self.pending)
+                self.now = max(self.now, due)
+            callback()
+        self.now = target
+
+
+_clock = SystemClock()
+
+
+def install(clock):
+    """Make `clock` the process-wide clock; returns the previous one."""
+    global _clock
+    previous, _clock = _clock, clock
+    return previous
+
+
+def current():
+    return _clock
+
+
+# Module-level shortcuts so callers can pass e.g. clocks.monotonic as a default clock
+def time():
+    return _clock.time()
+
+
+def monotonic():
+    return _clock.monotonic()
+
+
+def sleep(seconds):
+    _clock.sleep(seconds)
+
+
+def call_later(delay, callback):
+    return _clock.call_later(delay, callback)
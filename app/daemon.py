@@ -0,0 +1,164 @@
+"""Headless PostSync service: vision, pressure, fusion and logging without Qt or Matplotlib.
+
+Fused posture changes and once-a-second raw metrics are published on a local
+HTTP API (see stream_server) that any number of dashboards can subscribe to:
+
+    python daemon.py [--host 127.0.0.1] [--port 8765] [--camera 0] [--no-vision] [--no-pressure]
+    curl -N http://127.0.0.1:8765/events
+"""
+import argparse
+import math
+import signal
+import threading
+from datetime import datetime
+
+import clocks
+import data_collection
+import fusion
+import live_state
+import occupancy
+import posture_database
+from event_bus import bus
+from metrics import metrics
+from pose_worker import PoseWorker
+from posture_filter import TemporalPostureFilter
+from stream_server import DEFAULT_STREAM_PORT, StreamHub, StreamServer
+
+DEFAULT_METRICS_INTERVAL = 1.0  # Seconds between raw metric events
+
+
+def finite(value):
+    """JSON has no infinity; report unknown staleness as null."""
+    return None if value is None or math.isinf(value) else round(value, 3)
+
+
+class PostSyncDaemon:
+    """Runs the detection pipeline headless and publishes it through a StreamHub.
+
+    Vision runs in a PoseWorker process (no Qt signals, no preview window);
+    pressure uses data_collection's polling thread. Filtering, fusion, the
+    posture database and the event log work as in the desktop app.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_STREAM_PORT, camera_index=0,
+                 vision=True, pressure=True, metrics_interval=DEFAULT_METRICS_INTERVAL):
+        self.camera_index = camera_index
+        self.vision_enabled = vision
+        self.pressure_enabled = pressure
+        self.metrics_interval = metrics_interval
+        self.hub = StreamHub()
+        self.server = StreamServer(self.hub, host, port, metrics_text=metrics.render_text)
+        # Same smoothing as PostureDetector
+        self.posture_filter = TemporalPostureFilter(window_seconds=0.3, hysteresis=0.1)
+        self.worker = None
+        self.threads = []
+        self.stop_event = threading.Event()
+        self.frame_counter = 0
+        self.last_vision = None
+
+    def start(self):
+        self.server.start()
+        fusion.engine.subscribe(self.on_fusion)
+        if self.vision_enabled:
+            self.worker = PoseWorker(camera_index=self.camera_index)
+            self.worker.start()
+            self.threads.append(threading.Thread(target=self.vision_loop, daemon=True))
+        if self.pressure_enabled:
+            data_collection.start_recording()
+        self.threads.append(threading.Thread(target=self.metrics_loop, daemon=True))
+        for thread in self.threads:
+            thread.start()
+        bus.log_event("PostSync daemon started")
+
+    def stop(self):
+        self.stop_event.set()
+        data_collection.stop_recording()
+        fusion.engine.unsubscribe(self.on_fusion)
+        for thread in self.threads:
+            thread.join(timeout=2)
+        if self.worker is not None:
+            self.worker.stop()
+        self.server.stop()
+        bus.log_event("PostSync daemon stopped")
+        bus.stop()
+
+    def run_forever(self):
+        """Block until SIGINT/SIGTERM, then shut down cleanly."""
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, lambda *_: self.stop_event.set())
+        self.start()
+        while not self.stop_event.wait(0.5):
+            pass
+        print("\n[INFO] Stopping PostSync daemon.")
+        self.stop()
+
+    def on_fusion(self, event):
+        """Called on the submitting thread for every fused state change."""
+        self.hub.publish("posture", {"state": event.state, "vision": event.vision,
+                                     "pressure": event.pressure, "staleness": finite(event.staleness),
+                                     "time": datetime.now().isoformat(timespec="milliseconds")})
+
+    def vision_loop(self):
+        while not self.stop_event.is_set() and self.worker.is_running:
+            # The worker releases the camera while the seat is empty; fusion then resolves
+            # "No Person Detected" from the pressure labels alone (fusion.FusionEngine)
+            self.worker.set_paused(not occupancy.gate.occupied)
+            result = self.worker.get_result(timeout=0.5)
+            if result is None:
+                continue
+
+            metrics.record("vision.worker_frame", result["latency_ms"])
+            if result["keypoints"] is not None:
+                live_state.landmarks.append(result["keypoints"], timestamp=result["timestamp"])
+            filtered = self.posture_filter.update(result["pred"], result["probabilities"], result["timestamp"])
+
+            now = clocks.monotonic()
+            live_state.vision_labels.append(filtered, timestamp=now)
+            fusion.engine.submit_vision(filtered, timestamp=now)
+            if filtered != self.last_vision:
+                self.last_vision = filtered
+                self.hub.publish("vision", {"raw": result["pred"], "filtered": filtered,
+                                            "probabilities": result["probabilities"]})
+
+            # Log to database every 5 frames, like the desktop detector
+            self.frame_counter += 1
+            if self.frame_counter % 5 == 0:
+                timestamp = datetime.fromtimestamp(clocks.time()).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+                with metrics.span("db.save_posture"):
+                    posture_database.save_posture(filtered, timestamp=timestamp)
+
+    def metrics_loop(self):
+        while not self.stop_event.wait(self.metrics_interval):
+            _, sensors = live_state.pressure_samples.latest()
+            _, keypoints = live_state.landmarks.latest()
+            snapshot = fusion.engine.snapshot()
+            self.hub.publish("metrics", {
+                "fused": snapshot.state,
+                "vision": live_state.vision_labels.latest_label()[1],
+                "pressure": live_state.pressure_labels.latest_label()[1],
+                "staleness": finite(snapshot.staleness),
+                "occupied": occupancy.gate.occupied,
+                "sensors": None if sensors is None else [round(float(v), 2) for v in sensors],
+                "keypoints": None if keypoints is None else [round(float(v), 4) for v in keypoints],
+                "clients": len(self.hub.clients),
+                "stages": {stage: {"p50": round(s["p50"], 2), "p95": round(s["p95"], 2)}
+                           for stage, s in metrics.snapshot().items()},
+            })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1", help="address to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_STREAM_PORT)
+    parser.add_argument("--camera", type=int, default=0, help="camera index")
+    parser.add_argument("--no-vision", action="store_true", help="pressure only")
+    parser.add_argument("--no-pressure", action="store_true", help="vision only")
+    parser.add_argument("--metrics-interval", type=float, default=DEFAULT_METRICS_INTERVAL)
+    args = parser.parse_args()
+
+    PostSyncDaemon(args.host, args.port, args.camera, vision=not args.no_vision,
+                   pressure=not args.no_pressure, metrics_interval=args.metrics_interval).run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,36 @@
 import requests
-import time
+import clocks
 import numpy as np
-import matplotlib.pyplot as plt
-import csv
-import seaborn as sns
-import tkinter as tk
-from datetime import datetime
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from matplotlib.animation import FuncAnimation
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from PyQt5.QtWidgets import QLabel
-from posture_database import log_event_to_csv
-import tkinter as tk
+from event_bus import bus
+import live_state
+import fusion
+import occupancy
+from metrics import metrics
+from posture_filter import TemporalPostureFilter
 import threading
 from datetime import datetime
-from collections import deque
 
 # NodeMCU Server IP (Change this to your actual IP)
 NODEMCU_IP = "http://192.168.43.57"
 ENDPOINT = "/get_data"
 ENDPOINT_TRIGGER = "/haptic"
 
+POLL_INTERVAL = 0.5  # Seconds between NodeMCU polls
 HAPTIC_TRIGGER_INTERVAL = 0  # Seconds before another haptic trigger
 HAPTIC_DETECTION_TIME = 30    # Posture must be incorrect for 10 sec before triggering
 last_haptic_trigger_time = 0  # Stores last trigger time
 incorrect_posture_start_time = None  # Start time for incorrect posture
 haptic_active = True  # Track if haptic feedback is currently on
 recording = False
-latest_pressure_posture = "Unknown"
 pressure_sensor_error_notified = False
-posture_queue = deque(maxlen=5)  # Stores last 5 pressure postures
+# Majority vote over the last 5 pressure postures at the 0.5 s polling rate. The window keeps samples
+# up to and including its edge, so 2.25 s (not 2.5 s, which would hold 6) with room for poll jitter.
+posture_filter = TemporalPostureFilter(window_seconds=2.25, min_samples=5)
 last_filtered_posture = None     # Tracks last filtered result
 haptic_enabled = True  # Controlled by the UI toggle
+raw_posture = None  # Last unfiltered pressure posture
+filtered_posture = None  # Last filtered pressure posture
+ui_callback = None  # Registered by the desktop app (set_ui_callback); the daemon runs without one
 
 
 SENSOR_LABELS = [
@@ -53,31 +52,44 @@ chair_layout = np.array([
 # Thresholds
 USER_DETECTION_THRESHOLD = 3.0
 
-# Create Matplotlib figure for the heatmap
-fig, ax = plt.subplots(figsize=(6, 6))
+# Matplotlib heatmap and its label are only created by setup_heatmap(), so importing
+# this module does not pull in Matplotlib/seaborn or need a QApplication
+fig = None
+ax = None
+heatmap = None
 cbar = None  # Variable to hold the color bar reference
-
-# Initialize heatmap with dummy values
-dummy_matrix = np.full_like(chair_layout, np.nan, dtype=np.float64)
-heatmap = sns.heatmap(dummy_matrix, annot=False, cmap="RdYlGn_r",
-                      linewidths=1, linecolor="gray", cbar=True, ax=ax, vmin=0, vmax=10)
-cbar = heatmap.collections[0].colorbar  # Store the color bar
-
-# Embedding Matplotlib figure inside Tkinter
-canvas = FigureCanvas(fig)  #Use PyQt-compatible canvas
-
-# Label for detected posture
-
-posture_label = QLabel("Detecting...")
-posture_label.setStyleSheet("font-size: 14px; font-weight: bold; font-family: Arial;")
-
-def apply_posture_filter(new_posture):
-    """Apply a moving average (majority vote) filter to smooth posture."""
-    posture_queue.append(new_posture)
-    if len(posture_queue) == posture_queue.maxlen:
-        return max(set(posture_queue), key=posture_queue.count)
-    else:
-        return new_posture  # Not enough data yet, return raw
+canvas = None
+posture_label = None
+heatmap_visible = True  # Cleared while the window showing the heatmap is hidden or minimized
+
+def setup_heatmap():
+    """Create the Matplotlib figure, seaborn heatmap and posture label on first use."""
+    global fig, ax, heatmap, cbar, canvas, posture_label
+    if fig is not None:
+        return
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+    from PyQt5.QtWidgets import QLabel
+
+    # Create Matplotlib figure for the heatmap
+    fig, ax = plt.subplots(figsize=(6, 6))
+
+    # Initialize heatmap with dummy values
+    dummy_matrix = np.full_like(chair_layout, np.nan, dtype=np.float64)
+    heatmap = sns.heatmap(dummy_matrix, annot=False, cmap="RdYlGn_r",
+                          linewidths=1, linecolor="gray", cbar=True, ax=ax, vmin=0, vmax=10)
+    cbar = heatmap.collections[0].colorbar  # Store the color bar
+
+    canvas = FigureCanvas(fig)  #Use PyQt-compatible canvas
+
+    # Label for detected posture
+    posture_label = QLabel("Detecting...")
+    posture_label.setStyleSheet("font-size: 14px; font-weight: bold; font-family: Arial;")
+
+def apply_posture_filter(new_posture, timestamp=None):
+    """Apply a time-windowed majority vote filter to smooth posture."""
+    return posture_filter.update(new_posture, timestamp=timestamp)
 
 def start_recording():
     """Starts collecting data and updating the application."""
@@ -87,7 +99,7 @@ def start_recording():
     def collect_data():
         while recording:
             update(None)  # Calls the update function to collect data
-            time.sleep(0.5)  # Adjust sleep time to match data update rate
+            clocks.sleep(POLL_INTERVAL)  # Adjust sleep time to match data update rate
 
     data_thread = threading.Thread(target=collect_data, daemon=True)
     data_thread.start()
@@ -136,25 +148,29 @@ def classify_posture(sensor_values, ui_callback=None):
     if ui_callback:
         ui_callback(posture)
 
-    global latest_pressure_posture
-    latest_pressure_posture = posture
-
     return posture
 
+def record_pressure_posture(posture):
+    """Publish one classified pressure sample to the ring buffer, fusion and the occupancy gate."""
+    now = clocks.monotonic()
+    live_state.pressure_labels.append(posture, timestamp=now)
+    fusion.engine.submit_pressure(posture, timestamp=now)
+    occupancy.gate.update(posture, timestamp=now)
+
 import threading
 
 def set_haptic_enabled(state: bool):
     global haptic_enabled
     haptic_enabled = state
 
-def check_and_trigger_haptic(sensor_values):
+def check_and_trigger_haptic(posture):
     """Triggers haptic feedback as a pulse when incorrect posture is detected."""
     global last_haptic_trigger_time, incorrect_posture_start_time, haptic_active, raw_posture, filtered_posture
 
-    raw_posture = classify_posture(sensor_values)
+    raw_posture = posture
     filtered_posture = apply_posture_filter(raw_posture)
     posture = filtered_posture  # Use this throughout below
-    current_time = time.time()
+    current_time = clocks.time()
     
     if not haptic_enabled:
         return  # Haptic feedback is currently disabled
@@ -167,8 +183,9 @@ def check_and_trigger_haptic(sensor_values):
             if current_time - last_haptic_trigger_time >= HAPTIC_TRIGGER_INTERVAL:
                 try:
                     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                    log_event_to_csv("Triggering haptic feedback (1)")
-                    requests.get(f"{NODEMCU_IP}{ENDPOINT_TRIGGER}?trigger=1")
+                    bus.log_event("Triggering haptic feedback (1)")
+                    with metrics.span("haptic.trigger_get"):
+                        requests.get(f"{NODEMCU_IP}{ENDPOINT_TRIGGER}?trigger=1")
                     haptic_active = True
                     last_haptic_trigger_time = current_time
 
@@ -176,13 +193,13 @@ def check_and_trigger_haptic(sensor_values):
                     def stop_haptic():
                         try:
                             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                            log_event_to_csv("Turning off haptic feedback (0)")
+                            bus.log_event("Turning off haptic feedback (0)")
                             requests.get(f"{NODEMCU_IP}{ENDPOINT_TRIGGER}?trigger=0")
                             haptic_active = False
                         except requests.RequestException as e:
                             print(f"Warning: Haptic stop request failed: {e}")
 
-                    threading.Timer(0.1, stop_haptic).start()
+                    clocks.call_later(0.1, stop_haptic)
 
                 except requests.RequestException as e:
                     print(f"Warning: Haptic request failed: {e}")
@@ -190,87 +207,121 @@ def check_and_trigger_haptic(sensor_values):
         incorrect_posture_start_time = None  # Reset timer
 
 
-def update_posture_in_app(posture, parent_widget=None):
-    """Update posture in the UI."""
-    from app import HomePage  #Import inside the function
+def set_ui_callback(callback):
+    """Register callback(posture), called on the polling thread for every pressure sample (None to remove)."""
+    global ui_callback
+    ui_callback = callback
 
-    if parent_widget and isinstance(parent_widget, HomePage):
-        parent_widget.update_pressure_posture(posture)
-posture = "unknown"
+def update_posture_in_app(posture):
+    """Update posture in the UI, if one has registered a callback."""
+    if ui_callback:
+        ui_callback(posture)
+
+def render_heatmap(sensor_values, posture):
+    """Redraw the heatmap (only called once setup_heatmap() has created it)."""
+    global cbar, heatmap
+    import seaborn as sns
+
+    sensor_matrix = np.full_like(
+        chair_layout, np.nan, dtype=np.float64)
+    annot_matrix = np.full_like(chair_layout, "", dtype=object)
+
+    # Assign values to correct sensor locations
+    for i, sensor_index in enumerate(chair_layout.flatten()):
+        if sensor_index > 0:
+            value = sensor_values[sensor_index - 1]
+            sensor_matrix[np.where(
+                chair_layout == sensor_index)] = value
+            annot_matrix[np.where(
+                chair_layout == sensor_index)] = f"{value:.1f}"
+
+    # Remove previous heatmap and redraw with updated values
+    ax.clear()
+    ax.set_title("Real-Time Pressure Sensor Heatmap")
+
+    heatmap = sns.heatmap(
+        sensor_matrix, annot=annot_matrix, fmt="s", cmap="RdYlGn_r",
+        linewidths=1, linecolor="gray", cbar=False, ax=ax, vmin=0, vmax=10
+    )
+
+    # Reuse existing color bar
+    if cbar:
+        cbar.update_normal(heatmap.collections[0])
+    else:
+        cbar = heatmap.collections[0].colorbar
+
+    posture_label.setText(f"Detected: {posture}")  #Still updates local UI
+    canvas.draw()
 
 def update(frame):
     """Update the heatmap and detect posture"""
-    global chair_layout, cbar, heatmap, posture
     global pressure_sensor_error_notified  # Track if error was already 
 
     try:
-        response = requests.get(f"{NODEMCU_IP}{ENDPOINT}", timeout=3)
+        with metrics.span("pressure.nodemcu_get"):
+            response = requests.get(f"{NODEMCU_IP}{ENDPOINT}", timeout=3)
         response.raise_for_status()  # Raise an error if response status is not 200
 
         sensor_values = list(map(float, response.text.strip().split(",")))
         if len(sensor_values) == len(SENSOR_LABELS):
-            sensor_matrix = np.full_like(
-                chair_layout, np.nan, dtype=np.float64)
-            annot_matrix = np.full_like(chair_layout, "", dtype=object)
-
-            # Assign values to correct sensor locations
-            for i, sensor_index in enumerate(chair_layout.flatten()):
-                if sensor_index > 0:
-                    value = sensor_values[sensor_index - 1]
-                    sensor_matrix[np.where(
-                        chair_layout == sensor_index)] = value
-                    annot_matrix[np.where(
-                        chair_layout == sensor_index)] = f"{value:.1f}"
-
-            # Remove previous heatmap and redraw with updated values
-            ax.clear()
-            ax.set_title("Real-Time Pressure Sensor Heatmap")
-
-            heatmap = sns.heatmap(
-                sensor_matrix, annot=annot_matrix, fmt="s", cmap="RdYlGn_r",
-                linewidths=1, linecolor="gray", cbar=False, ax=ax, vmin=0, vmax=10
-            )
-
-            # Reuse existing color bar
-            if cbar:
-                cbar.update_normal(heatmap.collections[0])
-            else:
-                cbar = heatmap.collections[0].colorbar
+            live_state.pressure_samples.append(sensor_values)
 
             # Classify posture and update label
-            posture = classify_posture(sensor_values)
+            with metrics.span("pressure.classify"):
+                posture = classify_posture(sensor_values)
+            record_pressure_posture(posture)
 
             update_posture_in_app(posture)
-            posture_label.setText(f"Detected: {posture}")  #Still updates local UI
 
             # Check for haptic feedback trigger
-            check_and_trigger_haptic(sensor_values)
+            check_and_trigger_haptic(posture)
 
-            canvas.draw()
+            if fig is not None and heatmap_visible:
+                with metrics.span("pressure.heatmap_redraw"):
+                    render_heatmap(sensor_values, posture)
 
             #Reset error notification if successful
             pressure_sensor_error_notified = False
+        else:
+            print(f"Warning: Expected {len(SENSOR_LABELS)} pressure values, got {len(sensor_values)}")
+            occupancy.gate.update("Unknown")  # Fail open: vision must not idle on bad data
 
     except requests.exceptions.RequestException as e:
+        occupancy.gate.update("Unknown")
         if not pressure_sensor_error_notified:
             print(f"Warning: Pressure sensor is not responding. Error: {e}")
             pressure_sensor_error_notified = True
+    except ValueError:
+        print(f"Warning: Garbled pressure payload: {response.text[:80]!r}")
+        occupancy.gate.update("Unknown")
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
     print(f"[{timestamp}] Raw: {raw_posture} | Filtered: {filtered_posture}")
 
+def set_heatmap_visible(visible):
+    """Pause heatmap redraws while hidden; redraw once from the latest reading when shown."""
+    global heatmap_visible
+    heatmap_visible = visible
+    if visible and fig is not None:
+        _, sensor_values = live_state.pressure_samples.latest()
+        if sensor_values is not None:
+            render_heatmap(list(sensor_values), get_latest_pressure_posture())
+
 #Simple getter
 def get_latest_pressure_posture():
-    return latest_pressure_posture
+    return live_state.pressure_labels.latest_label()[1]
 
 # Animation for updating heatmap
 ani = None  # Global variable
 
 def setup_animation():
     global ani
+    from matplotlib.animation import FuncAnimation
+    setup_heatmap()
     ani = FuncAnimation(fig, update, interval=500, cache_frame_data=False)
 
 if __name__ == "__main__":  
     setup_animation()
     start_recording()  # Or your main function
+    import matplotlib.pyplot as plt
     plt.show()  # Keep this if you need the heatmap to display
 
@@ -0,0 +1,129 @@
+import queue
+import threading
+import time
+from datetime import datetime
+import clocks
+from posture_database import write_events_to_csv
+
+DEFAULT_DEDUPE_WINDOW = 10  # Seconds before an identical notification may repeat
+DEFAULT_FLUSH_INTERVAL = 2.0  # Seconds between event log flushes
+
+
+class EventBus:
+    """Single background worker that owns desktop notifications and the event log.
+
+    Callers on the UI or sensor threads only enqueue. The worker applies
+    per-category cooldowns and dedupes identical messages before calling the
+    notification backend, and buffers event log rows, writing them to CSV in
+    one batch every `flush_interval` seconds.
+    """
+
+    def __init__(self, log_filename="event_logs.csv", flush_interval=DEFAULT_FLUSH_INTERVAL,
+                 dedupe_window=DEFAULT_DEDUPE_WINDOW, cooldowns=None, notifier=None, clock=clocks.monotonic):
+        self.log_filename = log_filename
+        self.flush_interval = flush_interval
+        self.dedupe_window = dedupe_window
+        self.cooldowns = dict(cooldowns or {})  # category -> seconds
+        self.notifier = notifier  # notifier(title, message); None uses plyer
+        self.clock = clock  # Drives dedupe and cooldowns (flushing always uses real time)
+        self.queue = queue.Queue()
+        self.log_buffer = []
+        self.last_sent = {}  # category -> (message, time)
+        self.last_message_time = {}  # message -> time
+        self.sent = 0
+        self.suppressed = 0
+        self.thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, daemon=True)
+                self.thread.start()
+
+    def stop(self, timeout=5):
+        """Flush pending events and stop the worker."""
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put(("stop", None))
+            self.thread.join(timeout=timeout)
+        self.thread = None
+
+    def set_cooldown(self, category, seconds):
+        self.cooldowns[category] = seconds
+
+    def notify(self, message, category="posture", title="Posture Alert"):
+        """Queue a desktop notification."""
+        self.start()
+        self.queue.put(("notify", (title, message, category)))
+
+    def log_event(self, message):
+        """Queue an event log row, timestamped now."""
+        self.start()
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+        self.queue.put(("log", (timestamp, message)))
+
+    def flush(self):
+        """Ask the worker to write buffered log rows now."""
+        self.start()
+        self.queue.put(("flush", None))
+
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                kind, payload = self.queue.get(timeout=max(0, next_flush - time.monotonic()))
+            except queue.Empty:
+                kind, payload = "flush", None
+
+            if kind == "notify":
+                self._send_notification(*payload)
+            elif kind == "log":
+                self.log_buffer.append(payload)
+
+            if kind in ("flush", "stop") or time.monotonic() >= next_flush:
+                self._write_log()
+                next_flush = time.monotonic() + self.flush_interval
+            if kind == "stop":
+                break
+
+    def _should_send(self, message, category, now):
+        last = self.last_message_time.get(message)
+        if last is not None and now - last < self.dedupe_window:
+            return False
+        cooldown = self.cooldowns.get(category, 0)
+        previous = self.last_sent.get(category)
+        if previous is not None and now - previous[1] < cooldown:
+            return False
+        return True
+
+    def _send_notification(self, title, message, category):
+        now = self.clock()
+        if not self._should_send(message, category, now):
+            self.suppressed += 1
+            return
+        print(f"Notification sent: {message}")
+        try:
+            if self.notifier is not None:
+                self.notifier(title, message)
+            else:
+                from plyer import notification
+                notification.notify(title=title, message=message, timeout=5)
+            self.last_sent[category] = (message, now)
+            self.last_message_time[message] = now
+            self.sent += 1
+        except Exception as e:
+            print(f"Notification error: {e}")
+
+    def _write_log(self):
+        if not self.log_buffer:
+            return
+        rows, self.log_buffer = self.log_buffer, []
+        try:
+            write_events_to_csv(rows, self.log_filename)
+        except OSError as e:
+            print(f"Warning: Could not write event log: {e}")
+            self.log_buffer = rows + self.log_buffer  # Retry on the next flush
+
+
+# Shared bus used by the UI and the sensor thread
+bus = EventBus()
@@ -1,60 +1,40 @@
-import sys
 import os
-import cv2
-import csv
-import mediapipe as mp
-import pandas as pd
 import numpy as np
-import joblib
 import threading
-import sqlite3
 import time
-from plyer import notification
 from PyQt5.QtCore import pyqtSignal, QObject
-from collections import deque
 from datetime import datetime
+import clocks
 import posture_database
+import live_state
+import fusion
+import occupancy
+from signal_bridge import CoalescingBridge
+from posture_filter import TemporalPostureFilter
+from governor import DEFAULT_START_LEVEL, PROFILES, PerformanceGovernor, apply_capture_settings
+from pose_worker import PoseWorker
+from landmark_tracker import LandmarkTracker
+from frame_source import CameraSource, open_source
+from metrics import metrics
+from preview_widget import FrameSlot
+# The model, labels and keypoint helpers live in pose_pipeline so the worker process can use them
+from pose_pipeline import (
+    labels, required_landmarks, feature_names, load_models, create_pose,
+    extract_keypoints, compute_bbox, classify_keypoints, probabilities_by_label
+)
 import warnings
 
 warnings.filterwarnings("ignore", category=UserWarning)
 
-latest_vision_posture = "Unknown"
-global bbox
-
-# Load Machine Learning Model and Scaler
-model = joblib.load(os.path.join(os.path.dirname(__file__), "models", "svm.pkl"))
-scaler = joblib.load(os.path.join(os.path.dirname(__file__), "models", "scaler.pkl"))
-
 last_log_time = None  # Store the last logged timestam
 
-# Initialize MediaPipe Pose
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
-# Mapping of posture labels
-labels = {
-    0: "Upright",
-    1: "Leaning Forward",
-    2: "Leaning Backward",
-    3: "Leaning Left",
-    4: "Leaning Right"
-}
-
-# Required landmarks
-required_landmarks = [
-    "nose", "left_eye_inner", "left_eye", "left_eye_outer",
-    "right_eye_inner", "right_eye", "right_eye_outer",
-    "left_ear", "right_ear", "mouth_left", "mouth_right",
-    "left_shoulder", "right_shoulder"
-]
-
-# Variables for single-subject tracking
-subject_id = None
-bbox = None  # Bounding box for the tracked subject
-tracking_initialized = False
-
-# Column names for keypoints
-feature_names = [
-    f"{landmark}_{axis}" for landmark in required_landmarks for axis in ['x', 'y', 'z']]
+def warm_up_in_background():
+    """Load the heavy models and the first pose graph on a daemon thread so Start does not stall the UI."""
+    model_complexity = PROFILES[DEFAULT_START_LEVEL].model_complexity  # What the governor starts with
+    thread = threading.Thread(target=load_models, args=(model_complexity,), daemon=True)
+    thread.start()
+    return thread
+
 
 class Features:
     """Handles the application's backend logic."""
@@ -81,7 +61,7 @@ class PostureDetector(QObject):
     notification_alert = pyqtSignal(str)  # Signal to update UI log
     notification_enabled = True  # NEW: Tracks whether notifications are on/off
 
-    def __init__(self):
+    def __init__(self, governor=None, use_worker_process=False, source=0):
         super().__init__()
         self.is_running = False
         self.thread = None
@@ -91,7 +71,28 @@ class PostureDetector(QObject):
         self.posture_start_time = None  # Track when posture started
         self.last_notification = None  # Track last notification sent
         self.frame_counter = 0  # Tracks number of processed frames
-        self.posture_queue = deque(maxlen=5)  # Stores last 5 postures for filtering
+        # Smooths postures over ~0.3 s using the SVM probabilities (about 5 frames at 15 fps)
+        self.posture_filter = TemporalPostureFilter(window_seconds=0.3, hysteresis=0.1)
+        self.bbox = None  # Bounding box for the tracked subject
+        # Only forward posture changes (plus a heartbeat) to the UI thread
+        self.bridge = CoalescingBridge(self.posture_updated.emit)
+        # Adapts model complexity and capture settings to the latency/CPU budget
+        self.governor = governor if governor is not None else PerformanceGovernor()
+        self.pose = None
+        # Predicts landmarks between MediaPipe runs; a real pose run is forced when it drifts
+        self.tracker = LandmarkTracker()
+        # Optionally run capture + inference in a separate process (see pose_worker)
+        self.use_worker_process = use_worker_process
+        self.worker = None
+        # Camera index, video file, image directory or "synthetic" (see frame_source)
+        self.source = source
+        # Cleared while the app is minimized or in the tray: frames are processed but not drawn
+        self.preview_enabled = True
+        # Latest frame and keypoints for the UI's CameraPreview, which draws the overlays itself
+        self.frame_slot = FrameSlot()
+        # Standalone run() has no Qt window and shows frames with OpenCV HighGUI instead
+        self.preview_window = False
+        self.preview_open = False
 
         self.screenshot_counts = {
             "Upright": 0,
@@ -107,10 +108,15 @@ class PostureDetector(QObject):
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     def start_detection(self):
-        """Start posture detection in a separate thread."""
+        """Start posture detection in a separate thread (and worker process if enabled)."""
         if not self.is_running:
             self.is_running = True
-            self.thread = threading.Thread(target=self.run_pose_detection, daemon=True)
+            target = self.run_pose_detection
+            if self.use_worker_process:
+                self.worker = PoseWorker(model_complexity=self.governor.profile.model_complexity)
+                self.worker.start()
+                target = self.run_worker_results
+            self.thread = threading.Thread(target=target, daemon=True)
             self.thread.start()
 
     def stop_detection(self):
@@ -121,163 +127,301 @@ class PostureDetector(QObject):
         """Enable or disable pop-up notifications."""
         self.notification_enabled = state
 
-    def apply_moving_average(self, new_posture):
-        """Update queue and return the most frequent posture."""
-        self.posture_queue.append(new_posture)  # Add new detection
-        return max(set(self.posture_queue), key=self.posture_queue.count)  # Return most common posture
+    def apply_moving_average(self, new_posture, probabilities=None, timestamp=None):
+        """Add a detection to the temporal filter and return the smoothed posture."""
+        return self.posture_filter.update(new_posture, probabilities, timestamp)
+
+    def publish_posture(self, pred, image, probabilities=None, save_screenshot=True):
+        """Filter a raw prediction, save screenshots and publish it to the app. Returns the filtered posture.
+
+        Pass save_screenshot=False for frames classified from tracker-predicted
+        landmarks, so only real MediaPipe measurements become training images.
+        """
+        import cv2
+
+        # Apply filtering to stabilize posture classification
+        filtered_posture = self.apply_moving_average(pred, probabilities)
+
+        # Save the screenshot
+        if (save_screenshot and filtered_posture in self.screenshot_counts
+                and self.screenshot_counts[filtered_posture] < self.max_screenshots):
+            posture_folder = os.path.join(self.screenshot_dir, filtered_posture.replace(" ", "_"))
+            os.makedirs(posture_folder, exist_ok=True)
+
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")[:-3]
+            filename = f"{filtered_posture.replace(' ', '_')}_{timestamp}.jpg"
+            filepath = os.path.join(posture_folder, filename)
+
+            with metrics.span("vision.imwrite"):
+                cv2.imwrite(filepath, image)
+            #print(f"Saved screenshot: {filepath}")
+            self.screenshot_counts[filtered_posture] += 1
+
+        now = clocks.monotonic()
+        live_state.vision_labels.append(filtered_posture, timestamp=now)
+        fusion.engine.submit_vision(filtered_posture, timestamp=now)
+        self.bridge.publish(filtered_posture)
+
+        # Increment frame counter
+        self.frame_counter += 1
+
+        # Log to database every 5 frames (~2 times per second)
+        if self.frame_counter % 5 == 0:
+            timestamp = datetime.fromtimestamp(clocks.time()).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+            with metrics.span("db.save_posture"):
+                posture_database.save_posture(filtered_posture, timestamp=timestamp)
+
+        return filtered_posture
+
+    def draw_overlay(self, image, pred):
+        """Draw the posture label and bounding box on the preview image."""
+        import cv2
+
+        # Display prediction
+        cv2.putText(image, f"Posture: {pred}", (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2, cv2.LINE_AA)
+
+        # Draw bounding box
+        if self.bbox:
+            x, y, w, h = self.bbox
+            cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
+
+    def show_preview(self, image):
+        """Show the webcam feed; returns False when the window was closed or 'q' pressed."""
+        import cv2
+
+        cv2.imshow('Webcam Feed', image)
+        self.preview_open = True
+
+        # Exit if window was closed or 'q' was pressed
+        if cv2.getWindowProperty('Webcam Feed', cv2.WND_PROP_VISIBLE) == 0:
+            self.is_running = False
+            return False
+
+        if cv2.waitKey(10) & 0xFF == ord('q'):
+            return False
+        return True
+
+    def process_frame(self, frame, now=None, mirror=True):
+        """Pose estimation (or landmark prediction) and classification for one BGR frame.
+
+        Returns (image, pred, probabilities, results). `results` is the
+        MediaPipe output, or None on frames where the tracker predicted the
+        landmarks instead.
+        """
+        import cv2
+
+        if mirror:
+            frame = cv2.flip(frame, 1)  # Mirror effect for natural interaction
+        image = frame.copy()
+        now = clocks.monotonic() if now is None else now
+
+        pred = "No Pose Detected"
+        probabilities = None
+        results = None
+        keypoints = None
+
+        if self.tracker.needs_measurement():
+            with metrics.span("vision.cvtColor"):
+                rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            with metrics.span("vision.pose_process"):
+                results = self.pose.process(rgb_image)
 
+            if results.pose_landmarks:
+                landmarks = results.pose_landmarks.landmark
+
+                # Continuously update the bounding box to track movement
+                self.bbox = compute_bbox(landmarks, frame.shape)
+
+                # Ensure keypoints are extracted only from the tracked subject
+                keypoints = self.tracker.update(extract_keypoints(landmarks), now)
+            else:
+                self.tracker.reset()
+        else:
+            # Between MediaPipe runs, classify the tracker's predicted landmarks
+            with metrics.span("vision.track_predict"):
+                keypoints = self.tracker.predict(now)
+
+        if keypoints is not None:
+            live_state.landmarks.append(keypoints, timestamp=now)
+            try:
+                pred, pred_probs = classify_keypoints(keypoints)
+                probabilities = probabilities_by_label(pred_probs)
+            except Exception as e:
+                print(f"Error during prediction: {e}")
+
+        return image, pred, probabilities, results
+
+    def draw_landmarks(self, image, results):
+        """Draw pose landmarks on the image (only if landmarks exist)."""
+        import mediapipe as mp
+
+        if results is not None and results.pose_landmarks:
+            draw_start = time.perf_counter()
+            mp_drawing = mp.solutions.drawing_utils
+            mp_drawing.draw_landmarks(
+                image,
+                results.pose_landmarks,
+                mp.solutions.pose.POSE_CONNECTIONS,
+                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
+                mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
+            )
+            metrics.record("vision.draw", (time.perf_counter() - draw_start) * 1000)
+
+    def publish_preview(self, image, keypoints, pred):
+        """Hand the frame and its 39 keypoint features to the preview widget (no drawing here)."""
+        points = None
+        if keypoints is not None:
+            points = [(float(x), float(y)) for x, y, _ in np.asarray(keypoints).reshape(-1, 3)]
+        self.frame_slot.publish(image, points, self.bbox, pred)
+
+    def tracked_keypoints(self):
+        """Current keypoints from the landmark tracker, or None while no pose is tracked."""
+        return self.tracker.x[:, 0].copy() if self.tracker.initialized else None
+
+    def close_preview(self):
+        """Destroy the preview window (from the detection thread that created it)."""
+        import cv2
+
+        self.frame_slot.clear()
+        if self.preview_open:
+            cv2.destroyWindow('Webcam Feed')
+            cv2.waitKey(1)
+            self.preview_open = False
 
     def run_pose_detection(self):
         """Continuously capture frames and process posture detection."""
-        global tracking_initialized, bbox
-        global latest_vision_posture
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
-        print(f"Vision Posture: {latest_vision_posture}")
+        import cv2
+        profile = self.governor.profile
+        # Takes over the welcome screen warm-up's graph when its complexity matches
+        self.pose = create_pose(profile.model_complexity)
+
+        cap = self.open_capture(profile)
+        self.tracker.reset()
+        print(f"Vision Posture: {get_latest_vision_posture()}")
 
         global last_log_time  
         last_log_time = None  # Ensure it's initialized properly
 
+        gate = occupancy.gate
         while self.is_running:
-            ret, frame = cap.read()
+            # Empty seat: probe once per interval, release the camera after a while
+            if not gate.occupied:
+                if cap is not None and gate.should_release_camera():
+                    cap.release()
+                    cap = None
+                    self.tracker.reset()
+                    print("[INFO] Camera released while the seat is empty.")
+                occupied = gate.wait_until_occupied(gate.probe_interval)
+                if not self.is_running or (not occupied and cap is None):
+                    continue
+            if cap is None:
+                cap = self.open_capture(profile)
+
+            with metrics.span("vision.read"):
+                ret, frame = cap.read()
             if not ret:
+                if not isinstance(cap, CameraSource):
+                    break  # A recording or image folder has run out of frames
                 continue
+            frame_start = time.perf_counter()
+
+            image, pred, probabilities, results = self.process_frame(
+                frame, mirror=not getattr(cap, "mirrored", False))
+            if self.preview_window and self.preview_enabled:
+                self.draw_landmarks(image, results)
+
+            # Only frames that went through MediaPipe are saved as labelled screenshots
+            self.publish_posture(pred, image, probabilities, save_screenshot=results is not None)
+
+            # Let the governor adapt the pipeline to the measured per-frame latency
+            frame_ms = (time.perf_counter() - frame_start) * 1000
+            metrics.record("vision.frame", frame_ms)
+            new_profile = self.governor.record(frame_ms)
+            if new_profile is not None:
+                if new_profile.model_complexity != profile.model_complexity:
+                    self.pose.close()
+                    self.pose = create_pose(new_profile.model_complexity)
+                apply_capture_settings(cap, new_profile)
+                profile = new_profile
+
+            if not self.preview_enabled:
+                self.close_preview()
+            elif self.preview_window:
+                self.draw_overlay(image, pred)
+                if not self.show_preview(image):
+                    break
+            else:
+                self.publish_preview(image, self.tracked_keypoints(), pred)
 
-            frame = cv2.flip(frame, 1)  # Mirror effect for natural interaction
-            image = frame.copy()
-            rgb_image = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            results = pose.process(rgb_image)
-
-            pred = "No Pose Detected"
-
-            if results.pose_landmarks:
-                landmarks = results.pose_landmarks.landmark
-                keypoints = []
-
-                # Compute bounding box around the detected pose
-                x_min = min(lm.x for lm in landmarks)
-                y_min = min(lm.y for lm in landmarks)
-                x_max = max(lm.x for lm in landmarks)
-                y_max = max(lm.y for lm in landmarks)
+        self.bridge.flush()
+        self.pose.close()
+        if cap is not None:
+            cap.release()
+        self.close_preview()
+        cv2.destroyAllWindows()
 
-                # Adjust the bounding box to include some extra space above the head
-                y_min = max(0, y_min - 0.2)  # Shift the top boundary upwards by 20%
+    def open_capture(self, profile):
+        """Open the frame source; live cameras get the governor's current capture settings."""
+        import cv2
+        cap = open_source(self.source)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
+        apply_capture_settings(cap, profile)
+        return cap
+
+    def run_worker_results(self):
+        """Consume results from the pose worker process and publish them."""
+        import cv2
+
+        while self.is_running and self.worker.is_running:
+            # The worker releases the camera and skips inference while the seat is empty
+            self.worker.set_paused(not occupancy.gate.occupied)
+            result = self.worker.get_result(timeout=0.5)
+            if result is None:
+                continue
 
-                new_bbox = (int(x_min * frame.shape[1]), int(y_min * frame.shape[0]),
-                            int((x_max - x_min) * frame.shape[1]), int((y_max - y_min) * frame.shape[0]))
+            # The frame this result was computed on; skip results whose frame was already overwritten
+            image = self.worker.frame(result["frame_id"])
+            if image is None:
+                continue
 
-                if not tracking_initialized:
-                    subject_id = 1  # Assign an ID to the first detected person
-                    bbox = new_bbox
-                    tracking_initialized = True
-                else:
-                    bbox = new_bbox  # Continuously update the bounding box to track movement
+            self.bbox = result["bbox"]
+            if result["keypoints"] is not None:
+                live_state.landmarks.append(result["keypoints"], timestamp=result["timestamp"])
 
-                # Ensure keypoints are extracted only from the tracked subject
-                keypoints = []
-                for landmark_name in required_landmarks:
-                    lm = getattr(mp_pose.PoseLandmark, landmark_name.upper())
-                    keypoints.extend(
-                        [landmarks[lm].x, landmarks[lm].y, landmarks[lm].z])
-
-                if keypoints:
-                    keypoints = np.array(keypoints).reshape(1, -1)
-                    keypoints_df = pd.DataFrame(keypoints, columns=feature_names)
-
-                    try:
-                        keypoints_scaled = scaler.transform(keypoints_df)
-                        pred_label = model.predict(keypoints_scaled)[0]
-                        pred_probs = model.predict_proba(keypoints_scaled)[0]
-                        pred = labels.get(pred_label, "Unknown Posture")
-                        prob = pred_probs[pred_label]
-                    except Exception as e:
-                        print(f"Error during prediction: {e}")
-
-            # Apply filtering to stabilize posture classification
-            filtered_posture = self.apply_moving_average(pred)
-
-            # Initialize drawing utils
-            mp_drawing = mp.solutions.drawing_utils
+            self.publish_posture(result["pred"], image, result["probabilities"])
+            if not self.preview_enabled:
+                self.close_preview()
+                continue
+            if not self.preview_window:
+                self.publish_preview(image, result["keypoints"], result["pred"])
+                continue
 
-            # Draw pose landmarks on the image (only if landmarks exist)
-            if results.pose_landmarks:
-                mp_drawing.draw_landmarks(
-                    image,
-                    results.pose_landmarks,
-                    mp.solutions.pose.POSE_CONNECTIONS,
-                    mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2),
-                    mp_drawing.DrawingSpec(color=(255, 0, 0), thickness=2)
-                )
-
-            # Put the posture label as overlay text
-            # cv2.putText(image, f"Posture: {filtered_posture}", (10, 30),
-            #             cv2.FONT_HERSHEY_SIMPLEX, 0.9, (0, 255, 255), 2, cv2.LINE_AA)
-
-            # Save the screenshot
-            if filtered_posture in self.screenshot_counts and self.screenshot_counts[filtered_posture] < self.max_screenshots:
-                posture_folder = os.path.join(self.screenshot_dir, filtered_posture.replace(" ", "_"))
-                os.makedirs(posture_folder, exist_ok=True)
-
-                timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")[:-3]
-                filename = f"{filtered_posture.replace(' ', '_')}_{timestamp}.jpg"
-                filepath = os.path.join(posture_folder, filename)
-
-                cv2.imwrite(filepath, image) 
-                #print(f"Saved screenshot: {filepath}")
-                self.screenshot_counts[filtered_posture] += 1
-
-                
-            latest_vision_posture = filtered_posture
-            self.posture_updated.emit(filtered_posture)
-
-            # Increment frame counter
-            self.frame_counter += 1
-
-            # Log to database every 5 frames (~2 times per second)
-            if self.frame_counter % 5 == 0:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-                posture_database.save_posture(filtered_posture, timestamp=timestamp)
+            # Landmarks arrive as normalized (x, y) points; draw them as dots
+            if result["landmarks"]:
+                height, width = image.shape[:2]
+                for x, y in result["landmarks"]:
+                    cv2.circle(image, (int(x * width), int(y * height)), 2, (0, 255, 0), -1)
 
-            # Display prediction and probability
-            if 'prob' in locals() and prob is not None:
-                cv2.putText(image, f"Posture: {pred}", (50, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2, cv2.LINE_AA)
-            else:
-                cv2.putText(image, f"Posture: {pred}", (50, 50),
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 0, 0), 2, cv2.LINE_AA)
-
-            # Draw bounding box
-            if bbox:
-                x, y, w, h = bbox
-                cv2.rectangle(image, (x, y), (x + w, y + h), (0, 255, 0), 2)
-                cv2.putText(image, "", (x, y - 10),
-                            cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2, cv2.LINE_AA)
-
-            # Draw landmarks
-            mp.solutions.drawing_utils.draw_landmarks(
-                image, results.pose_landmarks, mp_pose.POSE_CONNECTIONS)
-
-            # Show webcam feed
-            cv2.imshow('Webcam Feed', image)
-
-            # Exit if window was closed or 'q' was pressed
-            if cv2.getWindowProperty('Webcam Feed', cv2.WND_PROP_VISIBLE) == 0:
-                self.is_running = False
-                break
+            self.draw_overlay(image, result["pred"])
 
-            if cv2.waitKey(10) & 0xFF == ord('q'):
+            if not self.show_preview(image):
                 break
 
-        cap.release()
+        self.bridge.flush()
+        self.worker.stop()
+        self.worker = None
+        self.close_preview()
         cv2.destroyAllWindows()
 
 def get_latest_vision_posture():
-    return latest_vision_posture
+    return live_state.vision_labels.latest_label()[1]
 
 def run():
     """Standalone execution entry point."""
     try:
         detector = PostureDetector()
+        detector.preview_window = True
         detector.is_running = True
         detector.run_pose_detection()
     except KeyboardInterrupt:
@@ -0,0 +1,236 @@
+import os
+import time
+from abc import ABC, abstractmethod
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+DEFAULT_REPLAY_FPS = 15.0  # Nominal rate for sources without their own timing
+
+
+class FrameSource(ABC):
+    """A stream of BGR frames with the parts of the cv2.VideoCapture API the pipeline uses.
+
+    read() returns (ret, frame) like VideoCapture. After a read, `label` holds
+    the recorded posture of that frame (None if unknown) and `timestamp` its
+    position in seconds from the start of the stream. `mirrored` is True when
+    frames were already flipped by the detector (e.g. saved screenshots).
+    """
+
+    mirrored = False
+
+    def __init__(self, fps=DEFAULT_REPLAY_FPS, realtime=False):
+        self.fps = fps
+        self.realtime = realtime  # Pace reads at `fps` instead of as fast as possible
+        self.index = -1
+        self.label = None
+        self.timestamp = None
+        self._started = None
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return False  # Capture settings only apply to live cameras
+
+    def get(self, prop):
+        return 0.0
+
+    @abstractmethod
+    def _next(self):
+        """Return the next (frame, label), or None at the end of the stream."""
+
+    def read(self):
+        item = self._next()
+        if item is None:
+            return False, None
+        frame, self.label = item
+        self.index += 1
+        self.timestamp = self.index / self.fps
+        if self.realtime:
+            if self._started is None:
+                self._started = time.monotonic()
+            delay = self._started + self.timestamp - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+        return True, frame
+
+    def release(self):
+        pass
+
+    def __iter__(self):
+        """Yield (frame, label, timestamp) until the source is exhausted."""
+        while True:
+            ret, frame = self.read()
+            if not ret:
+                break
+            yield frame, self.label, self.timestamp
+
+
+class CameraSource(FrameSource):
+    """Live webcam; capture settings are passed through to the device."""
+
+    def __init__(self, index=0):
+        import cv2
+        super().__init__()
+        self.cap = cv2.VideoCapture(index)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def set(self, prop, value):
+        return self.cap.set(prop, value)
+
+    def get(self, prop):
+        return self.cap.get(prop)
+
+    def _next(self):
+        ret, frame = self.cap.read()
+        return (frame, None) if ret else None
+
+    def read(self):
+        # Live frames are never paced and carry wall-clock timestamps
+        item = self._next()
+        if item is None:
+            return False, None
+        self.index += 1
+        self.timestamp = time.monotonic()
+        return True, item[0]
+
+    def release(self):
+        self.cap.release()
+
+
+def load_label_file(path):
+    """Read a `frame,label` CSV (header optional) into a {frame_index: label} dict."""
+    import csv
+    labels = {}
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.reader(file):
+            if len(row) < 2 or not row[0].strip().isdigit():
+                continue  # Header or blank line
+            labels[int(row[0])] = row[1].strip()
+    return labels
+
+
+class VideoFileSource(FrameSource):
+    """Recorded video; per-frame labels come from an optional `frame,label` CSV.
+
+    By default a `<video>.labels.csv` next to the file is used if it exists.
+    """
+
+    def __init__(self, path, labels_path=None, realtime=False, loop=False):
+        import cv2
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise FileNotFoundError(f"Cannot open video file: {path}")
+        super().__init__(self.cap.get(cv2.CAP_PROP_FPS) or DEFAULT_REPLAY_FPS, realtime)
+        self.path = path
+        self.loop = loop
+        if labels_path is None and os.path.exists(path + ".labels.csv"):
+            labels_path = path + ".labels.csv"
+        self.labels = load_label_file(labels_path) if labels_path else {}
+        self.position = 0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _next(self):
+        import cv2
+        ret, frame = self.cap.read()
+        if not ret and self.loop and self.position:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.position = 0
+            ret, frame = self.cap.read()
+        if not ret:
+            return None
+        label = self.labels.get(self.position)
+        self.position += 1
+        return frame, label
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Still images, e.g. the detector's screenshots/<Posture>/ folders.
+
+    Each image is labelled with its first-level folder name (underscores back
+    to spaces), so a screenshots tree replays with its recorded postures.
+    """
+
+    mirrored = True  # The detector saves frames after flipping them
+
+    def __init__(self, root, fps=DEFAULT_REPLAY_FPS, realtime=False, loop=False):
+        super().__init__(fps, realtime)
+        self.root = root
+        self.loop = loop
+        self.paths = []
+        for folder, _, files in sorted(os.walk(root)):
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    self.paths.append(os.path.join(folder, name))
+        if not self.paths:
+            raise FileNotFoundError(f"No images found under {root}")
+        self.position = 0
+
+    def label_for(self, path):
+        relative = os.path.relpath(path, self.root)
+        folder = relative.split(os.sep)[0]
+        return None if folder == relative else folder.replace("_", " ")
+
+    def _next(self):
+        import cv2
+        while True:
+            if self.position >= len(self.paths):
+                if not self.loop:
+                    return None
+                self.position = 0
+            path = self.paths[self.position]
+            self.position += 1
+            frame = cv2.imread(path)
+            if frame is not None:
+                return frame, self.label_for(path)
+            print(f"Warning: Skipping unreadable image {path}")
+
+
+class SyntheticSource(FrameSource):
+    """Generated frames (a moving bright block on noise) for hardware-free throughput tests."""
+
+    def __init__(self, count=300, width=640, height=480, fps=DEFAULT_REPLAY_FPS,
+                 realtime=False, seed=0):
+        super().__init__(fps, realtime)
+        self.count = count  # None for an endless stream
+        self.width = width
+        self.height = height
+        self.rng = np.random.default_rng(seed)
+        self.background = self.rng.integers(0, 64, (height, width, 3), dtype=np.uint8)
+
+    def _next(self):
+        if self.count is not None and self.index + 1 >= self.count:
+            return None
+        frame = self.background.copy()
+        size = min(self.width, self.height) // 4
+        x = (self.index + 1) * 7 % max(1, self.width - size)
+        y = self.height // 2 - size // 2
+        frame[y:y + size, x:x + size] = 200
+        return frame, None
+
+
+def open_source(spec, realtime=False, loop=False, labels_path=None):
+    """Build a frame source from a spec.
+
+    An int or digit string opens that camera, "synthetic" or "synthetic:N"
+    generates N frames, a directory replays its images and anything else is
+    opened as a video file.
+    """
+    if isinstance(spec, FrameSource):
+        return spec
+    spec = str(spec)
+    if spec.isdigit():
+        return CameraSource(int(spec))
+    if spec == "synthetic" or spec.startswith("synthetic:"):
+        count = int(spec.split(":", 1)[1]) if ":" in spec else SyntheticSource().count
+        return SyntheticSource(count=count, realtime=realtime)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, realtime=realtime, loop=loop)
+    return VideoFileSource(spec, labels_path=labels_path, realtime=realtime, loop=loop)
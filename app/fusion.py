@@ -0,0 +1,122 @@
+import threading
+import clocks
+from collections import namedtuple
+
+DEFAULT_ALIGNMENT_WINDOW = 1.5  # Max seconds between vision and pressure inputs
+EMPTY_SEAT = "No User Detected"  # Pressure label that decides the fused state on its own
+
+# Emitted whenever the fused posture changes
+FusionEvent = namedtuple("FusionEvent", ["state", "vision", "pressure", "timestamp", "staleness"])
+
+
+def fuse_labels(vision_posture, pressure_posture):
+    """Combine a vision label and a pressure label into the final posture."""
+    if vision_posture == "No Pose Detected" or pressure_posture == "No User Detected":
+        return "No Person Detected"
+    elif vision_posture == "Upright" and pressure_posture == "Correct Posture":
+        return "Correct Posture"
+    else:
+        return "Incorrect Posture"
+
+
+class FusionEngine:
+    """Fuses timestamped vision and pressure events into a single posture.
+
+    Inputs are only combined when their timestamps lie within
+    `alignment_window` seconds of each other; otherwise the fused state is
+    "Unknown". The exception is an empty seat: vision is throttled or paused
+    then (occupancy.OccupancyGate), so a "No User Detected" pressure label
+    that is newer than the last vision label resolves to "No Person Detected"
+    on its own. The state is recomputed only when an input label or the
+    resolution changes, and listeners receive a FusionEvent for every change.
+    """
+
+    def __init__(self, alignment_window=DEFAULT_ALIGNMENT_WINDOW, clock=clocks.monotonic):
+        self.alignment_window = alignment_window
+        self.clock = clock
+        self.vision = ("Unknown", None)  # (label, timestamp)
+        self.pressure = ("Unknown", None)
+        self.state = "Unknown"
+        self.state_since = clock()
+        self.aligned = False
+        self.resolution = None  # "aligned", "empty seat" or None (see _resolution)
+        self.recompute_count = 0
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback):
+        """Call `callback(event)` on every fused state change (from the submitting thread)."""
+        self.listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def submit_vision(self, label, timestamp=None):
+        self._submit("vision", label, timestamp)
+
+    def submit_pressure(self, label, timestamp=None):
+        self._submit("pressure", label, timestamp)
+
+    def _submit(self, source, label, timestamp):
+        timestamp = self.clock() if timestamp is None else timestamp
+        with self._lock:
+            previous_label = getattr(self, source)[0]
+            setattr(self, source, (label, timestamp))
+            self.aligned = self._is_aligned()
+            resolution = self._resolution()
+            if label == previous_label and resolution == self.resolution:
+                return  # Nothing that affects the fused state changed
+            self.resolution = resolution
+            event = self._recompute(timestamp)
+
+        if event is not None:
+            for callback in list(self.listeners):
+                callback(event)
+
+    def _is_aligned(self):
+        vision_time, pressure_time = self.vision[1], self.pressure[1]
+        if vision_time is None or pressure_time is None:
+            return False
+        return abs(vision_time - pressure_time) <= self.alignment_window
+
+    def _resolution(self):
+        """How the fused state is decided from the current inputs."""
+        if self.aligned:
+            return "aligned"
+        vision_time, pressure_time = self.vision[1], self.pressure[1]
+        if self.pressure[0] == EMPTY_SEAT and (vision_time is None or pressure_time >= vision_time):
+            return "empty seat"
+        return None
+
+    def _recompute(self, now):
+        self.recompute_count += 1
+        if self.resolution == "aligned":
+            state = fuse_labels(self.vision[0], self.pressure[0])
+        elif self.resolution == "empty seat":
+            state = "No Person Detected"
+        else:
+            state = "Unknown"
+        if state == self.state:
+            return None
+        self.state = state
+        self.state_since = now
+        return FusionEvent(state, self.vision[0], self.pressure[0], now, self.staleness(now))
+
+    def staleness(self, now=None):
+        """Age in seconds of the older of the two inputs."""
+        now = self.clock() if now is None else now
+        timestamps = [t for t in (self.vision[1], self.pressure[1]) if t is not None]
+        if len(timestamps) < 2:
+            return float("inf")
+        return now - min(timestamps)
+
+    def snapshot(self):
+        """Return the current fused state as a FusionEvent."""
+        with self._lock:
+            now = self.clock()
+            return FusionEvent(self.state, self.vision[0], self.pressure[0], now, self.staleness(now))
+
+
+# Shared engine fed by the vision detector and the pressure thread
+engine = FusionEngine()
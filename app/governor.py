@@ -0,0 +1,139 @@
+import os
+import time
+from collections import deque, namedtuple
+from event_bus import bus
+
+# One capture + inference configuration. Profiles are ordered cheapest first.
+Profile = namedtuple("Profile", ["name", "model_complexity", "width", "height", "fps", "fourcc"])
+
+PROFILES = [
+    Profile("minimal", 0, 320, 240, 10, "YUYV"),
+    Profile("low", 0, 640, 480, 15, "YUYV"),
+    Profile("medium", 1, 640, 480, 15, "MJPG"),
+    Profile("high", 1, 640, 480, 30, "MJPG"),
+    Profile("max", 2, 1280, 720, 30, "MJPG"),
+]
+
+DEFAULT_START_LEVEL = 2  # "medium"
+DEFAULT_LATENCY_BUDGET_MS = 66.0  # Per-frame processing budget (~15 fps)
+DEFAULT_CPU_BUDGET = 0.5  # Fraction of the whole machine this process may use
+DEFAULT_EVALUATION_INTERVAL = 5.0  # Seconds between decisions
+HEADROOM = 0.6  # Step up only when both measurements are below this share of budget
+UPSTEP_WINDOWS = 3  # Consecutive windows of headroom required before stepping up
+DEFAULT_UPSTEP_BACKOFF = 30.0  # Seconds after a step down before stepping up again
+MAX_UPSTEP_BACKOFF = 600.0  # Cap for the backoff, which doubles whenever a step up has to be undone
+
+
+def apply_capture_settings(cap, profile):
+    """Ask the camera for the profile's resolution, frame rate and pixel format."""
+    import cv2
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*profile.fourcc))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, profile.width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, profile.height)
+    cap.set(cv2.CAP_PROP_FPS, profile.fps)
+
+
+class PerformanceGovernor:
+    """Picks the capture/model profile that keeps frames within a latency and CPU budget.
+
+    Call record() with every frame's processing time. Every
+    `evaluation_interval` seconds the governor compares the 90th percentile
+    latency and the process CPU share against the budgets and moves one
+    profile down (over budget) or up (well under budget). record() returns the
+    new Profile when a switch happens, otherwise None.
+
+    A step down lowers latency, which would satisfy the step-up rule one
+    window later, so stepping up needs headroom for `UPSTEP_WINDOWS` windows
+    in a row and waits out a backoff after every step down. The backoff
+    doubles each time a step up is undone, so a profile that does not fit is
+    retried less and less often instead of rebuilding the pose graph and
+    camera settings every few seconds.
+    """
+
+    def __init__(self, latency_budget_ms=DEFAULT_LATENCY_BUDGET_MS, cpu_budget=DEFAULT_CPU_BUDGET,
+                 evaluation_interval=DEFAULT_EVALUATION_INTERVAL, profiles=PROFILES,
+                 start_level=DEFAULT_START_LEVEL, upstep_backoff=DEFAULT_UPSTEP_BACKOFF, clock=time.monotonic,
+                 cpu_clock=time.process_time):
+        self.latency_budget_ms = latency_budget_ms
+        self.cpu_budget = cpu_budget
+        self.evaluation_interval = evaluation_interval
+        self.profiles = list(profiles)
+        self.level = min(start_level, len(self.profiles) - 1)
+        self.clock = clock
+        self.cpu_clock = cpu_clock
+        self.cpu_count = os.cpu_count() or 1
+        self.latencies = deque(maxlen=300)
+        self.headroom_windows = 0  # Consecutive windows well under budget
+        self.initial_backoff = upstep_backoff
+        self.upstep_backoff = upstep_backoff
+        self.upstep_blocked_until = self.clock()
+        self.last_step = 0  # +1 or -1 for the latest switch
+        self.switches = []  # (time, from_profile, to_profile, reason)
+        self._reset_window()
+
+    @property
+    def profile(self):
+        return self.profiles[self.level]
+
+    def _reset_window(self):
+        self.latencies.clear()
+        self.window_start = self.clock()
+        self.window_cpu_start = self.cpu_clock()
+
+    def cpu_share(self):
+        """Fraction of the whole machine used by this process in the current window."""
+        wall = self.clock() - self.window_start
+        if wall <= 0:
+            return 0.0
+        return (self.cpu_clock() - self.window_cpu_start) / wall / self.cpu_count
+
+    def latency_p90(self):
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[int(len(ordered) * 0.9) if len(ordered) > 1 else 0]
+
+    def record(self, latency_ms):
+        """Add one frame's processing time; returns the new Profile on a switch."""
+        self.latencies.append(latency_ms)
+        if self.clock() - self.window_start < self.evaluation_interval:
+            return None
+
+        p90 = self.latency_p90()
+        cpu = self.cpu_share()
+        now = self.clock()
+        new_level = self.level
+        if p90 > self.latency_budget_ms or cpu > self.cpu_budget:
+            self.headroom_windows = 0
+            new_level = max(0, self.level - 1)
+        elif p90 < self.latency_budget_ms * HEADROOM and cpu < self.cpu_budget * HEADROOM:
+            self.headroom_windows += 1
+            if self.headroom_windows >= UPSTEP_WINDOWS and now >= self.upstep_blocked_until:
+                new_level = min(len(self.profiles) - 1, self.level + 1)
+        else:
+            self.headroom_windows = 0
+        self._reset_window()
+
+        if new_level == self.level:
+            return None
+        reason = (f"p90 {p90:.1f} ms / budget {self.latency_budget_ms:.0f} ms, "
+                  f"CPU {cpu:.0%} / budget {self.cpu_budget:.0%}")
+        return self._switch(new_level, reason)
+
+    def _switch(self, new_level, reason):
+        old = self.profile
+        step = 1 if new_level > self.level else -1
+        if step < 0:
+            if self.last_step > 0:
+                self.upstep_backoff = min(self.upstep_backoff * 2, MAX_UPSTEP_BACKOFF)  # That step up did not fit
+            else:
+                self.upstep_backoff = self.initial_backoff
+            self.upstep_blocked_until = self.clock() + self.upstep_backoff
+        self.last_step = step
+        self.headroom_windows = 0
+        self.level = new_level
+        self.switches.append((self.clock(), old, self.profile, reason))
+        message = f"Performance governor: {old.name} -> {self.profile.name} ({reason})"
+        print(f"[INFO] {message}")
+        bus.log_event(message)
+        return self.profile
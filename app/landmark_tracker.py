@@ -0,0 +1,89 @@
+import numpy as np
+import clocks
+
+DEFAULT_POSE_EVERY = 3  # Run MediaPipe on every Nth frame at most
+DEFAULT_MAX_ERROR = 0.02  # Normalized innovation (RMS) that forces the next frame to be measured
+DEFAULT_MAX_STD = 0.03  # Predicted position std-dev that forces a measurement
+
+
+class LandmarkTracker:
+    """Constant-velocity Kalman filter over the 39 keypoint coordinates.
+
+    Every coordinate is an independent [position, velocity] filter, all
+    updated together with NumPy. Between full pose runs the classifier can use
+    predict(); needs_measurement() says when a real MediaPipe run is due:
+    every `pose_every` frames, or sooner when the last innovation error or the
+    predicted uncertainty exceeds its gate.
+    """
+
+    def __init__(self, size=39, pose_every=DEFAULT_POSE_EVERY, max_error=DEFAULT_MAX_ERROR,
+                 max_std=DEFAULT_MAX_STD, process_noise=0.5, measurement_noise=1e-4,
+                 clock=clocks.monotonic):
+        self.size = size
+        self.pose_every = pose_every
+        self.max_error = max_error
+        self.max_std = max_std
+        self.process_noise = process_noise  # Acceleration variance (normalized units / s^2)
+        self.measurement_noise = measurement_noise
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Forget the track (e.g. when no pose was detected)."""
+        self.x = np.zeros((self.size, 2))  # [position, velocity] per coordinate
+        self.P = np.tile(np.eye(2), (self.size, 1, 1))
+        self.last_time = None
+        self.initialized = False
+        self.frames_since_measurement = 0
+        self.last_error = 0.0
+        self.measurements = 0
+        self.predictions = 0
+
+    def _propagate(self, now):
+        """Advance the state and covariance to `now`."""
+        dt = 0.0 if self.last_time is None else max(0.0, now - self.last_time)
+        self.last_time = now
+        if dt == 0:
+            return
+        F = np.array([[1.0, dt], [0.0, 1.0]])
+        q = self.process_noise
+        Q = q * np.array([[dt ** 4 / 4, dt ** 3 / 2], [dt ** 3 / 2, dt ** 2]])
+        self.x = self.x @ F.T
+        self.P = F @ self.P @ F.T + Q
+
+    def needs_measurement(self):
+        """True when the next frame should go through MediaPipe."""
+        if not self.initialized or self.frames_since_measurement + 1 >= self.pose_every:
+            return True
+        if self.last_error > self.max_error:
+            return True
+        return float(np.sqrt(self.P[:, 0, 0].max())) > self.max_std
+
+    def update(self, keypoints, timestamp=None):
+        """Correct the track with measured keypoints; returns the filtered keypoints."""
+        now = self.clock() if timestamp is None else timestamp
+        z = np.asarray(keypoints, dtype=np.float64)
+        if not self.initialized:
+            self.x[:, 0] = z
+            self.x[:, 1] = 0.0
+            self.P = np.tile(np.diag([self.measurement_noise, 1.0]), (self.size, 1, 1))
+            self.last_time = now
+            self.initialized = True
+        else:
+            self._propagate(now)
+            innovation = z - self.x[:, 0]
+            self.last_error = float(np.sqrt(np.mean(innovation ** 2)))
+            S = self.P[:, 0, 0] + self.measurement_noise
+            K = self.P[:, :, 0] / S[:, None]  # Kalman gain, shape (size, 2)
+            self.x += K * innovation[:, None]
+            self.P -= K[:, :, None] * self.P[:, None, 0, :]
+        self.frames_since_measurement = 0
+        self.measurements += 1
+        return self.x[:, 0].copy()
+
+    def predict(self, timestamp=None):
+        """Predicted keypoints at `timestamp` without a measurement."""
+        self._propagate(self.clock() if timestamp is None else timestamp)
+        self.frames_since_measurement += 1
+        self.predictions += 1
+        return self.x[:, 0].copy()
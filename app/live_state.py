@@ -0,0 +1,60 @@
+import numpy as np
+from ring_buffer import TimedRingBuffer, LabelRingBuffer
+
+# Live sensor and posture streams shared by the detector, the pressure thread,
+# the UI and analytics. Each stream keeps roughly the last HISTORY_SECONDS.
+HISTORY_SECONDS = 60
+NUM_PRESSURE_SENSORS = 13
+NUM_LANDMARK_FEATURES = 39  # 13 landmarks x (x, y, z)
+
+VISION_LABELS = [
+    "Unknown", "Upright", "Leaning Forward", "Leaning Backward",
+    "Leaning Left", "Leaning Right", "No Pose Detected", "Unknown Posture"
+]
+PRESSURE_LABELS = ["Unknown", "Correct Posture", "Incorrect Posture", "No User Detected"]
+
+# Capacities assume ~30 fps vision and at most ~10 Hz pressure sampling
+VISION_CAPACITY = 30 * HISTORY_SECONDS
+PRESSURE_CAPACITY = 10 * HISTORY_SECONDS
+
+SHARED_PREFIX = "postsync"
+
+
+def _stream_specs():
+    return {
+        "pressure_samples": lambda shared, name: TimedRingBuffer(
+            PRESSURE_CAPACITY, NUM_PRESSURE_SENSORS, np.float64, shared, name),
+        "pressure_labels": lambda shared, name: LabelRingBuffer(
+            PRESSURE_CAPACITY, PRESSURE_LABELS, shared, name),
+        "landmarks": lambda shared, name: TimedRingBuffer(
+            VISION_CAPACITY, NUM_LANDMARK_FEATURES, np.float32, shared, name),
+        "vision_labels": lambda shared, name: LabelRingBuffer(
+            VISION_CAPACITY, VISION_LABELS, shared, name),
+    }
+
+
+pressure_samples = TimedRingBuffer(PRESSURE_CAPACITY, NUM_PRESSURE_SENSORS)
+pressure_labels = LabelRingBuffer(PRESSURE_CAPACITY, PRESSURE_LABELS)
+landmarks = TimedRingBuffer(VISION_CAPACITY, NUM_LANDMARK_FEATURES, dtype=np.float32)
+vision_labels = LabelRingBuffer(VISION_CAPACITY, VISION_LABELS)
+
+
+def create_shared(prefix=SHARED_PREFIX):
+    """Move every stream into shared memory so other processes can attach to it."""
+    for stream, factory in _stream_specs().items():
+        globals()[stream] = factory(True, f"{prefix}_{stream}")
+
+
+def attach_shared(prefix=SHARED_PREFIX):
+    """Attach to streams that another PostSync process created with create_shared()."""
+    global pressure_samples, pressure_labels, landmarks, vision_labels
+    pressure_samples = TimedRingBuffer.attach(f"{prefix}_pressure_samples")
+    pressure_labels = LabelRingBuffer.attach(f"{prefix}_pressure_labels", PRESSURE_LABELS)
+    landmarks = TimedRingBuffer.attach(f"{prefix}_landmarks", dtype=np.float32)
+    vision_labels = LabelRingBuffer.attach(f"{prefix}_vision_labels", VISION_LABELS)
+
+
+def close_all():
+    """Release shared memory held by the streams (no-op for in-process buffers)."""
+    for stream in (pressure_samples, pressure_labels, landmarks, vision_labels):
+        stream.close()
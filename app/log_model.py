@@ -0,0 +1,200 @@
+import os
+from collections import deque, namedtuple
+from datetime import datetime
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel, QTimer
+
+LogEntry = namedtuple("LogEntry", ["time", "source", "level", "message"])
+
+LOG_SOURCES = ["Vision", "Pressure", "Fusion", "Notification", "Settings", "General"]
+LOG_LEVELS = ["INFO", "WARNING", "ERROR"]
+
+log_folder = "data/logs"
+HIDDEN_FLUSH_INTERVAL_MS = 2000  # Disk-only flushes while the logs page is not shown
+
+
+class LogListModel(QAbstractListModel):
+    """Fixed-capacity list model for the logs page.
+
+    New entries are queued and inserted in batches by a timer. Only the newest
+    `capacity` entries are kept in memory; every entry is also appended to a
+    session log file so older pages can be loaded back on demand. While the
+    view is inactive (see set_view_active) entries still go to disk but rows
+    are only collected, then inserted in a single reset when it is shown.
+    """
+    SourceRole = Qt.UserRole + 1
+    LevelRole = Qt.UserRole + 2
+
+    def __init__(self, capacity=2000, flush_interval_ms=250, log_path=None, parent=None):
+        super().__init__(parent)
+        self.capacity = capacity
+        self.rows = deque(maxlen=capacity)
+        self.pending = deque()
+        self.history_page = None  # None while showing the live tail
+        self.flush_interval_ms = flush_interval_ms
+        self.view_active = True
+        self.hidden_rows = deque(maxlen=capacity)  # Entries flushed while the view was inactive
+
+        if log_path is None:
+            os.makedirs(log_folder, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+            log_path = os.path.join(log_folder, f"PostSync_{timestamp}_session.log")
+        self.log_path = log_path
+        self.log_file = open(log_path, "a+", encoding="utf-8")
+        self.lines_written = 0
+        self.page_offsets = [self.log_file.tell()]  # File offset of every `capacity`-line page
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.flush)
+        self.timer.start(flush_interval_ms)
+
+    # --- Qt model interface ---
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        entry = self.rows[index.row()]
+        if role == Qt.DisplayRole:
+            return f"[{entry.time}] {entry.message}"
+        if role == self.SourceRole:
+            return entry.source
+        if role == self.LevelRole:
+            return entry.level
+        return None
+
+    # --- Appending ---
+    def append(self, message, source="General", level="INFO"):
+        """Queue an entry; it is shown and written to disk on the next flush."""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.pending.append(LogEntry(timestamp, source, level, message))
+
+    def flush(self):
+        """Write queued entries to disk and insert them into the view in one batch."""
+        if not self.pending:
+            return
+        batch = list(self.pending)
+        self.pending.clear()
+        self._write_to_disk(batch)
+
+        if not self.view_active:
+            self.hidden_rows.extend(batch)
+            return
+        if self.history_page is not None:
+            return  # The view shows an older page; the live tail is rebuilt on return
+
+        batch = batch[-self.capacity:]
+        overflow = len(self.rows) + len(batch) - self.capacity
+        if overflow > 0:
+            self.beginRemoveRows(QModelIndex(), 0, overflow - 1)
+            for _ in range(overflow):
+                self.rows.popleft()
+            self.endRemoveRows()
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(batch) - 1)
+        self.rows.extend(batch)
+        self.endInsertRows()
+
+    def set_view_active(self, active):
+        """Stop or resume row insertion for a hidden/shown logs page."""
+        if active == self.view_active:
+            return
+        self.timer.setInterval(self.flush_interval_ms if active else HIDDEN_FLUSH_INTERVAL_MS)
+        if not active:
+            self.view_active = False
+            return
+        self.flush()  # Queued entries join the backlog first
+        self.view_active = True
+        if self.hidden_rows and self.history_page is None:
+            self._replace_rows(list(self.rows) + list(self.hidden_rows))
+        self.hidden_rows.clear()
+
+    def _write_to_disk(self, batch):
+        self.log_file.seek(0, os.SEEK_END)
+        for entry in batch:
+            message = entry.message.replace("\n", " ")
+            self.log_file.write(f"{entry.time}\t{entry.source}\t{entry.level}\t{message}\n")
+            self.lines_written += 1
+            if self.lines_written % self.capacity == 0:
+                self.page_offsets.append(self.log_file.tell())
+        self.log_file.flush()
+
+    # --- Paging through the session file ---
+    def _read_page(self, page):
+        self.log_file.seek(self.page_offsets[page])
+        entries = []
+        for _ in range(self.capacity):
+            line = self.log_file.readline()
+            if not line:
+                break
+            parts = line.rstrip("\n").split("\t", 3)
+            if len(parts) == 4:
+                entries.append(LogEntry(*parts))
+        self.log_file.seek(0, os.SEEK_END)
+        return entries
+
+    def _replace_rows(self, entries):
+        self.beginResetModel()
+        self.rows = deque(entries, maxlen=self.capacity)
+        self.endResetModel()
+
+    def oldest_live_page(self):
+        """Page containing the entry just before the oldest one kept in memory."""
+        oldest_line = self.lines_written - len(self.rows)
+        return (oldest_line - 1) // self.capacity if oldest_line > 0 else None
+
+    def show_older(self):
+        """Replace the view with the previous page from disk. Returns False at the start."""
+        if self.history_page is None:
+            page = self.oldest_live_page()
+        else:
+            page = self.history_page - 1 if self.history_page > 0 else None
+        if page is None:
+            return False
+        self.history_page = page
+        self._replace_rows(self._read_page(page))
+        return True
+
+    def show_live(self):
+        """Return to the live tail of the log."""
+        if self.history_page is None:
+            return
+        self.flush()  # Entries queued while paging go to disk first
+        self.history_page = None
+        start_line = max(0, self.lines_written - self.capacity)
+        page = start_line // self.capacity
+        entries = self._read_page(page)
+        if page + 1 < len(self.page_offsets):
+            entries += self._read_page(page + 1)
+        self._replace_rows(entries[-(self.lines_written - start_line):] if self.lines_written else [])
+
+    def close(self):
+        self.timer.stop()
+        self.flush()
+        self.log_file.close()
+
+
+class LogFilterProxyModel(QSortFilterProxyModel):
+    """Filters log rows by source and level ("All" disables a filter)."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.source_filter = "All"
+        self.level_filter = "All"
+
+    def set_source_filter(self, source):
+        self.source_filter = source
+        self.invalidateFilter()
+
+    def set_level_filter(self, level):
+        self.level_filter = level
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        index = self.sourceModel().index(source_row, 0, source_parent)
+        if self.source_filter != "All" and index.data(LogListModel.SourceRole) != self.source_filter:
+            return False
+        if self.level_filter != "All" and index.data(LogListModel.LevelRole) != self.level_filter:
+            return False
+        return True
@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_WINDOW = 512  # Most recent samples kept per stage
+DEFAULT_METRICS_PORT = 9464
+metrics_folder = "data/metrics"
+
+
+class StageHistogram:
+    """Rolling window of one stage's durations (ms) plus lifetime totals.
+
+    Recording is a deque append and two additions under a lock; percentiles
+    are only computed when a snapshot is taken, on a copy of the window, so
+    other threads can keep recording meanwhile.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, duration_ms):
+        with self._lock:
+            self.samples.append(duration_ms)
+            self.count += 1
+            self.total_ms += duration_ms
+
+    def summary(self):
+        with self._lock:
+            samples = list(self.samples)
+            count = self.count
+        samples.sort()
+        if not samples:
+            return {"count": count, "mean": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+        def percentile(fraction):
+            return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+        return {"count": count, "mean": sum(samples) / len(samples),
+                "p50": percentile(0.50), "p95": percentile(0.95), "p99": percentile(0.99),
+                "max": samples[-1]}
+
+
+class Metrics:
+    """Per-stage latency histograms for the hot paths.
+
+    Wrap a stage in `with metrics.span("pose.process"):` or call record()
+    with a duration measured elsewhere. Spans use time.perf_counter (a
+    monotonic clock). Stages are created on first use; set `enabled` to
+    False to turn recording into a no-op.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, clock=time.perf_counter):
+        self.window = window
+        self.clock = clock
+        self.enabled = True
+        self.stages = {}
+        self.started = time.time()
+        self._lock = threading.Lock()  # Taken when a new stage is created or the stages are listed
+        self.server = None
+
+    def histogram(self, stage):
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, StageHistogram(self.window))
+        return histogram
+
+    def record(self, stage, duration_ms):
+        if self.enabled:
+            self.histogram(stage).record(duration_ms)
+
+    @contextmanager
+    def span(self, stage):
+        if not self.enabled:
+            yield
+            return
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self.histogram(stage).record((self.clock() - start) * 1000)
+
+    def snapshot(self):
+        """Return {stage: summary dict} for every stage seen so far."""
+        with self._lock:
+            stages = dict(self.stages)
+        return {stage: histogram.summary() for stage, histogram in sorted(stages.items())}
+
+    def render_table(self):
+        """Human-readable table for the diagnostics panel."""
+        lines = [f"{'stage':<26}{'count':>8}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for stage, s in self.snapshot().items():
+            lines.append(f"{stage:<26}{s['count']:>8}{s['mean']:>9.2f}{s['p50']:>9.2f}"
+                         f"{s['p95']:>9.2f}{s['p99']:>9.2f}{s['max']:>9.2f}")
+        if len(lines) == 1:
+            lines.append("(no samples yet)")
+        return "\n".join(lines)
+
+    def render_text(self):
+        """Prometheus-style text exposition (durations in milliseconds)."""
+        lines = ["# TYPE postsync_stage_latency_ms summary"]
+        for stage, s in self.snapshot().items():
+            for quantile in ("p50", "p95", "p99"):
+                lines.append(f'postsync_stage_latency_ms{{stage="{stage}",quantile="0.{quantile[1:]}"}} '
+                             f"{s[quantile]:.3f}")
+            lines.append(f'postsync_stage_latency_ms_max{{stage="{stage}"}} {s["max"]:.3f}')
+            lines.append(f'postsync_stage_latency_ms_count{{stage="{stage}"}} {s["count"]}')
+        lines.append(f"postsync_uptime_seconds {time.time() - self.started:.1f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=None):
+        """Write the text exposition to `path` (default: a timestamped file in data/metrics)."""
+        if path is None:
+            os.makedirs(metrics_folder, exist_ok=True)
+            path = os.path.join(metrics_folder, time.strftime("metrics_%Y-%m-%d_%H-%M-%S.txt"))
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.render_text())
+        return path
+
+    def serve(self, port=DEFAULT_METRICS_PORT, host="127.0.0.1"):
+        """Serve the text exposition at http://host:port/metrics from a daemon thread."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.render_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the console
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"[INFO] Metrics available at http://{host}:{port}/metrics")
+        return self.server
+
+    def stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+
+# Shared registry for the whole process
+metrics = Metrics()
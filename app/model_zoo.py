@@ -0,0 +1,194 @@
+"""Train and benchmark alternative posture classifiers on the SVM's features.
+
+Every model (linear, kNN on a k-d tree, gradient-boosted trees, a small MLP
+and an SVM for reference) is tuned on the same cached landmarks as
+train_classifier.py and evaluated on the same held-out split. Its p99
+single-sample latency is measured on the runtime path (DataFrame, scaler,
+predict and predict_proba). The shipped svm.pkl / scaler.pkl are benchmarked
+on the same split and compete as the "shipped" entry. Versioned artifacts
+(<name>_<version>.pkl, <name>_scaler_<version>.pkl; earlier versions are
+never overwritten) and a registry go to models/zoo/;
+pose_pipeline.load_classifier() then loads the most accurate entry that fits
+the latency budget (POSTSYNC_LATENCY_BUDGET_MS, default 2 ms), or the shipped
+svm.pkl if none fits:
+
+    python model_zoo.py [--screenshots screenshots] [--models linear knn gbt mlp svm] [--budget-ms 2]
+
+Latencies are measured on the machine that runs this command, so run it on
+(or on hardware like) the machine the app runs on.
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from pose_pipeline import ZOO_REGISTRY, feature_names, labels, latency_budget_ms, models_dir, select_model
+from train_classifier import (
+    DEFAULT_CACHE_DIR, LandmarkCache, build_dataset, collect_images, collect_video, extract_all
+)
+
+LATENCY_REPEATS = 2000  # Single-sample calls timed per model
+LATENCY_WARMUP = 50  # Calls discarded before timing
+SHIPPED = "shipped"  # Registry entry for the unversioned svm.pkl / scaler.pkl the app ships with
+
+
+def zoo_models(seed=0):
+    """{name: (estimator, parameter grid)} of the candidate classifiers."""
+    from sklearn.ensemble import HistGradientBoostingClassifier
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.neighbors import KNeighborsClassifier
+    from sklearn.neural_network import MLPClassifier
+    from sklearn.svm import SVC
+
+    return {
+        "linear": (LogisticRegression(max_iter=2000), {"C": [0.1, 1, 10, 100]}),
+        "knn": (KNeighborsClassifier(algorithm="kd_tree"),
+                {"n_neighbors": [3, 5, 9, 15], "weights": ["uniform", "distance"]}),
+        "gbt": (HistGradientBoostingClassifier(random_state=seed),
+                {"max_depth": [3, 6, None], "learning_rate": [0.05, 0.1], "max_iter": [100, 200]}),
+        "mlp": (MLPClassifier(max_iter=1000, early_stopping=True, random_state=seed),
+                {"hidden_layer_sizes": [(32,), (64,), (64, 32)], "alpha": [1e-4, 1e-3]}),
+        "svm": (SVC(probability=True, random_state=seed),
+                {"C": [1, 10, 100], "gamma": ["scale", 0.1]}),
+    }
+
+
+def single_sample_latency(model, scaler, samples, repeats=LATENCY_REPEATS):
+    """(p50, p99) milliseconds of one classify_keypoints()-style call."""
+    import pandas as pd
+    timings = []
+    for i in range(LATENCY_WARMUP + repeats):
+        keypoints = samples[i % len(samples)]
+        start = time.perf_counter()
+        keypoints_df = pd.DataFrame(keypoints.reshape(1, -1), columns=feature_names)
+        keypoints_scaled = scaler.transform(keypoints_df)
+        model.predict(keypoints_scaled)
+        model.predict_proba(keypoints_scaled)
+        if i >= LATENCY_WARMUP:
+            timings.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def train_model(name, estimator, grid, X_train, y_train, folds, jobs, seed):
+    """Grid-search one candidate (with its own scaler) and return the best pipeline."""
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    pipeline = Pipeline([("scaler", StandardScaler()), ("model", estimator)])
+    search = GridSearchCV(pipeline, {f"model__{key}": values for key, values in grid.items()},
+                          cv=StratifiedKFold(folds, shuffle=True, random_state=seed), n_jobs=jobs)
+    start = time.perf_counter()
+    search.fit(X_train, y_train)
+    print(f"  {name}: cv accuracy {search.best_score_:.3f} ({time.perf_counter() - start:.1f} s)")
+    params = {key.split("__", 1)[1]: value for key, value in search.best_params_.items()}
+    return search.best_estimator_, float(search.best_score_), params
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screenshots", default=os.path.join(os.getcwd(), "screenshots"),
+                        help="folder with one sub-folder per posture (default ./screenshots)")
+    parser.add_argument("--videos", nargs="*", default=[], help="labelled video files")
+    parser.add_argument("--video-stride", type=int, default=5, help="use every Nth video frame")
+    parser.add_argument("--complexity", type=int, default=1, choices=(0, 1, 2),
+                        help="MediaPipe model complexity")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="landmark extraction processes")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel grid search jobs (-1: all cores)")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="landmark cache folder")
+    parser.add_argument("--models", nargs="+", help="subset of linear, knn, gbt, mlp, svm")
+    parser.add_argument("--budget-ms", type=float, default=latency_budget_ms(),
+                        help="p99 latency budget to report the selection for")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    import joblib
+    import pandas as pd
+    from sklearn.model_selection import train_test_split
+
+    candidates = zoo_models(args.seed)
+    unknown = set(args.models or []) - set(candidates)
+    if unknown:
+        parser.error(f"unknown models: {', '.join(sorted(unknown))}")
+    if args.models:
+        candidates = {name: candidates[name] for name in args.models}
+
+    # Same landmark extraction and cache as train_classifier.py
+    images = collect_images(args.screenshots)
+    videos = {path: collect_video(path, args.video_stride) for path in args.videos}
+    cache = LandmarkCache(args.cache, args.complexity)
+    extract_all(images, videos, cache, args.complexity, args.workers)
+    samples = [(key, class_id) for key, _, class_id in images]
+    samples += [(key, class_id) for video in videos.values() for key, _, class_id in video]
+    features, targets = build_dataset(samples, cache)
+    counts = {labels[class_id]: int((targets == class_id).sum()) for class_id in sorted(set(targets))}
+    print(f"{len(targets)} samples with a detected pose: {counts}")
+    if len(counts) < 2 or min(counts.values()) < 2 * args.folds:
+        raise SystemExit(f"Need at least {2 * args.folds} samples in two or more posture classes to train")
+
+    frame = pd.DataFrame(features, columns=feature_names)
+    X_train, X_test, y_train, y_test = train_test_split(
+        frame, targets, test_size=0.2, stratify=targets, random_state=args.seed)
+
+    # Models are trained one after another; each grid search runs its folds in parallel
+    print(f"Training {len(candidates)} models")
+    trained = {name: train_model(name, estimator, grid, X_train, y_train, args.folds, args.jobs, args.seed)
+               for name, (estimator, grid) in candidates.items()}
+
+    zoo_dir = os.path.join(models_dir(), os.path.dirname(ZOO_REGISTRY))
+    os.makedirs(zoo_dir, exist_ok=True)
+    version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    test_samples = X_test.to_numpy()
+
+    def benchmark(name, model, scaler, model_file, scaler_file, **extra):
+        keypoints_scaled = scaler.transform(X_test)
+        accuracy = float((model.predict(keypoints_scaled) == y_test).mean())
+        p50, p99 = single_sample_latency(model, scaler, test_samples)
+        return dict({"name": name, "model": model_file, "scaler": scaler_file, "accuracy": accuracy,
+                     "p50_ms": p50, "p99_ms": p99,
+                     "size_kb": os.path.getsize(os.path.join(zoo_dir, model_file)) / 1024}, **extra)
+
+    entries = []
+    for name, (pipeline, cv_accuracy, params) in trained.items():
+        scaler, model = pipeline.named_steps["scaler"], pipeline.named_steps["model"]
+        model_file, scaler_file = f"{name}_{version}.pkl", f"{name}_scaler_{version}.pkl"
+        joblib.dump(model, os.path.join(zoo_dir, model_file))
+        joblib.dump(scaler, os.path.join(zoo_dir, scaler_file))
+        entries.append(benchmark(name, model, scaler, model_file, scaler_file,
+                                 params=params, cv_accuracy=cv_accuracy))
+
+    # The shipped classifier competes under the same rule (paths relative to the zoo folder). Its
+    # accuracy is optimistic if it was trained on some of these test samples.
+    shipped_files = [os.path.join("..", "svm.pkl"), os.path.join("..", "scaler.pkl")]
+    if all(os.path.exists(os.path.join(zoo_dir, path)) for path in shipped_files):
+        model, scaler = (joblib.load(os.path.join(zoo_dir, path)) for path in shipped_files)
+        entries.append(benchmark(SHIPPED, model, scaler, *shipped_files))
+
+    registry = {"created": datetime.now().isoformat(timespec="seconds"), "version": version,
+                "model_complexity": args.complexity,
+                "train_samples": int(len(y_train)), "test_samples": int(len(y_test)),
+                "feature_names": feature_names, "models": entries}
+    with open(os.path.join(models_dir(), ZOO_REGISTRY), "w") as f:
+        json.dump(registry, f, indent=2, default=str)
+
+    selected = select_model(entries, args.budget_ms)
+    print(f"\n{'model':8} {'accuracy':>9} {'p50 ms':>8} {'p99 ms':>8} {'size KB':>9}")
+    for entry in sorted(entries, key=lambda entry: -entry["accuracy"]):
+        marker = "  <- selected" if entry is selected else ""
+        print(f"{entry['name']:8} {entry['accuracy']:9.3f} {entry['p50_ms']:8.3f} {entry['p99_ms']:8.3f} "
+              f"{entry['size_kb']:9.1f}{marker}")
+    if selected is None:
+        chosen = "the shipped svm.pkl (no entry fits)"
+    else:
+        chosen = "the shipped svm.pkl" if selected["name"] == SHIPPED else f"zoo/{selected['name']}"
+    print(f"Registry written to {os.path.join(models_dir(), ZOO_REGISTRY)}; "
+          f"the app loads {chosen} under a {args.budget_ms:g} ms p99 budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+import clocks
+
+GOOD_POSTURE = "Correct Posture"
+BAD_POSTURES = ["Incorrect Posture"]
+NO_USER = "No Person Detected"
+GOOD_HOLD = 5  # Seconds good posture must be held before praising it
+BAD_HOLD = 1  # Seconds bad posture must be held before warning
+REPEAT_INTERVAL = 30  # Seconds between repeated good/bad notifications
+
+
+class NotificationPolicy:
+    """Decides when the fused posture is worth a notification.
+
+    check() is called with the current fused posture and returns
+    (category, message) when a notification should go out, otherwise None.
+    Times come from `clock`, so the cooldowns can run on a virtual clock.
+    """
+
+    def __init__(self, clock=clocks.time):
+        self.clock = clock
+        self.last_detected_posture = None
+        self.posture_start_time = clock()
+        self.last_notification = None
+        self.last_notification_time = 0
+
+    def check(self, final_posture):
+        current_time = self.clock()
+
+        # If posture changed, reset timer
+        if final_posture != self.last_detected_posture:
+            self.last_detected_posture = final_posture
+            self.posture_start_time = current_time
+
+        # Calculate how long posture has been held
+        posture_duration = current_time - self.posture_start_time
+        time_since_last_notif = current_time - self.last_notification_time
+
+        if final_posture == GOOD_POSTURE and posture_duration >= GOOD_HOLD and (
+                self.last_notification != "good" or time_since_last_notif >= REPEAT_INTERVAL):
+            decision = ("good", "Good Posture! Keep It Up.")
+        elif final_posture in BAD_POSTURES and posture_duration >= BAD_HOLD and \
+                time_since_last_notif >= REPEAT_INTERVAL:
+            decision = ("bad", "Bad Posture! Fix your sitting position.")
+        elif final_posture == NO_USER and posture_duration >= BAD_HOLD and self.last_notification != "no user":
+            decision = ("no user", "No Person Detected on Chair.")
+        else:
+            return None
+
+        self.last_notification, _ = decision
+        self.last_notification_time = current_time
+        return decision
@@ -0,0 +1,79 @@
+import threading
+import clocks
+
+EMPTY_LABEL = "No User Detected"
+DEFAULT_EMPTY_GRACE = 5.0  # Seconds the seat must read empty before vision is throttled
+DEFAULT_PROBE_INTERVAL = 2.0  # Seconds between pose probes while the seat is empty
+DEFAULT_RELEASE_AFTER = 60.0  # Seconds empty before the camera is released entirely
+DEFAULT_STALE_AFTER = 5.0  # Seconds without a pressure label (longer than a timed-out poll) before failing open
+
+
+class OccupancyGate:
+    """Tracks seat occupancy from the pressure stream so vision can idle on an empty chair.
+
+    The pressure thread calls update() with every pressure label. The seat
+    counts as empty once it has read "No User Detected" for `empty_grace`
+    seconds; any other label (including "Unknown" when the chair is not
+    connected) counts as occupied, so vision never stops because of a missing
+    sensor. The gate also fails open when no label has arrived for
+    `stale_after` seconds (e.g. the NodeMCU stopped answering).
+    wait_until_occupied() wakes immediately when weight returns.
+    """
+
+    def __init__(self, empty_grace=DEFAULT_EMPTY_GRACE, probe_interval=DEFAULT_PROBE_INTERVAL,
+                 release_after=DEFAULT_RELEASE_AFTER, stale_after=DEFAULT_STALE_AFTER,
+                 clock=clocks.monotonic):
+        self.empty_grace = empty_grace
+        self.probe_interval = probe_interval
+        self.release_after = release_after
+        self.stale_after = stale_after
+        self.clock = clock
+        self.empty_since = None
+        self.occupied_event = threading.Event()
+        self.occupied_event.set()
+        self.last_change = clock()
+        self.last_update = self.last_change
+
+    @property
+    def occupied(self):
+        if not self.occupied_event.is_set():
+            now = self.clock()
+            if now - self.last_update > self.stale_after:
+                self._set_occupied(now, "[INFO] Pressure data is stale, resuming pose detection.")
+        return self.occupied_event.is_set()
+
+    def _set_occupied(self, now, message):
+        self.empty_since = None
+        if not self.occupied_event.is_set():
+            self.occupied_event.set()
+            self.last_change = now
+            print(message)
+
+    def update(self, pressure_label, timestamp=None):
+        """Feed the latest pressure label."""
+        now = self.clock() if timestamp is None else timestamp
+        self.last_update = now
+        if pressure_label == EMPTY_LABEL:
+            if self.empty_since is None:
+                self.empty_since = now
+            if self.occupied_event.is_set() and now - self.empty_since >= self.empty_grace:
+                self.occupied_event.clear()
+                self.last_change = now
+                print("[INFO] Seat empty, throttling pose detection.")
+        else:
+            self._set_occupied(now, "[INFO] Seat occupied, resuming pose detection.")
+
+    def empty_for(self):
+        """Seconds since the seat was declared empty (0 while occupied)."""
+        return 0.0 if self.occupied else self.clock() - self.last_change
+
+    def should_release_camera(self):
+        return not self.occupied and self.empty_for() >= self.release_after
+
+    def wait_until_occupied(self, timeout=None):
+        """Block until the seat is occupied or `timeout` passes; returns the occupancy."""
+        return self.occupied_event.wait(timeout) or self.occupied
+
+
+# Shared gate fed by data_collection and read by the vision pipeline
+gate = OccupancyGate()
@@ -0,0 +1,200 @@
+import json
+import os
+import threading
+import numpy as np
+from metrics import metrics
+
+# Machine Learning Model, Scaler and MediaPipe Pose are loaded on first use (see load_models)
+model = None
+scaler = None
+model_name = None  # Which classifier was loaded ("svm" or "zoo/<name>")
+mp_pose = None
+spare_pose = None  # (model_complexity, graph) built by the warm-up for the first create_pose() call
+_load_lock = threading.Lock()
+
+# Mapping of posture labels
+labels = {
+    0: "Upright",
+    1: "Leaning Forward",
+    2: "Leaning Backward",
+    3: "Leaning Left",
+    4: "Leaning Right"
+}
+
+# Required landmarks
+required_landmarks = [
+    "nose", "left_eye_inner", "left_eye", "left_eye_outer",
+    "right_eye_inner", "right_eye", "right_eye_outer",
+    "left_ear", "right_ear", "mouth_left", "mouth_right",
+    "left_shoulder", "right_shoulder"
+]
+
+# Column names for keypoints
+feature_names = [
+    f"{landmark}_{axis}" for landmark in required_landmarks for axis in ['x', 'y', 'z']]
+
+# MediaPipe PoseLandmark indices of required_landmarks (same order as the enum)
+LANDMARK_INDICES = {
+    "nose": 0, "left_eye_inner": 1, "left_eye": 2, "left_eye_outer": 3,
+    "right_eye_inner": 4, "right_eye": 5, "right_eye_outer": 6,
+    "left_ear": 7, "right_ear": 8, "mouth_left": 9, "mouth_right": 10,
+    "left_shoulder": 11, "right_shoulder": 12
+}
+required_indices = [LANDMARK_INDICES[name] for name in required_landmarks]
+
+# p99 single-sample classification latency the runtime may spend, used to pick a model zoo entry
+DEFAULT_LATENCY_BUDGET_MS = 2.0
+ZOO_REGISTRY = os.path.join("zoo", "registry.json")  # Relative to models_dir(), written by model_zoo.py
+
+
+def models_dir():
+    """app/models if present, otherwise the repository's top-level models folder."""
+    local = os.path.join(os.path.dirname(__file__), "models")
+    if os.path.isdir(local):
+        return local
+    return os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models")
+
+
+def latency_budget_ms():
+    """Configured classifier latency budget (POSTSYNC_LATENCY_BUDGET_MS overrides the default)."""
+    return float(os.environ.get("POSTSYNC_LATENCY_BUDGET_MS", DEFAULT_LATENCY_BUDGET_MS))
+
+
+def select_model(entries, budget_ms):
+    """Most accurate model zoo entry whose p99 latency fits the budget, or None if none fits.
+
+    An entry that misses the budget is never swapped in just for being the
+    fastest; the caller keeps the shipped svm.pkl instead.
+    """
+    fitting = [entry for entry in entries if entry["p99_ms"] <= budget_ms]
+    if not fitting:
+        return None
+    return max(fitting, key=lambda entry: (entry["accuracy"], -entry["p99_ms"]))
+
+
+def classifier_paths(budget_ms=None):
+    """(name, model path, scaler path, reason) of the classifier the runtime should load.
+
+    The model zoo registry lists the shipped svm.pkl / scaler.pkl as its
+    "shipped" entry, so they compete with the zoo models under the same rule.
+    Without a registry, or without an entry that fits the budget, this is the
+    shipped svm.pkl / scaler.pkl.
+    """
+    budget_ms = latency_budget_ms() if budget_ms is None else budget_ms
+    shipped = (os.path.join(models_dir(), "svm.pkl"), os.path.join(models_dir(), "scaler.pkl"))
+    registry_path = os.path.join(models_dir(), ZOO_REGISTRY)
+    if not os.path.exists(registry_path):
+        return ("svm",) + shipped + ("no model zoo registry",)
+    with open(registry_path) as f:
+        entries = json.load(f)["models"]
+    entry = select_model(entries, budget_ms)
+    if entry is None:
+        return ("svm",) + shipped + (f"no registry entry fits the {budget_ms:g} ms p99 budget",)
+    reason = (f"most accurate registry entry ({entry['accuracy']:.3f}) within the {budget_ms:g} ms p99 budget, "
+              f"p99 {entry['p99_ms']:.3f} ms")
+    if entry["name"] == "shipped":
+        return ("svm",) + shipped + (reason,)
+    folder = os.path.dirname(registry_path)
+    return (f"zoo/{entry['name']}", os.path.join(folder, entry["model"]), os.path.join(folder, entry["scaler"]),
+            reason)
+
+
+def load_classifier():
+    """Load the classifier and scaler once (no MediaPipe needed)."""
+    global model, scaler, model_name
+    with _load_lock:
+        if model is not None:
+            return
+        import joblib
+        name, model_path, scaler_path, reason = classifier_paths()
+        scaler = joblib.load(scaler_path)
+        model = joblib.load(model_path)
+        model_name = name
+        print(f"[INFO] Using the {name} classifier from {model_path}: {reason}")
+
+
+def load_models(model_complexity=None):
+    """Import MediaPipe/scikit-learn and load the SVM and scaler once.
+
+    With a `model_complexity`, also build a spare pose graph of that
+    complexity, which the next matching create_pose() call takes over (a
+    create_pose() during the warm-up waits for it instead of building twice).
+    """
+    global mp_pose, spare_pose
+    load_classifier()
+    with _load_lock:
+        if mp_pose is None:
+            import mediapipe as mp
+            mp_pose = mp.solutions.pose
+        if model_complexity is not None and spare_pose is None:
+            spare_pose = (model_complexity, _build_pose(model_complexity))
+
+
+def _build_pose(model_complexity):
+    return mp_pose.Pose(model_complexity=model_complexity,
+                        min_detection_confidence=0.5, min_tracking_confidence=0.5)
+
+
+def create_pose(model_complexity=1):
+    """MediaPipe Pose graph with the given model complexity (0, 1 or 2), the warm-up's if it matches."""
+    global spare_pose
+    load_models()
+    with _load_lock:
+        if spare_pose is not None and spare_pose[0] == model_complexity:
+            graph, spare_pose = spare_pose[1], None
+            return graph
+    return _build_pose(model_complexity)
+
+
+def extract_keypoints(landmarks):
+    """Return the 39 (x, y, z) features of the required landmarks as a 1-D array."""
+    keypoints = np.empty(len(required_indices) * 3)
+    for i, index in enumerate(required_indices):
+        lm = landmarks[index]
+        keypoints[3 * i:3 * i + 3] = (lm.x, lm.y, lm.z)
+    return keypoints
+
+
+def compute_bbox(landmarks, frame_shape):
+    """Bounding box (x, y, w, h) in pixels around all landmarks, with room above the head."""
+    x_min = min(lm.x for lm in landmarks)
+    y_min = min(lm.y for lm in landmarks)
+    x_max = max(lm.x for lm in landmarks)
+    y_max = max(lm.y for lm in landmarks)
+
+    # Adjust the bounding box to include some extra space above the head
+    y_min = max(0, y_min - 0.2)  # Shift the top boundary upwards by 20%
+
+    return (int(x_min * frame_shape[1]), int(y_min * frame_shape[0]),
+            int((x_max - x_min) * frame_shape[1]), int((y_max - y_min) * frame_shape[0]))
+
+
+def classify_keypoints(keypoints):
+    """Return (label, probabilities) for one 39-value keypoint vector."""
+    import pandas as pd
+    load_classifier()
+    keypoints_df = pd.DataFrame(np.asarray(keypoints).reshape(1, -1), columns=feature_names)
+    with metrics.span("classifier.scaler_transform"):
+        keypoints_scaled = scaler.transform(keypoints_df)
+    with metrics.span("classifier.predict"):
+        pred_label = model.predict(keypoints_scaled)[0]
+    with metrics.span("classifier.predict_proba"):
+        pred_probs = model.predict_proba(keypoints_scaled)[0]
+    return labels.get(pred_label, "Unknown Posture"), pred_probs
+
+
+def classify_batch(keypoints):
+    """Return (labels, probabilities) for an (n, 39) keypoint matrix in one scaler/model call."""
+    import pandas as pd
+    load_classifier()
+    keypoints_df = pd.DataFrame(np.asarray(keypoints).reshape(-1, len(feature_names)), columns=feature_names)
+    with metrics.span("classifier.batch"):
+        keypoints_scaled = scaler.transform(keypoints_df)
+        pred_labels = model.predict(keypoints_scaled)
+        pred_probs = model.predict_proba(keypoints_scaled)
+    return [labels.get(label, "Unknown Posture") for label in pred_labels], pred_probs
+
+
+def probabilities_by_label(pred_probs):
+    """Map a predict_proba row onto posture label names."""
+    return {labels.get(cls, "Unknown Posture"): float(p) for cls, p in zip(model.classes_, pred_probs)}
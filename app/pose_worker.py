@@ -0,0 +1,259 @@
+import multiprocessing as mp_proc
+import queue
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+MAX_FRAME_SHAPE = (720, 1280, 3)  # Larger frames are downscaled to fit the shared buffer
+SLOTS = 2  # Double-buffered: the writer never touches the slot being read
+HEADER_FIELDS = 2 + 3 * SLOTS  # latest_slot, frame_id, then (frame_id, height, width) per slot
+
+
+class SharedFrame:
+    """Double-buffered BGR frame in shared memory, written by one process.
+
+    Each slot records the id and size of the frame it holds, so a reader can
+    fetch the frame a result belongs to for as long as it has not been
+    overwritten.
+    """
+
+    def __init__(self, name=None, create=False, max_shape=MAX_FRAME_SHAPE):
+        self.max_shape = max_shape
+        frame_bytes = int(np.prod(max_shape))
+        size = HEADER_FIELDS * 8 + SLOTS * frame_bytes
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.owner = create
+        self.header = np.ndarray(HEADER_FIELDS, dtype=np.int64, buffer=self.shm.buf)
+        self.slots = np.ndarray((SLOTS, frame_bytes), dtype=np.uint8,
+                                buffer=self.shm.buf, offset=HEADER_FIELDS * 8)
+        if create:
+            self.header[:] = 0
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _slot_fields(self, slot):
+        """Header indices of a slot's (frame_id, height, width)."""
+        return 2 + 3 * slot, 3 + 3 * slot, 4 + 3 * slot
+
+    def write(self, frame):
+        """Copy a frame into the idle slot and publish it; returns (frame_id, frame as written).
+
+        Frames larger than the buffer (cameras may ignore the requested
+        resolution) are downscaled to fit instead of being rejected.
+        """
+        height, width = frame.shape[:2]
+        if height > self.max_shape[0] or width > self.max_shape[1]:
+            import cv2
+            scale = min(self.max_shape[0] / height, self.max_shape[1] / width)
+            width, height = max(1, int(width * scale)), max(1, int(height * scale))
+            frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+        frame = np.ascontiguousarray(frame)
+        slot = 1 - int(self.header[0])
+        id_field, height_field, width_field = self._slot_fields(slot)
+        frame_id = int(self.header[1]) + 1
+        self.header[id_field] = 0  # Readers of the old frame in this slot will see it is gone
+        self.slots[slot, :frame.size] = frame.reshape(-1)
+        self.header[height_field] = height
+        self.header[width_field] = width
+        self.header[id_field] = frame_id
+        self.header[0] = slot
+        self.header[1] = frame_id
+        return frame_id, frame
+
+    def read(self, frame_id=None):
+        """Return (frame_id, frame copy) of frame `frame_id` (default: the latest).
+
+        The frame is None when nothing was published yet or the requested
+        frame has already been overwritten.
+        """
+        while True:
+            wanted = int(self.header[1]) if frame_id is None else frame_id
+            if wanted == 0:
+                return 0, None
+            for slot in range(SLOTS):
+                id_field, height_field, width_field = self._slot_fields(slot)
+                if int(self.header[id_field]) == wanted:
+                    height, width = int(self.header[height_field]), int(self.header[width_field])
+                    frame = self.slots[slot, :height * width * 3].reshape(height, width, 3).copy()
+                    if int(self.header[id_field]) == wanted:
+                        return wanted, frame  # The writer did not start reusing the slot while we copied
+                    break
+            if frame_id is not None:
+                return frame_id, None  # Overwritten by newer frames
+            # The latest frame moved on while we looked for it; try again
+
+    def close(self):
+        self.header = self.slots = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _put_latest(result_queue, item):
+    """Put without blocking, dropping the oldest result if the consumer is behind."""
+    try:
+        result_queue.put_nowait(item)
+    except queue.Full:
+        try:
+            result_queue.get_nowait()
+        except queue.Empty:
+            pass
+        try:
+            result_queue.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+def worker_main(frame_name, result_queue, stop_event, pause_event, camera_index, model_complexity):
+    """Child process: capture, pose estimation and classification."""
+    import cv2
+    import pose_pipeline
+    from governor import PROFILES, apply_capture_settings
+
+    shared = SharedFrame(frame_name)
+    pose = pose_pipeline.create_pose(model_complexity)
+    profile = next(p for p in PROFILES if p.model_complexity == model_complexity)
+    cap = None
+    try:
+        while not stop_event.is_set():
+            if pause_event.is_set():
+                # Seat is empty: release the camera until the parent resumes us
+                if cap is not None:
+                    cap.release()
+                    cap = None
+                stop_event.wait(0.2)
+                continue
+            if cap is None:
+                cap = cv2.VideoCapture(camera_index)
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Reduce latency
+                apply_capture_settings(cap, profile)
+
+            ret, frame = cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+            start = time.perf_counter()
+            frame = cv2.flip(frame, 1)  # Mirror effect for natural interaction
+            frame_id, frame = shared.write(frame)  # Downscaled if larger than the shared buffer
+
+            results = pose.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            result = {"frame_id": frame_id, "timestamp": time.monotonic(),
+                      "pred": "No Pose Detected", "probabilities": None, "keypoints": None,
+                      "bbox": None, "landmarks": None}
+            if results.pose_landmarks:
+                landmarks = results.pose_landmarks.landmark
+                result["bbox"] = pose_pipeline.compute_bbox(landmarks, frame.shape)
+                result["landmarks"] = [(lm.x, lm.y) for lm in landmarks]
+                keypoints = pose_pipeline.extract_keypoints(landmarks)
+                result["keypoints"] = keypoints
+                try:
+                    result["pred"], probs = pose_pipeline.classify_keypoints(keypoints)
+                    result["probabilities"] = pose_pipeline.probabilities_by_label(probs)
+                except Exception as e:
+                    print(f"Error during prediction: {e}")
+            result["latency_ms"] = (time.perf_counter() - start) * 1000
+            _put_latest(result_queue, result)
+    finally:
+        if cap is not None:
+            cap.release()
+        pose.close()
+        shared.header = shared.slots = None
+        shared.shm.close()
+
+
+class PoseWorker:
+    """Runs capture + pose/classification in a separate process.
+
+    Frames come back through a SharedFrame, results through a small queue
+    (oldest results are dropped if the UI process falls behind). A supervisor
+    thread restarts the process if it dies while the worker is running.
+    """
+
+    def __init__(self, camera_index=0, model_complexity=1, max_restarts=5):
+        self.camera_index = camera_index
+        self.model_complexity = model_complexity
+        self.max_restarts = max_restarts
+        self.context = mp_proc.get_context("spawn")  # MediaPipe does not survive fork
+        self.frames = None
+        self.results = None
+        self.stop_event = None
+        self.pause_event = None
+        self.process = None
+        self.supervisor = None
+        self.is_running = False
+        self.restarts = 0
+
+    def start(self):
+        if self.is_running:
+            return
+        self.frames = SharedFrame(create=True)
+        self.results = self.context.Queue(maxsize=4)
+        self.stop_event = self.context.Event()
+        self.pause_event = self.context.Event()
+        self.is_running = True
+        self._spawn()
+        self.supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self.supervisor.start()
+
+    def _spawn(self):
+        self.process = self.context.Process(
+            target=worker_main, daemon=True,
+            args=(self.frames.name, self.results, self.stop_event, self.pause_event,
+                  self.camera_index, self.model_complexity))
+        self.process.start()
+
+    def _supervise(self):
+        backoff = 1.0
+        while self.is_running:
+            self.process.join(timeout=0.5)
+            if not self.is_running or self.process.is_alive():
+                continue
+            if self.restarts >= self.max_restarts:
+                print(f"[ERROR] Pose worker crashed {self.restarts} times, giving up.")
+                self.is_running = False
+                break
+            self.restarts += 1
+            print(f"Warning: Pose worker exited with code {self.process.exitcode}, "
+                  f"restarting ({self.restarts}/{self.max_restarts})")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 10.0)
+            self._spawn()
+
+    def set_paused(self, paused):
+        """Pause capture and inference (e.g. while the seat is empty) or resume them."""
+        if paused:
+            self.pause_event.set()
+        else:
+            self.pause_event.clear()
+
+    def get_result(self, timeout=0.5):
+        """Return the next result dict, or None if none arrived within `timeout`."""
+        try:
+            return self.results.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def latest_frame(self):
+        """Return (frame_id, frame) of the newest captured frame."""
+        return self.frames.read()
+
+    def frame(self, frame_id):
+        """Return the frame a result was computed on, or None once it has been overwritten."""
+        return self.frames.read(frame_id)[1]
+
+    def stop(self):
+        self.is_running = False
+        if self.stop_event is not None:
+            self.stop_event.set()
+        if self.process is not None:
+            self.process.join(timeout=3)
+            if self.process.is_alive():
+                self.process.terminate()
+        if self.supervisor is not None:
+            self.supervisor.join(timeout=1)
+        if self.frames is not None:
+            self.frames.close()
+            self.frames = None
@@ -1,7 +1,6 @@
 import sqlite3
 import os
 import csv
-import pandas as pd
 from datetime import datetime
 
 # Create folders if they don't exist
@@ -58,6 +57,8 @@ def export_to_csv():
         print("[ERROR] Database file not found. No data to export.")
         return
     
+    import pandas as pd  # Only needed for exports; kept off the startup path
+
     conn = sqlite3.connect(db_path)
     df = pd.read_sql_query("SELECT * FROM posture_logs", conn)
     conn.close()
@@ -72,6 +73,10 @@ def export_to_csv():
 def log_event_to_csv(message, filename="event_logs.csv"):
     """Appends a timestamped event message to a CSV log file."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+    write_events_to_csv([(timestamp, message)], filename)
+
+def write_events_to_csv(rows, filename="event_logs.csv"):
+    """Appends a batch of (timestamp, message) rows to a CSV log file in one open."""
     file_path = os.path.join(os.getcwd(), filename)
 
     file_exists = os.path.isfile(file_path)
@@ -80,7 +85,7 @@ def log_event_to_csv(message, filename="event_logs.csv"):
         writer = csv.writer(file)
         if not file_exists:
             writer.writerow(["Timestamp", "Event"])  # Write header only once
-        writer.writerow([timestamp, message])
+        writer.writerows(rows)
         
 # Initialize the database on module load
 initialize_database()
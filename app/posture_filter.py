@@ -0,0 +1,82 @@
+import math
+import clocks
+from collections import deque
+
+
+class TemporalPostureFilter:
+    """Smooths a stream of posture labels over a time window with O(1) updates.
+
+    Each update adds either the classifier's probabilities (label -> p) or a
+    single vote for the label to running per-class sums. In "window" mode
+    contributions older than `window_seconds` are evicted from a deque; in
+    "decay" mode the sums decay exponentially with a half-life of
+    `window_seconds`. The output only switches to a new leading class when its
+    share beats the current output's share by more than `hysteresis`.
+    """
+
+    def __init__(self, window_seconds=1.0, mode="window", hysteresis=0.0,
+                 min_samples=1, clock=clocks.monotonic):
+        if mode not in ("window", "decay"):
+            raise ValueError(f"Unknown filter mode: {mode}")
+        self.window_seconds = window_seconds
+        self.mode = mode
+        self.hysteresis = hysteresis
+        self.min_samples = min_samples
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        self.sums = {}
+        self.entries = deque()  # (timestamp, contributions) in window mode
+        self.samples = 0
+        self.last_time = None
+        self.current = None
+
+    def _evict(self, now):
+        cutoff = now - self.window_seconds
+        while self.entries and self.entries[0][0] < cutoff:
+            _, contributions = self.entries.popleft()
+            for label, weight in contributions:
+                remaining = self.sums[label] - weight
+                self.sums[label] = remaining if remaining > 1e-9 else 0.0
+
+    def _decay(self, now):
+        if self.last_time is not None and now > self.last_time:
+            factor = math.pow(0.5, (now - self.last_time) / self.window_seconds)
+            for label in self.sums:
+                self.sums[label] *= factor
+
+    def update(self, label, probabilities=None, timestamp=None):
+        """Add one observation and return the filtered label."""
+        now = self.clock() if timestamp is None else timestamp
+        contributions = list(probabilities.items()) if probabilities else [(label, 1.0)]
+
+        if self.mode == "window":
+            self._evict(now)
+            self.entries.append((now, contributions))
+        else:
+            self._decay(now)
+        self.last_time = now
+        for contribution_label, weight in contributions:
+            self.sums[contribution_label] = self.sums.get(contribution_label, 0.0) + weight
+        self.samples += 1
+
+        if self.samples < self.min_samples:
+            return label  # Not enough data yet, return raw
+
+        leader = max(self.sums, key=self.sums.get)
+        if self.current is None or self.current not in self.sums:
+            self.current = leader
+        elif leader != self.current:
+            total = sum(self.sums.values()) or 1.0
+            margin = (self.sums[leader] - self.sums[self.current]) / total
+            if margin > self.hysteresis:
+                self.current = leader
+        return self.current
+
+    def confidence(self):
+        """Share of the current output in the smoothed distribution."""
+        total = sum(self.sums.values())
+        if not total or self.current is None:
+            return 0.0
+        return self.sums.get(self.current, 0.0) / total
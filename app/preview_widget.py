@@ -0,0 +1,116 @@
+import threading
+from PyQt5.QtCore import Qt, QPointF, QRectF, QTimer
+from PyQt5.QtGui import QColor, QFont, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QWidget
+from signal_bridge import display_refresh_rate
+
+# MediaPipe POSE_CONNECTIONS between the 13 classifier landmarks (pose_pipeline.required_landmarks,
+# which are MediaPipe landmarks 0-12 in the same order)
+KEYPOINT_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10), (11, 12),
+]
+
+
+class FrameSlot:
+    """Latest preview frame handed from a detection thread to the UI.
+
+    publish() only swaps a reference: the publisher must not modify the frame
+    afterwards (the detector builds a fresh image for every frame).
+    """
+
+    def __init__(self):
+        self.frame_id = 0
+        self._latest = None  # (frame_id, frame, points, bbox, label)
+        self._lock = threading.Lock()
+
+    def publish(self, frame, points=None, bbox=None, label=None):
+        """`points` are normalized (x, y) keypoints; `bbox` is (x, y, w, h) in pixels."""
+        with self._lock:
+            self.frame_id += 1
+            self._latest = (self.frame_id, frame, points, bbox, label)
+
+    def latest(self):
+        with self._lock:
+            return self._latest
+
+    def clear(self):
+        with self._lock:
+            self._latest = None
+
+
+def wrap_bgr(frame):
+    """QImage over the BGR frame buffer without copying (the frame must outlive the image)."""
+    height, width = frame.shape[:2]
+    if hasattr(QImage, "Format_BGR888"):  # Qt >= 5.14
+        return QImage(frame.data, width, height, frame.strides[0], QImage.Format_BGR888)
+    # Older Qt has no BGR format; swapping channels costs one copy
+    return QImage(frame.data, width, height, frame.strides[0], QImage.Format_RGB888).rgbSwapped()
+
+
+class CameraPreview(QWidget):
+    """Paints the newest frame from a FrameSlot with vector landmark/bbox overlays.
+
+    A timer at the display refresh rate repaints only when a new frame was
+    published and the widget is visible, so the preview rate follows the
+    display and never throttles inference.
+    """
+
+    def __init__(self, slot, parent=None, max_fps=None):
+        super().__init__(parent)
+        self.slot = slot
+        self.painted_id = 0
+        self.frame = None  # Keeps the buffer behind the current QImage alive
+        self.setAttribute(Qt.WA_OpaquePaintEvent)
+        self.timer = QTimer(self)
+        self.timer.setInterval(int(1000 / (max_fps or display_refresh_rate())))
+        self.timer.timeout.connect(self.poll)
+
+    def showEvent(self, event):
+        self.timer.start()
+        self.update()  # Repaint from the latest frame right away
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def poll(self):
+        if self.slot.frame_id != self.painted_id:
+            self.update()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#000000"))
+        latest = self.slot.latest()
+        if latest is None:
+            painter.setPen(QColor("#B3B3B3"))
+            painter.drawText(self.rect(), Qt.AlignCenter, "Waiting for camera...")
+            return
+        self.painted_id, self.frame, points, bbox, label = latest
+
+        # Fit the frame into the widget, keeping its aspect ratio
+        height, width = self.frame.shape[:2]
+        scale = min(self.width() / width, self.height() / height)
+        target = QRectF((self.width() - width * scale) / 2, (self.height() - height * scale) / 2,
+                        width * scale, height * scale)
+        painter.drawImage(target, wrap_bgr(self.frame))
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        if points:
+            mapped = [QPointF(target.x() + x * target.width(), target.y() + y * target.height())
+                      for x, y in points]
+            painter.setPen(QPen(QColor(255, 0, 0), 2))
+            for start, end in KEYPOINT_CONNECTIONS:
+                painter.drawLine(mapped[start], mapped[end])
+            painter.setPen(QPen(QColor(0, 255, 0), 4))
+            for point in mapped:
+                painter.drawPoint(point)
+        if bbox:
+            x, y, w, h = bbox
+            painter.setPen(QPen(QColor(0, 255, 0), 2))
+            painter.drawRect(QRectF(target.x() + x * scale, target.y() + y * scale, w * scale, h * scale))
+        if label:
+            painter.setPen(QColor(255, 255, 255))
+            painter.setFont(QFont("Arial", 11, QFont.Bold))
+            painter.drawText(QRectF(target.x() + 8, target.y() + 6, target.width() - 16, 24),
+                             Qt.AlignLeft | Qt.AlignVCenter, f"Posture: {label}")
@@ -0,0 +1,149 @@
+import threading
+import time
+import numpy as np
+from multiprocessing import shared_memory
+
+HEADER_FIELDS = 4  # write_count, capacity, width, reserved
+
+
+class TimedRingBuffer:
+    """Fixed-size ring of timestamped rows with lock-free snapshot reads.
+
+    Writers are serialised by a lock. Readers never take it: they read the
+    write counter, copy the requested slots and re-read the counter, trimming
+    any rows the writer may have overwritten in the meantime. With
+    `shared=True` the storage lives in `multiprocessing.shared_memory`, so
+    another process can `attach()` to the same buffer by name.
+    """
+
+    def __init__(self, capacity, width=1, dtype=np.float64, shared=False, name=None):
+        self.capacity = capacity
+        self.width = width
+        self.dtype = np.dtype(dtype)
+        self.shm = None
+        self._owner = False
+        self._write_lock = threading.Lock()
+
+        if shared:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=self._nbytes())
+            self._owner = True
+            self._bind(self.shm.buf)
+        else:
+            self._bind(bytearray(self._nbytes()))
+        self.header[:] = [0, capacity, width, 0]
+
+    @classmethod
+    def attach(cls, name, dtype=np.float64):
+        """Open an existing shared buffer created by another process."""
+        shm = shared_memory.SharedMemory(name=name)
+        header = np.ndarray(HEADER_FIELDS, dtype=np.int64, buffer=shm.buf)
+        buffer = cls.__new__(cls)
+        buffer.capacity = int(header[1])
+        buffer.width = int(header[2])
+        buffer.dtype = np.dtype(dtype)
+        buffer.shm = shm
+        buffer._owner = False
+        buffer._write_lock = threading.Lock()
+        buffer._bind(shm.buf)
+        return buffer
+
+    @property
+    def name(self):
+        return self.shm.name if self.shm is not None else None
+
+    def _nbytes(self):
+        return (HEADER_FIELDS * 8 + self.capacity * 8
+                + self.capacity * self.width * self.dtype.itemsize)
+
+    def _bind(self, buf):
+        offset = 0
+        self.header = np.ndarray(HEADER_FIELDS, dtype=np.int64, buffer=buf, offset=offset)
+        offset += HEADER_FIELDS * 8
+        self.timestamps = np.ndarray(self.capacity, dtype=np.float64, buffer=buf, offset=offset)
+        offset += self.capacity * 8
+        self.values = np.ndarray((self.capacity, self.width), dtype=self.dtype,
+                                 buffer=buf, offset=offset)
+
+    @property
+    def write_count(self):
+        """Total number of rows ever appended."""
+        return int(self.header[0])
+
+    def append(self, value, timestamp=None):
+        """Write one row, then publish it by bumping the counter."""
+        with self._write_lock:
+            count = int(self.header[0])
+            slot = count % self.capacity
+            self.timestamps[slot] = time.monotonic() if timestamp is None else timestamp
+            self.values[slot] = value
+            self.header[0] = count + 1
+
+    def latest(self):
+        """Return (timestamp, row) for the newest entry, or (None, None) if empty."""
+        timestamps, values = self.last(1)
+        if len(timestamps) == 0:
+            return None, None
+        return float(timestamps[0]), values[0]
+
+    def last(self, count):
+        """Return (timestamps, values) for up to `count` newest rows, oldest first."""
+        start_count = int(self.header[0])
+        count = min(count, start_count, self.capacity)
+        slots = np.arange(start_count - count, start_count) % self.capacity
+        timestamps = self.timestamps[slots]
+        values = self.values[slots]
+
+        # Drop rows the writer may have overwritten while we were copying
+        end_count = int(self.header[0])
+        oldest_valid = end_count - self.capacity + 1
+        skip = max(0, oldest_valid - (start_count - count))
+        return timestamps[skip:], values[skip:]
+
+    def window(self, seconds, now=None):
+        """Return (timestamps, values) recorded within the last `seconds`."""
+        now = time.monotonic() if now is None else now
+        timestamps, values = self.last(self.capacity)
+        keep = timestamps >= now - seconds
+        return timestamps[keep], values[keep]
+
+    def close(self):
+        """Release the shared memory (and unlink it if this process created it)."""
+        if self.shm is not None:
+            # Drop our views first so the mmap can be closed
+            self.header = self.timestamps = self.values = None
+            self.shm.close()
+            if self._owner:
+                self.shm.unlink()
+            self.shm = None
+
+
+class LabelRingBuffer(TimedRingBuffer):
+    """TimedRingBuffer that stores string labels as codes from a fixed vocabulary."""
+
+    def __init__(self, capacity, vocabulary, shared=False, name=None):
+        super().__init__(capacity, width=1, dtype=np.int16, shared=shared, name=name)
+        self.vocabulary = list(vocabulary)
+        self._codes = {label: i for i, label in enumerate(self.vocabulary)}
+
+    @classmethod
+    def attach(cls, name, vocabulary):
+        buffer = super().attach(name, dtype=np.int16)
+        buffer.vocabulary = list(vocabulary)
+        buffer._codes = {label: i for i, label in enumerate(buffer.vocabulary)}
+        return buffer
+
+    def append(self, label, timestamp=None):
+        if label not in self._codes:
+            raise ValueError(f"Unknown label: {label}")
+        super().append(self._codes[label], timestamp)
+
+    def latest_label(self, default="Unknown"):
+        """Return (timestamp, label) for the newest entry."""
+        timestamp, code = self.latest()
+        if timestamp is None:
+            return None, default
+        return timestamp, self.vocabulary[int(code[0])]
+
+    def labels(self, codes):
+        """Translate an array of codes returned by last()/window() into labels."""
+        return [self.vocabulary[int(c)] for c in np.ravel(codes)]
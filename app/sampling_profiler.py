@@ -0,0 +1,146 @@
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+DEFAULT_INTERVAL = 0.05  # Seconds between stack samples (20 Hz; every sample walks every thread's stack)
+DEFAULT_DURATION = 30.0  # Seconds a capture runs before it stops by itself
+TOP_FUNCTIONS = 25
+profile_folder = "data/profiles"
+
+
+class SamplingProfiler:
+    """Samples every thread's stack at a low rate for a bounded window.
+
+    A daemon thread reads sys._current_frames() every `interval` seconds and
+    counts collapsed stacks ("thread;file:function;..."). When the capture
+    stops (after `duration` seconds or on stop()), it writes a
+    flamegraph-compatible .collapsed file and a _top.txt summary of the
+    functions with the most self and total samples. Nothing has to be
+    restarted: start() and stop() can be called at any time from any thread.
+    """
+
+    def __init__(self, interval=DEFAULT_INTERVAL, duration=DEFAULT_DURATION, output_folder=None):
+        self.interval = interval
+        self.duration = duration
+        self.output_folder = output_folder or profile_folder
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.stacks = Counter()
+        self.samples = 0
+        self.last_output = None  # (collapsed_path, summary_path) of the last capture
+        self._lock = threading.Lock()
+
+    @property
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, duration=None):
+        """Begin a capture; returns False if one is already running."""
+        with self._lock:
+            if self.is_running:
+                return False
+            self.stacks = Counter()
+            self.samples = 0
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self._run, args=(duration or self.duration,),
+                                           name="SamplingProfiler", daemon=True)
+            self.thread.start()
+        print(f"[INFO] Profiling all threads for up to {duration or self.duration:g} s")
+        return True
+
+    def stop(self, wait=True):
+        """End the current capture early; the output is still written."""
+        self.stop_event.set()
+        thread = self.thread
+        if wait and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=5)
+        return self.last_output
+
+    def toggle(self, duration=None):
+        """Start a capture, or stop the running one. Returns True if one was started."""
+        if self.is_running:
+            self.stop(wait=False)
+            return False
+        return self.start(duration)
+
+    def _run(self, duration):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + duration
+        started = time.strftime("%Y-%m-%d_%H-%M-%S")
+        while not self.stop_event.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                self.stacks[self._collapse(names.get(thread_id, f"thread-{thread_id}"), frame)] += 1
+            self.samples += 1
+            self.stop_event.wait(self.interval)
+        self.last_output = self.write(started)
+        print(f"[INFO] Profile written to {self.last_output[0]} ({self.samples} samples)")
+
+    @staticmethod
+    def _collapse(thread_name, frame):
+        parts = []
+        while frame is not None:
+            code = frame.f_code
+            parts.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+            frame = frame.f_back
+        parts.append(thread_name.replace(";", "_").replace(" ", "_"))
+        return ";".join(reversed(parts))
+
+    def top_functions(self, limit=TOP_FUNCTIONS):
+        """Return the `limit` functions with the most (self, total) samples as [(file:function, count)] lists."""
+        self_counts = Counter()
+        total_counts = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")[1:]  # Drop the thread name
+            if not frames:
+                continue
+            self_counts[frames[-1]] += count
+            for function in set(frames):
+                total_counts[function] += count
+        return self_counts.most_common(limit), total_counts.most_common(limit)
+
+    def write(self, label=None):
+        """Write the collapsed stacks and the top-functions summary; returns both paths."""
+        os.makedirs(self.output_folder, exist_ok=True)
+        base = os.path.join(self.output_folder, f"profile_{label or time.strftime('%Y-%m-%d_%H-%M-%S')}")
+        collapsed_path = base + ".collapsed"
+        summary_path = base + "_top.txt"
+        with open(collapsed_path, "w", encoding="utf-8") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+        self_counts, total_counts = self.top_functions()
+        total = sum(self.stacks.values()) or 1
+        thread_counts = Counter()
+        for stack, count in self.stacks.items():
+            thread_counts[stack.split(";", 1)[0]] += count
+        with open(summary_path, "w", encoding="utf-8") as file:
+            file.write(f"{self.samples} sampling rounds every {self.interval * 1000:.0f} ms, "
+                       f"{total} thread samples\n\nSamples per thread\n")
+            for name, count in thread_counts.most_common():
+                file.write(f"  {count:>7}  {count / total:6.1%}  {name}\n")
+            file.write("\nTop functions by self samples\n")
+            for function, count in self_counts:
+                file.write(f"  {count:>7}  {count / total:6.1%}  {function}\n")
+            file.write("\nTop functions by total samples\n")
+            for function, count in total_counts:
+                file.write(f"  {count:>7}  {count / total:6.1%}  {function}\n")
+        return collapsed_path, summary_path
+
+
+def install_signal_handler(profiler, signum=None):
+    """Toggle `profiler` on a signal (SIGUSR1 by default). POSIX only; call from the main thread."""
+    signum = signum or getattr(signal, "SIGUSR1", None)
+    if signum is None:
+        return False
+    signal.signal(signum, lambda *_: profiler.toggle())
+    return True
+
+
+# Shared profiler toggled from the diagnostics page, SIGUSR1 or --profile
+profiler = SamplingProfiler()
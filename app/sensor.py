@@ -1,23 +1,23 @@
-import serial
 import numpy as np
 import keyboard
 import time
+from serial_ingest import SerialIngestor
 
 # Connect to Arduino
-ser = serial.Serial('COM6', 9600, timeout=1)  # Adjust COM port
+SERIAL_PORT = 'COM6'  # Adjust COM port
+BAUDRATE = 9600  # Must match Serial.begin() in FSR.ino
+ingestor = SerialIngestor(SERIAL_PORT, baudrate=BAUDRATE)
 last_vibration_time = 0  # To track vibration interval
+last_frame_index = 0  # Last ring buffer frame that was classified
 
 
 def read_sensor_data():
-    try:
-        line = ser.readline().decode('utf-8').strip()
-        if line:
-            values = list(map(float, line.split(',')))
-            if len(values) == 13:
-                return np.array(values)
-    except:
-        pass
-    return None
+    """Return the newest frame from the reader thread, or None if nothing new arrived."""
+    global last_frame_index
+    if ingestor.write_index == last_frame_index:
+        return None
+    last_frame_index = ingestor.write_index
+    return ingestor.latest()
 
 
 def detect_posture(sensor_values, threshold=0.2):
@@ -43,13 +43,12 @@ def detect_posture(sensor_values, threshold=0.2):
 
 
 def activate_vibration():
-    ser.write(b'1')  # Send '1' to Arduino to trigger vibration
+    ingestor.vibrate(duration=2.0)  # Motors are switched off by a timer, reading continues
     print("Haptic Feedback Activated for 2 seconds!")
-    time.sleep(2)  # Vibration duration
-    ser.write(b'0')  # Send '0' to stop vibration
 
 
 # Continuously monitor posture
+ingestor.start()
 while True:
     # Exit loop when 'q' is pressed
     if keyboard.is_pressed('q'):
@@ -67,3 +66,8 @@ while True:
             if current_time - last_vibration_time >= 10:  # 10-second interval
                 activate_vibration()
                 last_vibration_time = current_time
+    else:
+        time.sleep(0.01)  # Nothing new from the reader thread yet
+
+print(f"Serial stats: {ingestor.stats()}")
+ingestor.stop()
@@ -0,0 +1,231 @@
+import os
+import threading
+import time
+import numpy as np
+import serial
+
+NUM_SENSORS = 13
+DEFAULT_BAUDRATE = 9600  # Must match Serial.begin() in FSR.ino
+
+
+class SerialIngestor:
+    """Reads comma-separated pressure frames from the chair on a dedicated thread.
+
+    Incoming bytes are reassembled into lines incrementally and every complete
+    frame is written into a preallocated NumPy ring buffer, so the caller never
+    blocks on the serial port.
+    """
+
+    def __init__(self, port, baudrate=DEFAULT_BAUDRATE, channels=NUM_SENSORS,
+                 capacity=4096, read_timeout=0.05, max_line_length=512):
+        self.port = port
+        self.baudrate = baudrate
+        self.channels = channels
+        self.capacity = capacity
+        self.read_timeout = read_timeout
+        self.max_line_length = max_line_length
+
+        # Preallocated ring buffer (samples + arrival timestamps)
+        self.samples = np.zeros((capacity, channels), dtype=np.float64)
+        self.timestamps = np.zeros(capacity, dtype=np.float64)
+        self.write_index = 0  # Total number of frames ever written
+
+        # Counters
+        self.frames_received = 0
+        self.dropped_frames = 0
+        self.last_error = None
+
+        self.ser = None
+        self.thread = None
+        self.is_running = False
+        self._pending = bytearray()
+        self._write_lock = threading.Lock()  # Serialises vibration commands
+        self._vibration_timer = None
+        self._started_at = None
+
+    def open(self):
+        """Open the serial port if it is not already open."""
+        if self.ser is None:
+            self.ser = serial.Serial(self.port, self.baudrate, timeout=self.read_timeout)
+        return self.ser
+
+    def start(self):
+        """Start the background reader thread."""
+        if not self.is_running:
+            self.open()
+            self.is_running = True
+            self._started_at = time.monotonic()
+            self.thread = threading.Thread(target=self._read_loop, daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop the reader thread and close the port."""
+        self.is_running = False
+        if self.thread is not None:
+            self.thread.join(timeout=1)
+            self.thread = None
+        if self._vibration_timer is not None:
+            self._vibration_timer.cancel()
+            self._vibration_timer = None
+        if self.ser is not None:
+            self.ser.close()
+            self.ser = None
+
+    def _read_loop(self):
+        """Continuously drain the port and feed the line reassembler."""
+        while self.is_running:
+            try:
+                chunk = self.ser.read(self.ser.in_waiting or 1)
+            except (serial.SerialException, OSError) as e:
+                self.last_error = str(e)
+                print(f"Warning: Serial read failed: {e}")
+                time.sleep(self.read_timeout)
+                continue
+            if chunk:
+                self.feed(chunk)
+
+    def feed(self, chunk):
+        """Append raw bytes and store every complete frame they finish."""
+        self._pending.extend(chunk)
+        while True:
+            newline = self._pending.find(b"\n")
+            if newline < 0:
+                break
+            line = bytes(self._pending[:newline])
+            del self._pending[:newline + 1]
+            self._handle_line(line)
+
+        # Guard against a device that never sends a newline
+        if len(self._pending) > self.max_line_length:
+            self._pending.clear()
+            self.dropped_frames += 1
+
+    def _handle_line(self, line):
+        line = line.strip()
+        if not line:
+            return
+        try:
+            values = np.array(line.decode("ascii").split(","), dtype=np.float64)
+        except (UnicodeDecodeError, ValueError) as e:
+            self.dropped_frames += 1
+            self.last_error = f"Unparseable frame {line[:40]!r}: {e}"
+            return
+        if values.shape[0] != self.channels:
+            self.dropped_frames += 1
+            self.last_error = f"Expected {self.channels} values, got {values.shape[0]}"
+            return
+
+        slot = self.write_index % self.capacity
+        self.samples[slot] = values
+        self.timestamps[slot] = time.monotonic()
+        self.write_index += 1
+        self.frames_received += 1
+
+    def latest(self):
+        """Return the most recent frame as a copy, or None if nothing arrived yet."""
+        index = self.write_index
+        if index == 0:
+            return None
+        return self.samples[(index - 1) % self.capacity].copy()
+
+    def snapshot(self, count=None):
+        """Return (timestamps, samples) for the last `count` frames in arrival order."""
+        index = self.write_index
+        available = min(index, self.capacity)
+        count = available if count is None else min(count, available)
+        slots = np.arange(index - count, index) % self.capacity
+        return self.timestamps[slots].copy(), self.samples[slots].copy()
+
+    def samples_per_second(self):
+        """Average frame rate since the reader was started."""
+        if self._started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._started_at
+        return self.frames_received / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "frames_received": self.frames_received,
+            "dropped_frames": self.dropped_frames,
+            "samples_per_second": self.samples_per_second(),
+            "last_error": self.last_error,
+        }
+
+    def send_command(self, command):
+        """Write a newline-terminated command to the device."""
+        with self._write_lock:
+            if self.ser is not None:
+                self.ser.write(command.encode("ascii") + b"\n")
+
+    def vibrate(self, duration=2.0):
+        """Turn the motors on and schedule them off without blocking the caller."""
+        if self._vibration_timer is not None:
+            self._vibration_timer.cancel()
+        self.send_command("1")
+        self._vibration_timer = threading.Timer(duration, self.send_command, args=("0",))
+        self._vibration_timer.daemon = True
+        self._vibration_timer.start()
+
+
+class FakeChairDevice:
+    """Pseudo-terminal that behaves like the chair's serial port (POSIX only).
+
+    Open `port_name` with SerialIngestor; `write_frames` emits sensor lines
+    from the other end of the pty.
+    """
+
+    def __init__(self, channels=NUM_SENSORS):
+        import pty
+        self.channels = channels
+        self.master_fd, self.slave_fd = pty.openpty()
+        self.port_name = os.ttyname(self.slave_fd)
+        self.received = bytearray()
+
+    def write_frames(self, count, rate=None, corrupt_every=0):
+        """Write `count` frames, optionally paced to `rate` frames per second."""
+        interval = 1.0 / rate if rate else 0
+        for i in range(count):
+            if corrupt_every and i % corrupt_every == 0:
+                line = "garbage\n"
+            else:
+                values = np.random.uniform(0, 10, self.channels)
+                line = ",".join(f"{v:.2f}" for v in values) + "\n"
+            os.write(self.master_fd, line.encode("ascii"))
+            if interval:
+                time.sleep(interval)
+
+    def write_raw(self, data):
+        """Write bytes as they are, e.g. part of a frame or a malformed one."""
+        os.write(self.master_fd, data)
+
+    def read_commands(self):
+        """Return everything the ingestor has written to the device so far."""
+        import select
+        while select.select([self.master_fd], [], [], 0)[0]:
+            self.received.extend(os.read(self.master_fd, 1024))
+        return bytes(self.received)
+
+    def close(self):
+        os.close(self.master_fd)
+        os.close(self.slave_fd)
+
+
+def measure_throughput(frames=5000, baudrate=115200, corrupt_every=100):
+    """Push frames through a fake device and report sustained rate and drops."""
+    device = FakeChairDevice()
+    ingestor = SerialIngestor(device.port_name, baudrate=baudrate)
+    ingestor.start()
+    try:
+        device.write_frames(frames, corrupt_every=corrupt_every)
+        deadline = time.monotonic() + 5
+        expected = frames - (len(range(0, frames, corrupt_every)) if corrupt_every else 0)
+        while ingestor.frames_received < expected and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return ingestor.stats()
+    finally:
+        ingestor.stop()
+        device.close()
+
+
+if __name__ == "__main__":
+    print(measure_throughput())
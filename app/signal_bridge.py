@@ -0,0 +1,74 @@
+import threading
+import time
+
+DEFAULT_HEARTBEAT_INTERVAL = 1.0  # Seconds between repeats of an unchanged value
+DEFAULT_MAX_RATE = 60.0  # Emissions per second, normally the display refresh rate
+
+
+def display_refresh_rate(default=DEFAULT_MAX_RATE):
+    """Return the primary screen refresh rate, or `default` without a QApplication."""
+    try:
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication.instance()
+        if app is not None and app.primaryScreen() is not None:
+            rate = app.primaryScreen().refreshRate()
+            if rate > 0:
+                return rate
+    except ImportError:
+        pass
+    return default
+
+
+class CoalescingBridge:
+    """Forwards values from a worker thread to `emit` only when they matter.
+
+    A value is emitted when it differs from the last emitted one, or as a
+    heartbeat once `heartbeat_interval` has passed. Emissions are capped to
+    `max_rate` per second; a change that arrives too early is coalesced into
+    the next publish() or delivered by flush().
+    """
+
+    def __init__(self, emit, heartbeat_interval=DEFAULT_HEARTBEAT_INTERVAL,
+                 max_rate=None, clock=time.monotonic):
+        self.emit = emit
+        self.heartbeat_interval = heartbeat_interval
+        self.min_interval = 1.0 / (max_rate or display_refresh_rate())
+        self.clock = clock
+        self.last_value = None
+        self.last_emit_time = None
+        self.pending = None
+        self.published = 0
+        self.emitted = 0
+        self._lock = threading.Lock()
+
+    def publish(self, value):
+        """Offer a new value; emits it only if it changed or a heartbeat is due."""
+        with self._lock:
+            self.published += 1
+            now = self.clock()
+            if self.last_emit_time is not None and now - self.last_emit_time < self.min_interval:
+                # Too soon: keep only the newest change, dropping ones that were reverted
+                self.pending = value if value != self.last_value else None
+                return
+            self.pending = None  # The newest value supersedes anything held back
+
+            changed = value != self.last_value
+            heartbeat_due = (self.last_emit_time is None
+                             or now - self.last_emit_time >= self.heartbeat_interval)
+            if not (changed or heartbeat_due):
+                return
+            self.last_value = value
+            self.last_emit_time = now
+            self.emitted += 1
+        self.emit(value)
+
+    def flush(self):
+        """Emit a held-back change immediately (e.g. when the worker stops)."""
+        with self._lock:
+            value, self.pending = self.pending, None
+            if value is None:
+                return
+            self.last_value = value
+            self.last_emit_time = self.clock()
+            self.emitted += 1
+        self.emit(value)
@@ -0,0 +1,154 @@
+import json
+import queue
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_STREAM_PORT = 8765
+CLIENT_QUEUE_SIZE = 64  # Events buffered per client before the oldest are dropped
+KEEPALIVE_INTERVAL = 15.0  # Seconds between SSE comments on an idle stream
+
+
+class StreamHub:
+    """Fans events out to any number of streaming clients.
+
+    publish() never blocks: every client has a small queue and a client that
+    falls behind loses its oldest events. The latest payload of every event
+    type is kept so new clients (and GET /state) start from a full snapshot.
+    """
+
+    def __init__(self, queue_size=CLIENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.clients = []
+        self.latest = {}  # event type -> payload
+        self.published = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def subscribe(self):
+        client = queue.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self.clients.append(client)
+            for event_type, payload in self.latest.items():
+                client.put_nowait((event_type, payload))
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            if client in self.clients:
+                self.clients.remove(client)
+
+    def publish(self, event_type, payload):
+        message = json.dumps(payload, default=str)
+        with self._lock:
+            self.latest[event_type] = message
+            clients = list(self.clients)
+        self.published += 1
+        for client in clients:
+            try:
+                client.put_nowait((event_type, message))
+            except queue.Full:
+                try:
+                    client.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+                try:
+                    client.put_nowait((event_type, message))
+                except queue.Full:
+                    pass
+
+    def snapshot(self):
+        with self._lock:
+            return {event_type: json.loads(message) for event_type, message in self.latest.items()}
+
+
+class StreamServer:
+    """Local HTTP API over a StreamHub.
+
+    GET /state    latest payload of every event type as one JSON object
+    GET /events   Server-Sent Events stream (`event: <type>` / `data: <json>`)
+    GET /metrics  per-stage latency metrics in text format
+    GET /health   "ok"
+    """
+
+    def __init__(self, hub, host="127.0.0.1", port=DEFAULT_STREAM_PORT, metrics_text=None):
+        self.hub = hub
+        self.host = host
+        self.port = port
+        self.metrics_text = metrics_text  # Callable returning the /metrics body
+        self.server = None
+        self.stopping = threading.Event()
+
+    def start(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path == "/events":
+                    self.stream_events()
+                elif path == "/state":
+                    self.send_body(json.dumps(server.hub.snapshot()), "application/json")
+                elif path == "/metrics" and server.metrics_text is not None:
+                    self.send_body(server.metrics_text(), "text/plain; version=0.0.4")
+                elif path == "/health":
+                    self.send_body("ok", "text/plain")
+                else:
+                    self.send_error(404)
+
+            def send_body(self, text, content_type):
+                body = text.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def stream_events(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Access-Control-Allow-Origin", "*")
+                self.end_headers()
+                client = server.hub.subscribe()
+                last_write = time.monotonic()
+                try:
+                    while not server.stopping.is_set():
+                        try:
+                            event_type, message = client.get(timeout=1.0)
+                        except queue.Empty:
+                            if time.monotonic() - last_write < KEEPALIVE_INTERVAL:
+                                continue
+                            chunk = ": keepalive\n\n"
+                        else:
+                            chunk = f"event: {event_type}\ndata: {message}\n\n"
+                        self.wfile.write(chunk.encode("utf-8"))
+                        self.wfile.flush()
+                        last_write = time.monotonic()
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # Client went away
+                finally:
+                    server.hub.unsubscribe(client)
+                    self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self.stopping.clear()
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]  # The bound port when 0 asked for a free one
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        print(f"[INFO] Streaming API on http://{self.host}:{self.port} "
+              f"(/events, /state, /metrics)")
+
+    def stop(self):
+        self.stopping.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
@@ -0,0 +1,337 @@
+"""Train the posture SVM from saved screenshots and labelled videos.
+
+Landmarks are extracted in parallel (one MediaPipe graph per worker process)
+and cached by content hash, so re-runs only process new images. A parallel
+grid search then picks the SVM hyperparameters and writes versioned model and
+scaler artifacts to the models folder:
+
+    python train_classifier.py [--screenshots screenshots] [--videos a.mp4 b.mp4] [--promote]
+
+Images are labelled by their screenshots/<Posture>/ folder. Video frames are
+labelled by a `<video>.labels.csv` (frame,label) file, or by the video's
+parent folder when that is named after a posture.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+
+import pose_pipeline
+from frame_source import ImageDirectorySource, load_label_file
+from pose_pipeline import ZOO_REGISTRY, feature_names, labels, models_dir
+
+DEFAULT_CACHE_DIR = os.path.join("data", "landmark_cache")
+IMAGE_BATCH = 16  # Images per worker task
+VIDEO_CHUNK = 240  # Video frames (before striding) per worker task
+PARAM_GRID = [
+    {"svc__kernel": ["rbf"], "svc__C": [0.1, 1, 10, 100], "svc__gamma": ["scale", 0.01, 0.1, 1]},
+    {"svc__kernel": ["linear"], "svc__C": [0.1, 1, 10, 100]},
+]
+
+label_ids = {name: class_id for class_id, name in labels.items()}
+
+# Per-process MediaPipe graph, created once by _init_worker
+_pose = None
+
+
+def _init_worker(model_complexity):
+    global _pose
+    import mediapipe as mp
+    _pose = mp.solutions.pose.Pose(static_image_mode=True, model_complexity=model_complexity,
+                                   min_detection_confidence=0.5)
+
+
+def _keypoints(image):
+    """39 keypoint features of a BGR image, or NaNs when no pose is detected."""
+    import cv2
+    results = _pose.process(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+    if not results.pose_landmarks:
+        return np.full(len(feature_names), np.nan)
+    return pose_pipeline.extract_keypoints(results.pose_landmarks.landmark)
+
+
+def _extract_images(tasks):
+    """Worker task: [(key, path)] -> [(key, keypoints)]."""
+    import cv2
+    extracted = []
+    for key, path in tasks:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"Warning: Skipping unreadable image {path}")
+            continue
+        extracted.append((key, _keypoints(image)))
+    return extracted
+
+
+def _extract_video(path, tasks, mirror):
+    """Worker task: decode one segment of a video; [(key, frame_index)] -> [(key, keypoints)]."""
+    import cv2
+    wanted = {frame_index: key for key, frame_index in tasks}
+    last = max(wanted)
+    cap = cv2.VideoCapture(path)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, min(wanted))
+    position = min(wanted)
+    extracted = []
+    try:
+        while position <= last:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if position in wanted:
+                if mirror:
+                    frame = cv2.flip(frame, 1)  # Match the live camera path
+                extracted.append((wanted[position], _keypoints(frame)))
+            position += 1
+    finally:
+        cap.release()
+    return extracted
+
+
+def file_hash(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class LandmarkCache:
+    """Keypoints by content hash, stored as one .npz per model complexity.
+
+    Images with no detected pose are cached as NaN rows so they are not
+    processed again.
+    """
+
+    def __init__(self, folder=DEFAULT_CACHE_DIR, model_complexity=1):
+        self.path = os.path.join(folder, f"landmarks_c{model_complexity}.npz")
+        self.entries = {}
+        if os.path.exists(self.path):
+            with np.load(self.path) as data:
+                self.entries = dict(zip(data["keys"].tolist(), data["features"]))
+        self.added = 0
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def add(self, key, keypoints):
+        self.entries[key] = keypoints
+        self.added += 1
+
+    def save(self):
+        if not self.added:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        keys = list(self.entries)
+        features = np.array([self.entries[key] for key in keys]).reshape(len(keys), len(feature_names))
+        temp_path = self.path + ".tmp.npz"
+        np.savez_compressed(temp_path, keys=np.array(keys), features=features)
+        os.replace(temp_path, self.path)
+        self.added = 0
+
+
+def collect_images(root):
+    """[(key, path, class_id)] for every image under a posture folder."""
+    try:
+        source = ImageDirectorySource(root)
+    except FileNotFoundError:
+        print(f"No images found under {root}")
+        return []
+    samples = []
+    skipped = set()
+    for path in source.paths:
+        label = source.label_for(path)
+        if label not in label_ids:
+            skipped.add(label)
+            continue
+        samples.append((file_hash(path), path, label_ids[label]))
+    if skipped:
+        print(f"Ignoring images labelled {sorted(str(label) for label in skipped)} (not a posture class)")
+    return samples
+
+
+def collect_video(path, stride):
+    """[(key, frame_index, class_id)] for every `stride`-th labelled frame of a video."""
+    import cv2
+    frame_labels = {}
+    if os.path.exists(path + ".labels.csv"):
+        frame_labels = load_label_file(path + ".labels.csv")
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise FileNotFoundError(f"Cannot open video file: {path}")
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+
+    folder_label = os.path.basename(os.path.dirname(os.path.abspath(path))).replace("_", " ")
+    content = file_hash(path)
+    samples = []
+    for frame_index in range(0, frame_count, stride):
+        label = frame_labels.get(frame_index, None if frame_labels else folder_label)
+        if label in label_ids:
+            samples.append((f"{content}:{frame_index}", frame_index, label_ids[label]))
+    if not samples:
+        print(f"Warning: No labelled frames in {path}")
+    return samples
+
+
+def extract_all(images, videos, cache, model_complexity, workers, mirror_videos=True):
+    """Fill the cache with keypoints for every sample that is not cached yet."""
+    tasks = []
+    missing = [(key, path) for key, path, _ in images if key not in cache]
+    total = len(missing)
+    for start in range(0, len(missing), IMAGE_BATCH):
+        tasks.append((_extract_images, (missing[start:start + IMAGE_BATCH],)))
+    for path, samples in videos.items():
+        missing = [(key, frame_index) for key, frame_index, _ in samples if key not in cache]
+        total += len(missing)
+        chunks = {}
+        for key, frame_index in missing:
+            chunks.setdefault(frame_index // VIDEO_CHUNK, []).append((key, frame_index))
+        for chunk in chunks.values():
+            tasks.append((_extract_video, (path, chunk, mirror_videos)))
+    if not tasks:
+        print("All landmarks cached")
+        return
+
+    print(f"Extracting landmarks for {total} samples with {workers} workers")
+    start = time.perf_counter()
+    done = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(model_complexity,)) as pool:
+        futures = [pool.submit(function, *args) for function, args in tasks]
+        for future in as_completed(futures):
+            for key, keypoints in future.result():
+                cache.add(key, keypoints)
+                done += 1
+            if cache.added >= 500:
+                cache.save()  # Keep progress if the run is interrupted
+            elapsed = time.perf_counter() - start
+            print(f"\r  {done}/{total} ({done / elapsed if elapsed else 0:.1f} samples/s)", end="", flush=True)
+    print()
+    cache.save()
+
+
+def build_dataset(samples, cache):
+    """Feature matrix and class ids of the cached samples that have a pose."""
+    rows = []
+    targets = []
+    for key, class_id in samples:
+        keypoints = cache.entries.get(key)
+        if keypoints is None or np.isnan(keypoints).any():
+            continue
+        rows.append(keypoints)
+        targets.append(class_id)
+    return np.array(rows).reshape(len(rows), len(feature_names)), np.array(targets, dtype=int)
+
+
+def search(features, targets, jobs, folds=5, test_size=0.2, seed=0):
+    """Grid-search an SVM (with its scaler) and evaluate it on a held-out split."""
+    import pandas as pd
+    from sklearn.metrics import accuracy_score, classification_report
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold, train_test_split
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+    from sklearn.svm import SVC
+
+    # The runtime scales DataFrames with feature_names columns, so fit on the same
+    frame = pd.DataFrame(features, columns=feature_names)
+    X_train, X_test, y_train, y_test = train_test_split(
+        frame, targets, test_size=test_size, stratify=targets, random_state=seed)
+    pipeline = Pipeline([("scaler", StandardScaler()), ("svc", SVC(probability=True, random_state=seed))])
+    grid = GridSearchCV(pipeline, PARAM_GRID, cv=StratifiedKFold(folds, shuffle=True, random_state=seed),
+                        n_jobs=jobs, verbose=1)
+    grid.fit(X_train, y_train)
+
+    predictions = grid.predict(X_test)
+    names = [labels[class_id] for class_id in sorted(set(targets))]
+    print(classification_report(y_test, predictions, target_names=names))
+    report = {
+        "params": {key.split("__", 1)[1]: value for key, value in grid.best_params_.items()},
+        "cv_accuracy": float(grid.best_score_),
+        "test_accuracy": float(accuracy_score(y_test, predictions)),
+        "train_samples": int(len(y_train)),
+        "test_samples": int(len(y_test)),
+        "support_vectors": int(grid.best_estimator_.named_steps["svc"].support_vectors_.shape[0]),
+    }
+    return grid.best_estimator_, report
+
+
+def save_artifacts(estimator, report, output_dir, version, promote=False):
+    """Write svm_<version>.pkl, scaler_<version>.pkl and svm_<version>.json."""
+    import joblib
+    os.makedirs(output_dir, exist_ok=True)
+    model_path = os.path.join(output_dir, f"svm_{version}.pkl")
+    scaler_path = os.path.join(output_dir, f"scaler_{version}.pkl")
+    joblib.dump(estimator.named_steps["svc"], model_path)
+    joblib.dump(estimator.named_steps["scaler"], scaler_path)
+    with open(os.path.join(output_dir, f"svm_{version}.json"), "w") as f:
+        json.dump(dict(report, version=version), f, indent=2)
+    print(f"Saved {model_path} and {scaler_path}")
+    if promote:
+        # The runtime loads the unversioned files (pose_pipeline.load_classifier)
+        shutil.copyfile(model_path, os.path.join(output_dir, "svm.pkl"))
+        shutil.copyfile(scaler_path, os.path.join(output_dir, "scaler.pkl"))
+        print(f"Promoted version {version} to svm.pkl / scaler.pkl")
+        # A model zoo registry takes precedence over svm.pkl (pose_pipeline.classifier_paths),
+        # so retire it; model_zoo.py writes a fresh one
+        registry_path = os.path.join(output_dir, ZOO_REGISTRY)
+        if os.path.exists(registry_path):
+            os.replace(registry_path, registry_path + ".retired")
+            print(f"Retired {registry_path} so the app loads the promoted svm.pkl")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--screenshots", default=os.path.join(os.getcwd(), "screenshots"),
+                        help="folder with one sub-folder per posture (default ./screenshots)")
+    parser.add_argument("--videos", nargs="*", default=[], help="video files to extract frames from")
+    parser.add_argument("--video-stride", type=int, default=5, help="use every Nth video frame")
+    parser.add_argument("--no-mirror-videos", action="store_true",
+                        help="videos are already mirrored like the saved screenshots")
+    parser.add_argument("--complexity", type=int, default=1, choices=(0, 1, 2),
+                        help="MediaPipe model complexity")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="landmark extraction processes")
+    parser.add_argument("--jobs", type=int, default=-1, help="parallel grid search jobs (-1: all cores)")
+    parser.add_argument("--folds", type=int, default=5, help="cross-validation folds")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_DIR, help="landmark cache folder")
+    parser.add_argument("--output", default=models_dir(), help="folder for the model artifacts")
+    parser.add_argument("--extract-only", action="store_true", help="fill the landmark cache and stop")
+    parser.add_argument("--promote", action="store_true",
+                        help="also copy the new artifacts to svm.pkl / scaler.pkl and retire the model zoo registry")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    images = collect_images(args.screenshots)
+    videos = {path: collect_video(path, args.video_stride) for path in args.videos}
+    print(f"{len(images)} images, {sum(len(s) for s in videos.values())} video frames")
+
+    cache = LandmarkCache(args.cache, args.complexity)
+    extract_all(images, videos, cache, args.complexity, args.workers, mirror_videos=not args.no_mirror_videos)
+    if args.extract_only:
+        return
+
+    samples = [(key, class_id) for key, _, class_id in images]
+    samples += [(key, class_id) for video in videos.values() for key, _, class_id in video]
+    features, targets = build_dataset(samples, cache)
+    counts = {labels[class_id]: int((targets == class_id).sum()) for class_id in sorted(set(targets))}
+    print(f"{len(targets)} samples with a detected pose: {counts}")
+    if len(counts) < 2 or min(counts.values()) < 2 * args.folds:
+        raise SystemExit(f"Need at least {2 * args.folds} samples in two or more posture classes to train")
+
+    estimator, report = search(features, targets, args.jobs, folds=args.folds, seed=args.seed)
+    report.update({"model_complexity": args.complexity, "class_counts": counts,
+                   "feature_names": feature_names})
+    print(f"Best {report['params']}: cv accuracy {report['cv_accuracy']:.3f}, "
+          f"test accuracy {report['test_accuracy']:.3f}, {report['support_vectors']} support vectors")
+    version = datetime.now().strftime("%Y%m%d-%H%M%S")
+    save_artifacts(estimator, report, args.output, version, promote=args.promote)
+
+
+if __name__ == "__main__":
+    main()
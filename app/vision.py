@@ -4,6 +4,7 @@ import numpy as np
 import pandas as pd
 from sklearn.preprocessing import MinMaxScaler
 import joblib
+from camera import CameraSession
 
 # Initialize MediaPipe Pose
 mp_pose = mp.solutions.pose
@@ -13,6 +14,9 @@ pose = mp_pose.Pose(min_detection_confidence=0.5, min_tracking_confidence=0.5)
 model = joblib.load('./models/svm.pkl')
 scaler = joblib.load('./models/scaler.pkl')
 
+# Camera kept open between calls (released after 30 s without a query)
+camera = CameraSession(0)
+
 # List of required landmarks
 required_landmarks = [
     "nose", "left_eye_inner", "left_eye", "left_eye_outer",
@@ -36,12 +40,10 @@ labels = {
 
 
 def get_posture():
-    """Captures a single frame and predicts the sitting posture."""
-    cap = cv2.VideoCapture(0)
-    ret, frame = cap.read()
-    cap.release()
+    """Takes the latest frame from the warm camera session and predicts the sitting posture."""
+    frame = camera.snapshot()
 
-    if not ret:
+    if frame is None:
         return "No Camera Feed"
 
     # Flip frame horizontally for mirror effect
@@ -0,0 +1,61 @@
+"""Per-call latency of vision.get_posture with a warm camera session vs a cold open.
+
+Run from the repository root with a webcam attached:
+
+    python benchmarks/camera_latency.py [--calls 20]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+os.chdir(REPO_ROOT)  # vision.py loads ./models relative to the repository root
+
+import cv2  # noqa: E402
+import vision  # noqa: E402
+
+
+def cold_capture():
+    """What get_posture used to do: open, read one frame, release."""
+    cap = cv2.VideoCapture(0)
+    ret, frame = cap.read()
+    cap.release()
+    return frame if ret else None
+
+
+def time_calls(function, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summary(name, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{name:<28} median {statistics.median(samples):8.1f} ms   "
+          f"p95 {p95:8.1f} ms   max {samples[-1]:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    summary("cold open + read + release", time_calls(cold_capture, args.calls))
+
+    start = time.perf_counter()
+    vision.get_posture()  # Opens the session and warms it up
+    print(f"{'first get_posture (open)':<28} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    summary("warm get_posture", time_calls(vision.get_posture, args.calls))
+    summary("warm snapshot only", time_calls(vision.camera.snapshot, args.calls))
+    vision.camera.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""Micro-benchmarks for PostSync's hot paths, runnable offline without hardware.
+
+Sensor readings, landmarks and databases are synthetic fixtures; the SVM and
+scaler are the shipped models/*.pkl. Each benchmark is timed in several rounds
+and the per-call median/min are stored as JSON so two runs can be diffed.
+
+    python benchmarks/micro.py run [--quick] [--only classify] [--output results.json]
+    python benchmarks/micro.py compare benchmarks/results/micro_base.json benchmarks/results/micro.json
+"""
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # Heatmap benchmark without a display
+
+DB_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_THRESHOLD = 0.10  # Relative median change reported as a regression/improvement
+
+
+class Landmark:
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+def fake_landmarks(seed=0):
+    """33 MediaPipe-like landmarks around the centre of the frame."""
+    import numpy as np
+    rng = np.random.default_rng(seed)
+    return [Landmark(*point) for point in rng.uniform([0.3, 0.2, -0.5], [0.7, 0.8, 0.5], (33, 3))]
+
+
+def sensor_fixtures():
+    """Correct, incorrect and empty-seat readings for the 13 pressure sensors."""
+    correct = [2.0] * 13
+    incorrect = [6.0, 6.0, 6.0, 0.5, 0.5, 0.5, 6.0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5]
+    empty = [0.1] * 13
+    return [correct, incorrect, empty]
+
+
+def fill_database(path, rows):
+    import sqlite3
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE IF NOT EXISTS posture_logs (timestamp TEXT, posture TEXT)")
+    conn.executemany("INSERT INTO posture_logs (timestamp, posture) VALUES (?, ?)",
+                     ((f"2025-01-01 00:00:{i % 60:02d}.{i % 1000:03d}", "Upright") for i in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def build_benchmarks(workdir, quick):
+    """Return {name: zero-argument callable}; setup happens here, outside the timed calls."""
+    import data_collection
+    import fusion
+    import posture_database
+    import pose_pipeline
+    from features import PostureDetector
+
+    benchmarks = {}
+    readings = sensor_fixtures()
+
+    # classify_posture() is side-effect free; the ring buffer, fusion engine and occupancy
+    # gate are only fed by record_pressure_posture(), which is deliberately not timed here
+    def classify_posture():
+        for values in readings:
+            data_collection.classify_posture(values)
+    benchmarks["data_collection.classify_posture (x3)"] = classify_posture
+
+    pressure_labels = ["Correct Posture", "Incorrect Posture", "No User Detected"]
+    clock = [0.0]
+    pressure_filter = copy.deepcopy(data_collection.posture_filter)  # Leave the shared filter untouched
+
+    def apply_posture_filter():
+        clock[0] += 0.5
+        pressure_filter.update(pressure_labels[int(clock[0]) % 3], timestamp=clock[0])
+    benchmarks["data_collection.apply_posture_filter"] = apply_posture_filter
+
+    detector = PostureDetector()
+    probabilities = {"Upright": 0.7, "Leaning Forward": 0.2, "Leaning Backward": 0.05,
+                     "Leaning Left": 0.03, "Leaning Right": 0.02}
+    vision_clock = [0.0]
+
+    def apply_moving_average():
+        vision_clock[0] += 1 / 15
+        detector.apply_moving_average("Upright", probabilities, vision_clock[0])
+    benchmarks["PostureDetector.apply_moving_average"] = apply_moving_average
+
+    landmarks = fake_landmarks()
+    benchmarks["pose_pipeline.extract_keypoints"] = lambda: pose_pipeline.extract_keypoints(landmarks)
+
+    keypoints = pose_pipeline.extract_keypoints(landmarks)
+    pose_pipeline.load_classifier()
+    benchmarks["pose_pipeline.classify_keypoints (svm)"] = lambda: pose_pipeline.classify_keypoints(keypoints)
+
+    benchmarks["get_final_posture_classification"] = lambda: (
+        # app.get_final_posture_classification is a thin wrapper around fuse_labels
+        fusion.fuse_labels("Upright", "Correct Posture"),
+        fusion.fuse_labels("Leaning Left", "Correct Posture"),
+        fusion.fuse_labels("Upright", "No User Detected"))
+
+    save_db = os.path.join(workdir, "save.db")
+
+    def save_posture():
+        posture_database.db_path = save_db
+        posture_database.save_posture("Upright", timestamp="2025-01-01 00:00:00.000")
+    benchmarks["posture_database.save_posture"] = save_posture
+
+    for rows in DB_SIZES[:2] if quick else DB_SIZES:
+        db_file = os.path.join(workdir, f"export_{rows}.db")
+        fill_database(db_file, rows)
+        csv_file = os.path.join(workdir, f"export_{rows}.csv")
+
+        def export(db_file=db_file, csv_file=csv_file):
+            posture_database.db_path = db_file
+            posture_database.csv_path = csv_file
+            posture_database.export_to_csv()
+        benchmarks[f"posture_database.export_to_csv ({rows} rows)"] = export
+
+    data_collection.setup_heatmap()  # Needs the QApplication created by run()
+    benchmarks["data_collection.render_heatmap"] = lambda: data_collection.render_heatmap(
+        readings[1], "Incorrect Posture")
+    return benchmarks
+
+
+def time_benchmark(function, rounds, min_round_seconds):
+    """Calibrate a loop count, then return per-call seconds for each round."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_round_seconds or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_round_seconds / 10 else 2
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(loops):
+            function()
+        samples.append((time.perf_counter() - start) / loops)
+    return loops, samples
+
+
+def run(args):
+    output = os.path.abspath(args.output) if args.output else os.path.join(RESULTS_DIR, "micro.json")
+    workdir = tempfile.mkdtemp(prefix="postsync_bench_")
+    os.chdir(workdir)  # posture_database creates its folders relative to the working directory
+    from PyQt5.QtWidgets import QApplication
+    qt_app = QApplication.instance() or QApplication([])  # noqa: F841 - must outlive the heatmap
+
+    silent = io.StringIO()
+    with contextlib.redirect_stdout(silent):  # classify_posture and export_to_csv print every call
+        benchmarks = build_benchmarks(workdir, args.quick)
+
+    rounds = 3 if args.quick else args.rounds
+    min_round = 0.05 if args.quick else 0.2
+    results = {}
+    for name, function in benchmarks.items():
+        if args.only and args.only not in name:
+            continue
+        with contextlib.redirect_stdout(silent):
+            loops, samples = time_benchmark(function, rounds, min_round)
+        silent.seek(0)
+        silent.truncate()
+        results[name] = {"median_us": statistics.median(samples) * 1e6, "min_us": min(samples) * 1e6,
+                         "loops": loops, "rounds": rounds}
+        print(f"{name:<48} {results[name]['median_us']:12.1f} us   (min {results[name]['min_us']:.1f})")
+
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump({"created": time.strftime("%Y-%m-%d %H:%M:%S"), "python": platform.python_version(),
+                   "machine": platform.platform(), "benchmarks": results}, f, indent=2)
+    print(f"Results written to {output}")
+
+
+def compare(args):
+    with open(args.base) as f:
+        base = json.load(f)["benchmarks"]
+    with open(args.new) as f:
+        new = json.load(f)["benchmarks"]
+
+    regressions = 0
+    print(f"{'benchmark':<48} {'base us':>12} {'new us':>12} {'change':>9}")
+    for name in sorted(set(base) | set(new)):
+        if name not in base or name not in new:
+            print(f"{name:<48} {'(only in ' + ('new' if name in new else 'base') + ')':>35}")
+            continue
+        old_us, new_us = base[name]["median_us"], new[name]["median_us"]
+        change = (new_us - old_us) / old_us if old_us else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif change < -args.threshold:
+            flag = "  faster"
+        print(f"{name:<48} {old_us:12.1f} {new_us:12.1f} {change:+9.1%}{flag}")
+    return 1 if regressions else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every benchmark and write JSON")
+    run_parser.add_argument("--output", help="JSON path (default benchmarks/results/micro.json)")
+    run_parser.add_argument("--rounds", type=int, default=7)
+    run_parser.add_argument("--quick", action="store_true", help="fewer rounds and table sizes")
+    run_parser.add_argument("--only", help="only run benchmarks whose name contains this text")
+
+    compare_parser = commands.add_parser("compare", help="diff two result files")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative median change to flag (default 0.10)")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
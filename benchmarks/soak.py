@@ -0,0 +1,223 @@
+"""Accelerated end-to-end soak test on a virtual clock.
+
+Drives synthetic pressure readings and landmark streams through the whole
+pipeline (classification, filtering, fusion, haptics, notifications, DB
+logging) while a VirtualClock stands in for time.time/monotonic/sleep, so a
+simulated working day runs in minutes. The NodeMCU is a local HTTP stub, so
+the real polling and haptic request code runs. Each simulated hour it reports
+throughput, memory, thread count and database size.
+
+    python benchmarks/soak.py [--hours 8] [--vision-fps 5] [--seed 0]
+"""
+import argparse
+import contextlib
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+
+import clocks  # noqa: E402
+
+# (vision behaviour, pressure reading, min seconds, max seconds) for each kind of segment
+SEGMENTS = {
+    "upright": ("person", [2.0] * 13, 120, 1800),
+    "slouching": ("person", [6.0, 6.0, 6.0, 0.5, 0.5, 0.5, 6.0, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5], 20, 600),
+    "away": ("empty", [0.1] * 13, 60, 900),
+}
+SEGMENT_WEIGHTS = {"upright": 0.6, "slouching": 0.3, "away": 0.1}
+
+
+def rss_mb():
+    """Resident set size of this process in MB."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class NodeMcuStub:
+    """Local stand-in for the chair: serves /get_data and counts /haptic calls."""
+
+    def __init__(self):
+        self.values = [0.0] * 13
+        self.haptic_on = 0
+        self.haptic_off = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith("/get_data"):
+                    body = ",".join(f"{v:.2f}" for v in stub.values)
+                elif self.path.startswith("/haptic"):
+                    if self.path.endswith("trigger=1"):
+                        stub.haptic_on += 1
+                    else:
+                        stub.haptic_off += 1
+                    body = "OK"
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hours", type=float, default=8.0, help="simulated session length")
+    parser.add_argument("--vision-fps", type=float, default=5.0, help="simulated landmark frames per second")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON path (default benchmarks/results/soak.json)")
+    args = parser.parse_args()
+    output = os.path.abspath(args.output) if args.output else os.path.join(RESULTS_DIR, "soak.json")
+
+    # The virtual clock must be installed before the pipeline modules create their state
+    clock = clocks.VirtualClock()
+    clocks.install(clock)
+    workdir = tempfile.mkdtemp(prefix="postsync_soak_")
+    os.chdir(workdir)  # Database, event log and screenshots stay out of the repository
+
+    import numpy as np
+    import data_collection
+    import fusion
+    import posture_database
+    import pose_pipeline
+    from event_bus import bus
+    from features import PostureDetector
+    from notification_policy import NotificationPolicy
+
+    stub = NodeMcuStub()
+    data_collection.NODEMCU_IP = stub.url
+    notifications = []
+    bus.notifier = lambda title, message: notifications.append(message)
+    policy = NotificationPolicy()
+
+    def check_notifications(state):
+        decision = policy.check(state)
+        if decision is not None:
+            category, message = decision
+            bus.log_event(message)
+            bus.notify(message, category=category)
+
+    detector = PostureDetector()
+    pose_pipeline.load_classifier()
+    rng = random.Random(args.seed)
+    np_rng = np.random.default_rng(args.seed)
+    base_keypoints = np_rng.uniform(0.3, 0.7, 39)
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+
+    step = 1.0 / args.vision_fps
+    total_seconds = args.hours * 3600
+    next_poll = 0.0
+    segment_end = 0.0
+    segment = None
+    frames = polls = 0
+    report_every = 3600.0
+    next_report = report_every
+    reports = []
+    start_rss = rss_mb()
+    start_threads = threading.active_count()
+    wall_start = time.perf_counter()
+    real_stdout = sys.stdout
+
+    def report(simulated):
+        wall = time.perf_counter() - wall_start
+        db_size = os.path.getsize(posture_database.db_path) if os.path.exists(posture_database.db_path) else 0
+        row = {"simulated_h": simulated / 3600, "wall_s": wall, "speedup": simulated / wall if wall else 0.0,
+               "frames": frames, "frames_per_wall_s": frames / wall if wall else 0.0, "polls": polls,
+               "rss_mb": rss_mb(), "threads": threading.active_count(), "db_kb": db_size / 1024,
+               "notifications": len(notifications), "haptic_pulses": stub.haptic_on}
+        reports.append(row)
+        print(f"{row['simulated_h']:5.1f} h  wall {wall:7.1f} s  x{row['speedup']:6.0f}  "
+              f"{row['frames_per_wall_s']:7.0f} frames/s  rss {row['rss_mb']:7.1f} MB  "
+              f"threads {row['threads']:3d}  db {row['db_kb']:8.0f} KB  "
+              f"notifications {row['notifications']:4d}  haptics {row['haptic_pulses']:5d}",
+              file=real_stdout, flush=True)
+
+    print(f"Simulating {args.hours:g} h at {args.vision_fps:g} fps vision, "
+          f"{1 / data_collection.POLL_INTERVAL:g} Hz pressure (working dir {workdir})")
+    simulated = 0.0
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        while simulated < total_seconds:
+            if simulated >= segment_end:
+                name = rng.choices(list(SEGMENT_WEIGHTS), weights=list(SEGMENT_WEIGHTS.values()))[0]
+                vision_mode, pressure, shortest, longest = SEGMENTS[name]
+                segment = (vision_mode, pressure)
+                segment_end = simulated + rng.uniform(shortest, longest)
+                base_keypoints = np.clip(base_keypoints + np_rng.normal(0, 0.02, 39), 0, 1)
+                stub.values = [max(0.0, v + rng.uniform(-0.3, 0.3)) for v in pressure]
+
+            vision_mode, _ = segment
+            if vision_mode == "person":
+                keypoints = base_keypoints + np_rng.normal(0, 0.005, 39)
+                pred, probs = pose_pipeline.classify_keypoints(keypoints)
+                probabilities = pose_pipeline.probabilities_by_label(probs)
+            else:
+                pred, probabilities = "No Pose Detected", None
+            detector.publish_posture(pred, frame, probabilities)
+            # One policy check per frame, like the app's per-update check (hold times need a regular tick)
+            check_notifications(fusion.engine.state)
+            frames += 1
+
+            if simulated >= next_poll:
+                data_collection.update(None)  # Real HTTP poll of the stub, classification and haptics
+                polls += 1
+                next_poll += data_collection.POLL_INTERVAL
+
+            clock.advance(step)
+            simulated += step
+            if simulated >= next_report:
+                report(simulated)
+                next_report += report_every
+
+        bus.stop()
+    if not reports or reports[-1]["simulated_h"] < simulated / 3600:
+        report(simulated)
+    stub.close()
+
+    final = reports[-1]
+    summary = {"hours": args.hours, "vision_fps": args.vision_fps, "seed": args.seed,
+               "rss_growth_mb": final["rss_mb"] - start_rss,
+               "thread_growth": final["threads"] - start_threads,
+               "notifications_suppressed": bus.suppressed, "haptic_off": stub.haptic_off,
+               "reports": reports}
+    print(f"RSS growth {summary['rss_growth_mb']:+.1f} MB, thread growth {summary['thread_growth']:+d}, "
+          f"{final['frames']} frames and {final['polls']} polls in {final['wall_s']:.1f} s "
+          f"(x{final['speedup']:.0f} real time)")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(summary, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
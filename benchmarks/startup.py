@@ -0,0 +1,87 @@
+"""Startup benchmark: import-time report and time-to-first-window for app.py.
+
+Run from the repository root:
+
+    python benchmarks/startup.py [--runs 5]
+
+Writes benchmarks/results/startup_importtime.txt (a `-X importtime` report of
+`import app`, sorted by cumulative time) and benchmarks/results/startup.json.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_DIR = os.path.join(REPO_ROOT, "app")
+RESULTS_DIR = os.path.join(REPO_ROOT, "benchmarks", "results")
+
+
+def import_time_report(module="app", top=40):
+    """Run `python -X importtime -c "import <module>"` and return (total_us, rows)."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((int(cumulative_us), int(self_us), name[1:].rstrip()))
+    if result.returncode != 0:
+        print(result.stderr[-2000:], file=sys.stderr)
+    total = max((r[0] for r in rows if not r[2].startswith(" ")), default=0)
+    rows.sort(reverse=True)
+    return total, rows[:top]
+
+
+def time_to_first_window():
+    """Launch app.py and return seconds until its first event-loop iteration."""
+    env = dict(os.environ, PYTHONPATH=APP_DIR, POSTSYNC_LAUNCH_TIME=repr(time.time()))
+    result = subprocess.run([sys.executable, os.path.join(APP_DIR, "app.py")],
+                            cwd=REPO_ROOT, env=env, capture_output=True, text=True, timeout=120)
+    for line in result.stdout.splitlines():
+        if line.startswith("STARTUP_FIRST_WINDOW"):
+            return float(line.split()[1])
+    raise RuntimeError(f"app.py did not report startup time:\n{result.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-window", action="store_true",
+                        help="Only produce the import-time report (no display needed)")
+    args = parser.parse_args()
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    total_us, rows = import_time_report()
+    report_path = os.path.join(RESULTS_DIR, "startup_importtime.txt")
+    with open(report_path, "w") as report:
+        report.write(f"# python -X importtime -c 'import app'  total: {total_us / 1000:.1f} ms\n")
+        report.write(f"{'cumulative [us]':>16} {'self [us]':>10}  module\n")
+        for cumulative_us, self_us, name in rows:
+            report.write(f"{cumulative_us:>16} {self_us:>10}  {name}\n")
+    print(f"Import of app: {total_us / 1000:.1f} ms (report: {report_path})")
+
+    results = {"import_app_ms": total_us / 1000}
+    if not args.skip_window:
+        samples = [time_to_first_window() for _ in range(args.runs)]
+        results["first_window_s"] = {
+            "median": statistics.median(samples),
+            "min": min(samples),
+            "max": max(samples),
+            "runs": samples,
+        }
+        print(f"Time to first window: median {results['first_window_s']['median']:.3f} s")
+
+    with open(os.path.join(RESULTS_DIR, "startup.json"), "w") as f:
+        json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
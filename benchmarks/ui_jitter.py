@@ -0,0 +1,74 @@
+"""UI frame-time jitter with posture detection in a thread vs in a worker process.
+
+Runs a 60 Hz QTimer on the Qt event loop while PostureDetector is running and
+reports how far each tick lands from its 16.7 ms target. Needs a webcam.
+
+    python benchmarks/ui_jitter.py [--seconds 30]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+os.chdir(REPO_ROOT)
+
+from PyQt5.QtCore import QTimer  # noqa: E402
+from PyQt5.QtWidgets import QApplication  # noqa: E402
+
+TICK_MS = 1000 / 60
+
+
+def measure(app, use_worker_process, seconds):
+    from features import PostureDetector
+
+    detector = PostureDetector(use_worker_process=use_worker_process)
+    intervals = []
+    last = [None]
+
+    def tick():
+        now = time.perf_counter()
+        if last[0] is not None:
+            intervals.append((now - last[0]) * 1000)
+        last[0] = now
+
+    timer = QTimer()
+    timer.setTimerType(0)  # Qt.PreciseTimer
+    timer.timeout.connect(tick)
+
+    detector.start_detection()
+    QTimer.singleShot(3000, lambda: timer.start(int(TICK_MS)))  # Skip model/camera start-up
+    QTimer.singleShot(3000 + seconds * 1000, app.quit)
+    app.exec_()
+    timer.stop()
+    detector.stop_detection()
+    time.sleep(1)
+
+    jitter = sorted(abs(i - TICK_MS) for i in intervals)
+    pick = lambda q: jitter[min(len(jitter) - 1, int(len(jitter) * q))]  # noqa: E731
+    return {
+        "ticks": len(intervals),
+        "median_ms": statistics.median(jitter),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "max_ms": jitter[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, default=30)
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    for use_worker_process in (False, True):
+        stats = measure(app, use_worker_process, args.seconds)
+        mode = "worker process" if use_worker_process else "detector thread"
+        print(f"{mode:<16} ticks {stats['ticks']:5d}  jitter median {stats['median_ms']:6.2f} ms  "
+              f"p95 {stats['p95_ms']:6.2f} ms  p99 {stats['p99_ms']:6.2f} ms  max {stats['max_ms']:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Replay a recording through the vision pipeline as fast as possible.
+
+Reports throughput, p50/p95/p99 per-frame latency and, when the source has
+recorded labels (screenshots/<Posture>/ folders or a `frame,label` CSV next to
+a video), how often the raw and filtered predictions agree with them.
+
+Run from the repository root:
+
+    python benchmarks/vision_replay.py screenshots
+    python benchmarks/vision_replay.py session.mp4 --labels session.csv
+    python benchmarks/vision_replay.py synthetic:500 --pose-every 1
+"""
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "app"))
+
+from frame_source import ImageDirectorySource, open_source  # noqa: E402
+from features import PostureDetector  # noqa: E402
+from pose_pipeline import create_pose  # noqa: E402
+
+
+def percentile(sorted_samples, fraction):
+    return sorted_samples[min(len(sorted_samples) - 1, int(len(sorted_samples) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("source", help="video file, image directory, camera index or synthetic[:N]")
+    parser.add_argument("--labels", help="frame,label CSV for a video source")
+    parser.add_argument("--limit", type=int, help="stop after this many frames")
+    parser.add_argument("--complexity", type=int, default=1, choices=(0, 1, 2),
+                        help="MediaPipe model complexity")
+    parser.add_argument("--pose-every", type=int, default=None,
+                        help="run MediaPipe every Nth frame (1 disables landmark prediction)")
+    parser.add_argument("--mirror", choices=("auto", "yes", "no"), default="auto",
+                        help="flip frames like the live camera path (auto: unless already mirrored)")
+    args = parser.parse_args()
+
+    source = open_source(args.source, labels_path=args.labels)
+    mirror = {"auto": not source.mirrored, "yes": True, "no": False}[args.mirror]
+
+    detector = PostureDetector()
+    detector.pose = create_pose(args.complexity)
+    if isinstance(source, ImageDirectorySource):
+        # Stills are unrelated frames: predicting landmarks across them is meaningless
+        if args.pose_every not in (None, 1):
+            print("Note: --pose-every is ignored for image folders; every image runs MediaPipe")
+        detector.tracker.pose_every = 1
+    elif args.pose_every is not None:
+        detector.tracker.pose_every = args.pose_every
+
+    latencies = []
+    raw_matches = filtered_matches = labelled = 0
+    per_label = Counter()
+    per_label_matches = Counter()
+    pose_runs = 0
+
+    start = time.perf_counter()
+    for frame, label, timestamp in source:
+        frame_start = time.perf_counter()
+        _, pred, probabilities, results = detector.process_frame(frame, now=timestamp, mirror=mirror)
+        latencies.append((time.perf_counter() - frame_start) * 1000)
+        filtered = detector.apply_moving_average(pred, probabilities, timestamp)
+        pose_runs += results is not None
+
+        if label is not None:
+            labelled += 1
+            per_label[label] += 1
+            raw_matches += pred == label
+            filtered_matches += filtered == label
+            per_label_matches[label] += pred == label
+        if args.limit and len(latencies) >= args.limit:
+            break
+    elapsed = time.perf_counter() - start
+    source.release()
+    detector.pose.close()
+
+    if not latencies:
+        print("No frames were read from the source.")
+        return
+
+    samples = sorted(latencies)
+    print(f"Frames: {len(samples)} in {elapsed:.2f} s ({len(samples) / elapsed:.1f} fps end to end)")
+    print(f"MediaPipe runs: {pose_runs} ({pose_runs / len(samples):.0%} of frames)")
+    print(f"Per-frame latency  p50 {percentile(samples, 0.50):7.1f} ms   "
+          f"p95 {percentile(samples, 0.95):7.1f} ms   p99 {percentile(samples, 0.99):7.1f} ms   "
+          f"max {samples[-1]:7.1f} ms")
+    if labelled:
+        print(f"Label agreement: raw {raw_matches / labelled:.1%}   "
+              f"filtered {filtered_matches / labelled:.1%}   ({labelled} labelled frames)")
+        for label, count in sorted(per_label.items()):
+            print(f"  {label:<20} {per_label_matches[label] / count:6.1%}  of {count}")
+    else:
+        print("Label agreement: n/a (source has no recorded labels)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+import os
+import sys
+import tempfile
+
+# The app modules import each other as top-level modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app"))
+
+
+def pytest_sessionstart(session):
+    # posture_database and the event log write their files into the working directory on import
+    os.chdir(tempfile.mkdtemp(prefix="postsync-tests-"))
@@ -0,0 +1,30 @@
+from clocks import VirtualClock
+
+
+def test_time_only_moves_when_advanced():
+    clock = VirtualClock(start=100.0)
+    assert clock.time() == 100.0
+    assert clock.monotonic() == 0.0
+    clock.sleep(2.5)
+    assert clock.time() == 102.5
+    assert clock.monotonic() == 2.5
+
+
+def test_call_later_runs_at_due_time_in_order():
+    clock = VirtualClock(start=0.0)
+    calls = []
+    clock.call_later(0.2, lambda: calls.append(("b", clock.time())))
+    clock.call_later(0.1, lambda: calls.append(("a", clock.time())))
+    clock.advance(0.05)
+    assert calls == []
+    clock.advance(1.0)
+    assert calls == [("a", 0.1), ("b", 0.2)]
+    assert clock.time() == 1.05
+
+
+def test_callbacks_scheduled_during_advance_run_in_the_same_step():
+    clock = VirtualClock(start=0.0)
+    calls = []
+    clock.call_later(1.0, lambda: clock.call_later(1.0, lambda: calls.append(clock.time())))
+    clock.advance(5.0)
+    assert calls == [2.0]
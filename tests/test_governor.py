@@ -0,0 +1,56 @@
+import pytest
+
+import governor
+from clocks import VirtualClock
+from governor import PROFILES, PerformanceGovernor
+
+# Per-frame cost of each profile: "high" (level 3) and above are over a 66 ms budget,
+# "medium" (level 2) is well under it
+FRAME_MS = [10.0, 15.0, 30.0, 80.0, 200.0]
+
+
+class Bus:
+    def log_event(self, message):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def quiet_bus(monkeypatch):
+    monkeypatch.setattr(governor, "bus", Bus())
+
+
+def run(governor, clock, seconds, fps=15):
+    for _ in range(int(seconds * fps)):
+        clock.advance(1 / fps)
+        governor.record(FRAME_MS[governor.level])
+
+
+def make_governor(start_level):
+    clock = VirtualClock(start=0.0)
+    return clock, PerformanceGovernor(start_level=start_level, clock=clock.monotonic, cpu_clock=lambda: 0.0)
+
+
+def test_steps_down_when_over_budget():
+    clock, gov = make_governor(start_level=4)
+    run(gov, clock, 11)
+    assert gov.profile is PROFILES[2]
+
+
+def test_step_up_needs_several_windows_of_headroom():
+    clock, gov = make_governor(start_level=0)
+    run(gov, clock, 14)  # Two evaluation windows
+    assert gov.level == 0
+    run(gov, clock, 2)  # Third window
+    assert gov.level == 1
+
+
+def test_does_not_oscillate_after_a_step_down():
+    clock, gov = make_governor(start_level=3)
+    run(gov, clock, 600)
+    # Without a backoff: medium <-> high every other window (~60 switches in 10 minutes)
+    assert len(gov.switches) <= 10
+    assert gov.level == 2
+    # Each undone step up waits twice as long before the next try
+    retries = [time for time, old, new, _ in gov.switches if new is PROFILES[3]]
+    gaps = [later - earlier for earlier, later in zip(retries, retries[1:])]
+    assert gaps == sorted(gaps)
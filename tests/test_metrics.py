@@ -0,0 +1,36 @@
+import threading
+
+from metrics import Metrics
+
+
+def test_summary_percentiles():
+    metrics = Metrics(window=100)
+    for duration in range(1, 101):
+        metrics.record("stage", float(duration))
+    summary = metrics.snapshot()["stage"]
+    assert summary["count"] == 100
+    assert summary["p50"] == 51.0
+    assert summary["max"] == 100.0
+
+
+def test_snapshot_while_other_threads_record():
+    metrics = Metrics(window=64)
+    stop = threading.Event()
+
+    def record(worker):
+        n = 0
+        while not stop.is_set():
+            metrics.record(f"stage{worker}.{n % 50}", 1.0)  # New stages and full windows
+            n += 1
+
+    threads = [threading.Thread(target=record, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    try:
+        for _ in range(200):
+            metrics.snapshot()  # Must not raise "mutated during iteration"
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+    assert len(metrics.snapshot()) == 200
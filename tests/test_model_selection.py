@@ -0,0 +1,56 @@
+import json
+import os
+
+import pytest
+
+pytest.importorskip("numpy")
+
+import pose_pipeline
+from pose_pipeline import ZOO_REGISTRY, classifier_paths, select_model
+
+
+def entry(name, accuracy, p99_ms):
+    return {"name": name, "model": f"{name}_v1.pkl", "scaler": f"{name}_scaler_v1.pkl",
+            "accuracy": accuracy, "p99_ms": p99_ms}
+
+
+@pytest.fixture
+def models(tmp_path, monkeypatch):
+    monkeypatch.setattr(pose_pipeline, "models_dir", lambda: str(tmp_path))
+
+    def write_registry(entries):
+        os.makedirs(tmp_path / "zoo", exist_ok=True)
+        with open(tmp_path / ZOO_REGISTRY, "w") as f:
+            json.dump({"models": entries}, f)
+    return tmp_path, write_registry
+
+
+def test_select_most_accurate_within_budget():
+    entries = [entry("knn", 0.90, 0.5), entry("gbt", 0.95, 1.5), entry("svm", 0.97, 3.0)]
+    assert select_model(entries, 2.0)["name"] == "gbt"
+    assert select_model(entries, 0.1) is None  # Not the fastest one regardless of accuracy
+
+
+def test_no_registry_loads_shipped_svm(models):
+    tmp_path, _ = models
+    name, model_path, _, reason = classifier_paths(2.0)
+    assert (name, model_path) == ("svm", str(tmp_path / "svm.pkl"))
+    assert reason == "no model zoo registry"
+
+
+def test_shipped_entry_competes_with_zoo_models(models):
+    tmp_path, write_registry = models
+    shipped = dict(entry("shipped", 0.98, 1.0), model=os.path.join("..", "svm.pkl"))
+    write_registry([entry("knn", 0.90, 0.5), shipped])
+    name, model_path, _, _ = classifier_paths(2.0)
+    assert (name, model_path) == ("svm", str(tmp_path / "svm.pkl"))
+    name, model_path, _, _ = classifier_paths(0.7)
+    assert (name, model_path) == ("zoo/knn", str(tmp_path / "zoo" / "knn_v1.pkl"))
+
+
+def test_nothing_fits_falls_back_to_shipped_svm(models):
+    _, write_registry = models
+    write_registry([entry("gbt", 0.95, 5.0)])
+    name, _, _, reason = classifier_paths(2.0)
+    assert name == "svm"
+    assert "no registry entry fits" in reason
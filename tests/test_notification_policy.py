@@ -0,0 +1,63 @@
+from clocks import VirtualClock
+from notification_policy import BAD_HOLD, GOOD_HOLD, NO_USER, REPEAT_INTERVAL, NotificationPolicy
+
+GOOD = "Correct Posture"
+BAD = "Incorrect Posture"
+
+
+def make_policy():
+    clock = VirtualClock(start=1000.0)
+    return clock, NotificationPolicy(clock=clock.time)
+
+
+def test_good_posture_needs_hold_time():
+    clock, policy = make_policy()
+    assert policy.check(GOOD) is None
+    clock.advance(GOOD_HOLD - 0.1)
+    assert policy.check(GOOD) is None
+    clock.advance(0.1)
+    assert policy.check(GOOD) == ("good", "Good Posture! Keep It Up.")
+
+
+def test_good_posture_repeats_after_cooldown():
+    clock, policy = make_policy()
+    policy.check(GOOD)
+    clock.advance(GOOD_HOLD)
+    assert policy.check(GOOD)[0] == "good"
+    clock.advance(REPEAT_INTERVAL - 1)
+    assert policy.check(GOOD) is None
+    clock.advance(1)
+    assert policy.check(GOOD)[0] == "good"
+
+
+def test_bad_posture_cooldown():
+    clock, policy = make_policy()
+    policy.check(BAD)
+    clock.advance(BAD_HOLD)
+    assert policy.check(BAD)[0] == "bad"
+    clock.advance(REPEAT_INTERVAL / 2)
+    assert policy.check(BAD) is None
+    clock.advance(REPEAT_INTERVAL / 2)
+    assert policy.check(BAD)[0] == "bad"
+
+
+def test_posture_change_restarts_hold_timer():
+    clock, policy = make_policy()
+    policy.check(GOOD)
+    clock.advance(GOOD_HOLD - 1)
+    policy.check(BAD)
+    clock.advance(0.5)
+    assert policy.check(GOOD) is None  # Timer restarted when the posture changed
+    clock.advance(GOOD_HOLD - 0.5)
+    assert policy.check(GOOD) is None
+    clock.advance(0.5)
+    assert policy.check(GOOD)[0] == "good"
+
+
+def test_no_user_notifies_once():
+    clock, policy = make_policy()
+    policy.check(NO_USER)
+    clock.advance(BAD_HOLD)
+    assert policy.check(NO_USER)[0] == "no user"
+    clock.advance(REPEAT_INTERVAL * 2)
+    assert policy.check(NO_USER) is None
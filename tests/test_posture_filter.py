@@ -0,0 +1,31 @@
+import pytest
+
+from posture_filter import TemporalPostureFilter
+
+
+def test_window_keeps_samples_up_to_its_edge():
+    posture_filter = TemporalPostureFilter(window_seconds=1.0)
+    for timestamp in (0.0, 0.5, 1.0):
+        posture_filter.update("Upright", timestamp=timestamp)
+    assert len(posture_filter.entries) == 3  # The sample exactly 1 s old is still in
+    posture_filter.update("Upright", timestamp=1.5)
+    assert len(posture_filter.entries) == 3
+
+
+def test_pressure_vote_spans_five_polls():
+    data_collection = pytest.importorskip("data_collection")
+    settings = data_collection.posture_filter
+    posture_filter = TemporalPostureFilter(window_seconds=settings.window_seconds,
+                                           min_samples=settings.min_samples)
+    interval = data_collection.POLL_INTERVAL
+    for i in range(20):
+        posture_filter.update("Correct Posture", timestamp=i * interval)
+        assert len(posture_filter.entries) == min(i + 1, 5)
+
+
+def test_majority_of_the_last_five_pressure_samples():
+    posture_filter = TemporalPostureFilter(window_seconds=2.25, min_samples=5)
+    labels = ["Correct Posture"] * 5 + ["Incorrect Posture"] * 2
+    outputs = [posture_filter.update(label, timestamp=i * 0.5) for i, label in enumerate(labels)]
+    assert outputs[-1] == "Correct Posture"  # 3 of the last 5
+    assert posture_filter.update("Incorrect Posture", timestamp=3.5) == "Incorrect Posture"  # 3 of 5
@@ -0,0 +1,29 @@
+import os
+import time
+from collections import Counter
+
+from sampling_profiler import SamplingProfiler
+
+
+def test_top_functions_applies_the_limit():
+    profiler = SamplingProfiler()
+    profiler.stacks = Counter({
+        "MainThread;app.py:main;features.py:run;pose.py:process": 6,
+        "MainThread;app.py:main;features.py:run;db.py:save": 3,
+        "MainThread;app.py:main;ui.py:paint": 2,
+        "Worker;bus.py:loop;csv.py:write": 1,
+    })
+    self_counts, total_counts = profiler.top_functions(limit=2)
+    assert self_counts == [("pose.py:process", 6), ("db.py:save", 3)]
+    assert total_counts == [("app.py:main", 11), ("features.py:run", 9)]
+
+
+def test_capture_writes_outputs(tmp_path):
+    profiler = SamplingProfiler(output_folder=str(tmp_path))
+    profiler.start(duration=5)
+    time.sleep(0.2)
+    collapsed_path, summary_path = profiler.stop()
+    assert profiler.samples >= 1
+    assert os.path.getsize(collapsed_path) > 0
+    with open(summary_path, encoding="utf-8") as file:
+        assert file.readline().startswith(f"{profiler.samples} sampling rounds every 50 ms")
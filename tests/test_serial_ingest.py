@@ -0,0 +1,59 @@
+import sys
+import time
+
+import pytest
+
+pytest.importorskip("serial")
+if sys.platform == "win32":
+    pytest.skip("FakeChairDevice needs a POSIX pty", allow_module_level=True)
+
+from serial_ingest import NUM_SENSORS, FakeChairDevice, SerialIngestor
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def chair():
+    device = FakeChairDevice()
+    ingestor = SerialIngestor(device.port_name)
+    ingestor.start()
+    yield device, ingestor
+    ingestor.stop()
+    device.close()
+
+
+def frame(values):
+    return (",".join(f"{v:.1f}" for v in values) + "\n").encode("ascii")
+
+
+def test_frame_split_across_reads_is_reassembled(chair):
+    device, ingestor = chair
+    data = frame(range(NUM_SENSORS))
+    device.write_raw(data[:10])
+    time.sleep(0.2)  # Let the reader drain the first half on its own
+    assert ingestor.frames_received == 0
+    device.write_raw(data[10:])
+    assert wait_for(lambda: ingestor.frames_received == 1)
+    assert ingestor.latest().tolist() == [float(v) for v in range(NUM_SENSORS)]
+    assert ingestor.dropped_frames == 0
+
+
+def test_corrupt_and_short_frames_are_dropped(chair):
+    device, ingestor = chair
+    device.write_raw(b"garbage\n")
+    device.write_raw(frame(range(NUM_SENSORS - 1)))  # One value short
+    device.write_raw(frame(range(NUM_SENSORS)))
+    assert wait_for(lambda: ingestor.frames_received == 1 and ingestor.dropped_frames == 2)
+    assert "Expected" in ingestor.last_error
+
+
+def test_vibrate_writes_on_then_off(chair):
+    device, ingestor = chair
+    ingestor.vibrate(duration=0.1)
+    assert wait_for(lambda: device.read_commands().startswith(b"1\n"))
+    assert wait_for(lambda: device.read_commands() == b"1\n0\n")
@@ -0,0 +1,64 @@
+import http.client
+import json
+
+import pytest
+
+from stream_server import StreamHub, StreamServer
+
+
+@pytest.fixture
+def server():
+    hub = StreamHub()
+    server = StreamServer(hub, port=0, metrics_text=lambda: "stage_count 1\n")
+    server.start()
+    yield server
+    server.stop()
+
+
+def get(server, path):
+    connection = http.client.HTTPConnection(server.host, server.port, timeout=5)
+    connection.request("GET", path)
+    response = connection.getresponse()
+    body = response.read().decode("utf-8")
+    connection.close()
+    return response.status, body
+
+
+def test_health(server):
+    assert get(server, "/health") == (200, "ok")
+
+
+def test_state_is_the_latest_payload_per_event_type(server):
+    assert get(server, "/state") == (200, "{}")
+    server.hub.publish("posture", {"state": "Correct Posture"})
+    server.hub.publish("posture", {"state": "No Person Detected"})
+    server.hub.publish("metrics", {"clients": 0})
+    status, body = get(server, "/state")
+    assert status == 200
+    assert json.loads(body) == {"posture": {"state": "No Person Detected"}, "metrics": {"clients": 0}}
+
+
+def test_events_stream_starts_from_the_snapshot(server):
+    server.hub.publish("posture", {"state": "No Person Detected"})
+    connection = http.client.HTTPConnection(server.host, server.port, timeout=5)
+    connection.request("GET", "/events")
+    response = connection.getresponse()
+    assert response.status == 200
+    assert response.getheader("Content-Type") == "text/event-stream"
+    lines = [response.fp.readline().decode("utf-8") for _ in range(3)]
+    connection.close()
+    assert lines == ["event: posture\n", 'data: {"state": "No Person Detected"}\n', "\n"]
+
+
+def test_unknown_path_is_404(server):
+    assert get(server, "/nope")[0] == 404
+
+
+def test_slow_client_loses_the_oldest_events():
+    hub = StreamHub(queue_size=2)
+    client = hub.subscribe()
+    for i in range(4):
+        hub.publish("metrics", {"i": i})
+    assert [json.loads(client.get_nowait()[1])["i"] for _ in range(2)] == [2, 3]
+    assert hub.dropped == 2
+    assert hub.snapshot() == {"metrics": {"i": 3}}